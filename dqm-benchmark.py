@@ -0,0 +1,413 @@
+# dqm-benchmark.py : 합성 데이터 크기별 check_*/run_data_validation 실행 시간·메모리 측정 및 기준(baseline) JSON 비교
+# 사용 예: python dqm-benchmark.py --sizes 10000,1000000 [--save-baseline]
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from dqmlib import (run_data_validation, LocalQueryProcessor, check_not_null, check_regex_pattern,
+                    check_allowed_values, check_numeric_range, check_column_equality, check_duplicate_rows,
+                    check_conditional, check_distribution_change, check_numeric_volatility,
+                    check_aggregate_value_trend, check_total_row_count_trend, check_consecutive_trend,
+                    check_schema_change)
+
+# ====================================================================
+# ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼ 인자 처리 로직 ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
+# ====================================================================
+parser = argparse.ArgumentParser(description="dqmlib 규칙 유형별 성능을 합성 데이터로 측정하고 기준값과 비교합니다.")
+parser.add_argument('--sizes', default="10000,1000000,10000000", help="측정할 현재 데이터 행 수 목록 (쉼표 구분)")
+parser.add_argument('--schemas', default="bmalsa0025,bmalsa0026,bmalsa0037", help="측정할 스키마 목록 (쉼표 구분)")
+parser.add_argument('--history-rows', type=int, default=200000, help="과거 테이블 전체 행 수 (기간별로 나누어 생성)")
+parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'duckdb'], help="과거 조회용 로컬 DB")
+parser.add_argument('--repeat', type=int, default=1, help="시간 측정 반복 횟수 (최소값 사용)")
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--checks', default=None, help="측정할 항목 이름만 선택 (쉼표 구분, 예: check_not_null,run_data_validation)")
+parser.add_argument('--skip-memory', action='store_true', help="tracemalloc 최대 메모리 측정 생략")
+parser.add_argument('--skip-full-run', action='store_true', help="run_data_validation 전체 실행 측정 생략")
+parser.add_argument('--baseline', default="./dqm_benchmark_baseline.json", help="비교할 기준 측정값 JSON 경로")
+parser.add_argument('--save-baseline', action='store_true', help="이번 측정값을 기준 JSON으로 저장 (비교는 생략)")
+parser.add_argument('--output', default="./dqm_benchmark_results.json", help="이번 측정값 저장 경로")
+parser.add_argument('--time-tolerance', type=float, default=0.2, help="기준 대비 허용 실행 시간 증가율 (0.2 = 20%%)")
+parser.add_argument('--memory-tolerance', type=float, default=0.2, help="기준 대비 허용 최대 메모리 증가율")
+parser.add_argument('--min-seconds', type=float, default=0.05, help="이 시간(초)보다 적게 늘어난 경우는 회귀로 보지 않음")
+parser.add_argument('--min-memory-mb', type=float, default=5.0, help="이 크기(MB)보다 적게 늘어난 경우는 회귀로 보지 않음")
+parser.add_argument('--verbose', action='store_true', help="검증 함수의 콘솔 출력을 숨기지 않음")
+# ====================================================================
+
+# --- 합성 데이터 코드 값 ---
+WID_CTY_CODES = np.array(['11', '21', '22', '23', '24', '25', '26', '29', '31', '32', '33', '34', '35', '36', '37',
+                          '38', '39'], dtype=object)
+HPSN_BZN_CODES = np.array([f"{c}{i:03d}" for c in WID_CTY_CODES for i in range(30)], dtype=object)
+KTO_MCT_CODES = np.array(['701100', '517400'] + [f"{i:06d}" for i in range(100100, 999999, 4517)], dtype=object)
+MCT_ADM_GDS_CODES = np.array([f"{i:010d}" for i in range(1111010100, 1111010100 + 300 * 100, 100)], dtype=object)
+CUSTOMER_TYPES = np.array(['외지인', '내지인'], dtype=object)
+COUNTRY_NAMES = np.array(['중국', '일본', '미국', '대만', '베트남', '태국', '홍콩', '필리핀', '기타'], dtype=object)
+SEX_CODES = np.array(['1', '2'], dtype=object)
+AGE_CODES = np.array(['10', '20', '30', '40', '50', '60', '70'], dtype=object)
+LIF_STG_CODES = np.array(['1', '2', '3', '4', '5', '6'], dtype=object)
+TIME_SLOTS = np.array(['오전', '오후', '저녁', '심야'], dtype=object)
+
+
+def _inject_anomalies(df, rng, anomaly_ratio, null_columns=(), negative_columns=(), invalid_values=None):
+    """규칙이 실제로 오류를 찾도록 일부 행에 NULL/음수/허용되지 않는 값을 넣습니다."""
+    n = len(df)
+    for col in null_columns:
+        df.loc[rng.random(n) < anomaly_ratio, col] = None
+    for col in negative_columns:
+        df.loc[rng.random(n) < anomaly_ratio, col] = -1.0
+    for col, bad_value in (invalid_values or {}).items():
+        df.loc[rng.random(n) < anomaly_ratio, col] = bad_value
+    return df
+
+
+def _append_duplicates(df, rng, duplicate_ratio):
+    # 뒤쪽 일부 행을 앞쪽 행의 복제로 바꿔 행 수는 유지하면서 중복 행을 만듦
+    n_dup = int(len(df) * duplicate_ratio)
+    if not n_dup: return df
+    row_positions = np.arange(len(df))
+    row_positions[len(df) - n_dup:] = rng.integers(0, len(df) - n_dup, n_dup)
+    return df.iloc[row_positions].reset_index(drop=True)
+
+
+def generate_bmalsa0026(n_rows, partition_value, seed=0, anomaly_ratio=0.01):
+    """일별 가맹점 매출(mdb.bmalsa0026) 모양: ced/bgda_plf_pti_id = YYYYMMDD 파티션, 지역/업종/고객유형 코드, 금액."""
+    rng = np.random.default_rng(seed)
+    wid = rng.choice(WID_CTY_CODES, n_rows)
+    df = pd.DataFrame({
+        'ced': np.full(n_rows, partition_value, dtype=object),
+        'wid_cty_cd': wid,
+        'hpsn_bzn_cd': rng.choice(HPSN_BZN_CODES, n_rows),
+        'kto_mct_ccd_vl': rng.choice(KTO_MCT_CODES, n_rows),
+        'mct_ue_cln_tcd_vl': rng.choice(CUSTOMER_TYPES, n_rows, p=[0.35, 0.65]),
+        'hm_wid_cty_cd': np.where(rng.random(n_rows) < 0.8, wid, rng.choice(WID_CTY_CODES, n_rows)),
+        'aso_saa': rng.lognormal(11, 1.2, n_rows).round(0),
+        'aso_sls_ct': rng.poisson(30, n_rows).astype(float),
+        'bgda_plf_pti_id': np.full(n_rows, partition_value, dtype=object),
+    })
+    _inject_anomalies(df, rng, anomaly_ratio, null_columns=['wid_cty_cd', 'aso_saa'], negative_columns=['aso_saa'],
+                      invalid_values={'mct_ue_cln_tcd_vl': 'T3_INVALID', 'ced': partition_value[:6]})
+    return _append_duplicates(df, rng, anomaly_ratio / 10)
+
+
+def generate_bmalsa0025(n_rows, partition_value, seed=0, anomaly_ratio=0.01):
+    """월별 성/연령/생애단계별 매출(mdb.bmalsa0025) 모양: ta_ym/bgda_plf_pti_id = YYYYMM 파티션, 분석 단위 코드 12개."""
+    rng = np.random.default_rng(seed)
+    wid = rng.choice(WID_CTY_CODES, n_rows)
+    df = pd.DataFrame({
+        'ta_ym': np.full(n_rows, partition_value, dtype=object),
+        'wid_cty_cd': wid,
+        'hpsn_bzn_cd': rng.choice(HPSN_BZN_CODES, n_rows),
+        'mct_adm_gds_apb_cd': rng.choice(MCT_ADM_GDS_CODES, n_rows),
+        'kto_mct_ccd_vl': rng.choice(KTO_MCT_CODES, n_rows),
+        'mct_ue_cln_tcd_vl': rng.choice(CUSTOMER_TYPES, n_rows, p=[0.35, 0.65]),
+        'hm_wid_cty_cd': np.where(rng.random(n_rows) < 0.8, wid, rng.choice(WID_CTY_CODES, n_rows)),
+        'hm_gds_dsr_cd': rng.choice(HPSN_BZN_CODES, n_rows),
+        'sex_ccd': rng.choice(SEX_CODES, n_rows),
+        'age_ccd': rng.choice(AGE_CODES, n_rows),
+        'lif_stg_cd': rng.choice(LIF_STG_CODES, n_rows),
+        'tmt_vl': rng.choice(TIME_SLOTS, n_rows),
+        'aso_saa': rng.lognormal(13, 1.5, n_rows).round(0),
+        'aso_sls_ct': rng.poisson(120, n_rows).astype(float),
+        'bgda_plf_pti_id': np.full(n_rows, partition_value, dtype=object),
+    })
+    _inject_anomalies(df, rng, anomaly_ratio, null_columns=['age_ccd', 'aso_saa', 'aso_sls_ct'],
+                      negative_columns=['aso_saa', 'aso_sls_ct'], invalid_values={'sex_ccd': '9'})
+    return _append_duplicates(df, rng, anomaly_ratio / 10)
+
+
+def generate_bmalsa0037(n_rows, partition_value, seed=0, anomaly_ratio=0.01):
+    """월별 해외 고객 온라인 매출(mdb.bmalsa0037) 모양: 국가명 고객유형, 시간대값(오전/오후/저녁/심야), 금액."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'ta_ym': np.full(n_rows, partition_value, dtype=object),
+        'mct_ue_cln_tcd_vl': rng.choice(COUNTRY_NAMES, n_rows,
+                                        p=[0.3, 0.25, 0.12, 0.1, 0.08, 0.06, 0.04, 0.03, 0.02]),
+        'tmt_vl': rng.choice(TIME_SLOTS, n_rows, p=[0.2, 0.35, 0.3, 0.15]),
+        'aso_saa': rng.lognormal(14, 1.0, n_rows).round(0),
+        'aso_sls_ct': rng.poisson(80, n_rows).astype(float),
+        'bgda_plf_pti_id': np.full(n_rows, partition_value, dtype=object),
+    })
+    _inject_anomalies(df, rng, anomaly_ratio, null_columns=['mct_ue_cln_tcd_vl', 'tmt_vl', 'aso_saa'],
+                      negative_columns=['aso_saa'], invalid_values={'tmt_vl': '새벽'})
+    return _append_duplicates(df, rng, anomaly_ratio / 10)
+
+
+# 스키마별 생성기와 규칙에 사용할 컬럼 정의
+SCHEMAS = {
+    'bmalsa0026': {'generator': generate_bmalsa0026, 'table': 'mdb.bmalsa0026', 'current_period': '20250120',
+                   'date_format': 'YYYYMMDD', 'history_periods': 30, 'code_column': 'kto_mct_ccd_vl',
+                   'date_value_column': 'ced', 'allowed': ('mct_ue_cln_tcd_vl', ['외지인', '내지인']),
+                   'group_column': 'wid_cty_cd', 'equality': ('wid_cty_cd', 'hm_wid_cty_cd'),
+                   'duplicate_subset': ['ced', 'wid_cty_cd', 'hpsn_bzn_cd', 'kto_mct_ccd_vl', 'mct_ue_cln_tcd_vl',
+                                        'hm_wid_cty_cd']},
+    'bmalsa0025': {'generator': generate_bmalsa0025, 'table': 'mdb.bmalsa0025', 'current_period': '202501',
+                   'date_format': 'YYYYMM', 'history_periods': 13, 'code_column': 'kto_mct_ccd_vl',
+                   'date_value_column': 'ta_ym', 'allowed': ('sex_ccd', ['1', '2']), 'group_column': 'sex_ccd',
+                   'equality': ('wid_cty_cd', 'hm_wid_cty_cd'),
+                   'duplicate_subset': ['ta_ym', 'wid_cty_cd', 'hpsn_bzn_cd', 'mct_adm_gds_apb_cd', 'kto_mct_ccd_vl',
+                                        'mct_ue_cln_tcd_vl', 'hm_wid_cty_cd', 'hm_gds_dsr_cd', 'sex_ccd', 'age_ccd',
+                                        'lif_stg_cd', 'tmt_vl']},
+    'bmalsa0037': {'generator': generate_bmalsa0037, 'table': 'mdb.bmalsa0037', 'current_period': '202501',
+                   'date_format': 'YYYYMM', 'history_periods': 13, 'code_column': 'mct_ue_cln_tcd_vl',
+                   'date_value_column': 'ta_ym', 'allowed': ('tmt_vl', ['오전', '오후', '저녁', '심야']),
+                   'group_column': 'mct_ue_cln_tcd_vl', 'equality': ('ta_ym', 'bgda_plf_pti_id'),
+                   'duplicate_subset': ['ta_ym', 'mct_ue_cln_tcd_vl', 'tmt_vl', 'aso_saa', 'aso_sls_ct']},
+}
+PARTITION_COLUMN = 'bgda_plf_pti_id'
+
+
+def history_periods(spec):
+    current = datetime.strptime(spec['current_period'], '%Y%m%d' if spec['date_format'] == 'YYYYMMDD' else '%Y%m')
+    if spec['date_format'] == 'YYYYMMDD':
+        return [(current - timedelta(days=i)).strftime('%Y%m%d') for i in range(spec['history_periods'], 0, -1)]
+    return [(current - relativedelta(months=i)).strftime('%Y%m') for i in range(spec['history_periods'], 0, -1)]
+
+
+def build_history_processor(schema_name, spec, history_rows, backend, seed):
+    """과거 기간 데이터를 기간별로 생성해 LocalQueryProcessor 테이블로 적재합니다."""
+    periods = history_periods(spec)
+    rows_per_period = max(1, history_rows // len(periods))
+    hist_df = pd.concat([spec['generator'](rows_per_period, p, seed=seed + 1 + i, anomaly_ratio=0.0)
+                         for i, p in enumerate(periods)], ignore_index=True)
+    q_processor = LocalQueryProcessor(backend=backend, slow_query_seconds=None)
+    q_processor.load_table(spec['table'], hist_df, partition_columns=[PARTITION_COLUMN])
+    print(f"정보: [{schema_name}] 과거 테이블 {spec['table']} 적재 ({len(hist_df):,}행, {len(periods)}개 기간)")
+    return q_processor
+
+
+def build_check_cases(spec, baseline_schema_dir):
+    """(측정 이름, 규칙 타입, 대상 컬럼, params, 호출 함수(df, q_processor)) 목록을 만듭니다."""
+    date_fmt, current = spec['date_format'], spec['current_period']
+    periods = history_periods(spec)
+    table, code_col, group_col = spec['table'], spec['code_column'], spec['group_column']
+    allowed_col, allowed_values = spec['allowed']
+    eq_col1, eq_col2 = spec['equality']
+    is_daily = date_fmt == 'YYYYMMDD'
+    trend_periods = {'type': 'average_of_previous_n_days', 'n': 7} if is_daily else {'type': 'previous_n_months',
+                                                                                       'n': 12}
+    hist_filter = f"{PARTITION_COLUMN} >= '{periods[0]}' AND {PARTITION_COLUMN} <= '{periods[-1]}'"
+    cases = [
+        ('check_not_null', 'not_null', group_col, {},
+         lambda df, qp, p: check_not_null(df[group_col], group_col, p)),
+        ('check_regex_pattern', 'regex_pattern', spec['date_value_column'],
+         {'pattern': r"^\d{8}$" if is_daily else r"^\d{6}$"},
+         lambda df, qp, p: check_regex_pattern(df[spec['date_value_column']], spec['date_value_column'], p)),
+        ('check_allowed_values', 'allowed_values', allowed_col, {'values': allowed_values},
+         lambda df, qp, p: check_allowed_values(df[allowed_col], allowed_col, p)),
+        ('check_numeric_range', 'numeric_range', 'aso_saa', {'min': 0},
+         lambda df, qp, p: check_numeric_range(df['aso_saa'], 'aso_saa', p)),
+        ('check_column_equality', 'column_equality', None, {'column1': eq_col1, 'column2': eq_col2},
+         lambda df, qp, p: check_column_equality(df, p)),
+        ('check_duplicate_rows', 'duplicate_rows', None, {'subset_columns': spec['duplicate_subset']},
+         lambda df, qp, p: check_duplicate_rows(df, p)),
+        ('check_conditional', 'conditional_check', None,
+         {'if_condition': "aso_sls_ct == 0", 'then_condition': "aso_saa == 0"},
+         lambda df, qp, p: check_conditional(df, p)),
+        ('check_distribution_change', 'distribution_change', code_col,
+         {'historical_data_table': table, 'historical_data_column': code_col, 'historical_data_filter': hist_filter,
+          'thresholds': {'new_code_max_ratio': 0.2, 'freq_change_tolerance_abs': 0.1}},
+         lambda df, qp, p: check_distribution_change(df[code_col], code_col, p, qp)),
+        ('check_numeric_volatility', 'numeric_volatility', 'aso_saa',
+         {'method': 'iqr', 'group_by_columns': [group_col], 'historical_data_table': table,
+          'historical_data_column': 'aso_saa', 'historical_data_filter': hist_filter,
+          'thresholds': {'iqr_multiplier': 2.0}},
+         lambda df, qp, p: check_numeric_volatility(df['aso_saa'], 'aso_saa', p, qp, full_current_df=df)),
+        ('check_aggregate_value_trend', 'aggregate_value_trend', None,
+         {'column_to_aggregate': 'aso_saa', 'aggregate_function': 'SUM', 'group_by_columns': [group_col],
+          'current_period_value': current, 'historical_data_table': table,
+          'date_column_for_period': PARTITION_COLUMN, 'date_column_format': date_fmt,
+          'comparison_periods': trend_periods, 'threshold_ratio_decrease': 0.15, 'threshold_ratio_increase': 0.15},
+         lambda df, qp, p: check_aggregate_value_trend(df, p, qp)),
+        ('check_total_row_count_trend', 'total_row_count_trend', None,
+         {'current_period_value': current, 'historical_data_table': table,
+          'date_column_for_period': PARTITION_COLUMN, 'date_column_format': date_fmt,
+          'comparison_periods': trend_periods, 'threshold_ratio_decrease': 0.15, 'threshold_ratio_increase': 0.15},
+         lambda df, qp, p: check_total_row_count_trend(df, p, qp)),
+        ('check_consecutive_trend', 'consecutive_trend_check', None,
+         {'column_to_aggregate': 'aso_saa', 'aggregate_function': 'SUM', 'group_by_columns': [group_col],
+          'date_column_for_trend': PARTITION_COLUMN, 'trend_type': 'down', 'consecutive_periods': 3,
+          'period_unit': 'days' if is_daily else 'months', 'historical_data_table': table,
+          'historical_lookback_periods': 6},
+         lambda df, qp, p: check_consecutive_trend(df, p, qp)),
+        ('check_schema_change', 'schema_change_check', None,
+         {'table_name_in_db': table, 'engine': 'hive', 'auto_manage_baseline': True,
+          'baseline_schema_dir': baseline_schema_dir},
+         lambda df, qp, p: check_schema_change(None, p, qp)),
+    ]
+    return cases
+
+
+def build_rules_config(cases):
+    """측정한 check 항목들과 같은 규칙으로 run_data_validation용 rules_config를 구성합니다."""
+    rules_config = {'columns': {}, 'table_level_rules': []}
+    for case_name, rule_type, column, params, _ in cases:
+        rule = {'name': f"bench_{case_name}", 'type': rule_type, 'params': dict(params)}
+        if column:
+            rules_config['columns'].setdefault(column, []).append(rule)
+        else:
+            rules_config['table_level_rules'].append(rule)
+    return rules_config
+
+
+def _result_count(result):
+    if isinstance(result, tuple): result = result[0]
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def measure(func, repeat=1, measure_memory=True, verbose=False, q_processor=None):
+    """func()의 최소 실행 시간(wall/CPU), tracemalloc 최대 메모리(MB), 결과 건수, 쿼리 수/시간을 측정합니다."""
+    timings, cpu_timings, result = [], [], None
+    queries_before = dict(q_processor.stats) if q_processor is not None else None
+    for _ in range(max(1, repeat)):
+        output_ctx = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with output_ctx:
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            result = func()
+            timings.append(time.perf_counter() - start_wall)
+            cpu_timings.append(time.process_time() - start_cpu)
+    measurement = {'seconds': min(timings), 'cpu_seconds': min(cpu_timings), 'result_count': _result_count(result)}
+    if queries_before is not None:
+        runs = max(1, repeat)
+        measurement['queries'] = (q_processor.stats['queries'] - queries_before['queries']) // runs
+        measurement['query_seconds'] = (q_processor.stats['total_seconds'] - queries_before['total_seconds']) / runs
+    if measure_memory:
+        # tracemalloc은 실행을 느리게 하므로 시간 측정과 분리해 한 번 더 실행
+        output_ctx = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with output_ctx:
+            tracemalloc.start()
+            try:
+                tracemalloc.reset_peak()
+                start_bytes = tracemalloc.get_traced_memory()[0]
+                func()
+                measurement['peak_memory_mb'] = (tracemalloc.get_traced_memory()[1] - start_bytes) / 1024 / 1024
+            finally:
+                tracemalloc.stop()
+    return measurement
+
+
+def run_benchmarks(args):
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    schema_names = [s.strip() for s in args.schemas.split(',') if s.strip()]
+    selected = set(c.strip() for c in args.checks.split(',')) if args.checks else None
+    unknown = [s for s in schema_names if s not in SCHEMAS]
+    if unknown:
+        print(f"오류: 알 수 없는 스키마 {unknown} (사용 가능: {list(SCHEMAS)})")
+        sys.exit(2)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='dqm_bench_schema_') as baseline_schema_dir:
+        for schema_name in schema_names:
+            spec = SCHEMAS[schema_name]
+            q_processor = build_history_processor(schema_name, spec, args.history_rows, args.backend, args.seed)
+            cases = build_check_cases(spec, baseline_schema_dir)
+            for n_rows in sizes:
+                gen_start = time.perf_counter()
+                df = spec['generator'](n_rows, spec['current_period'], seed=args.seed)
+                df.attrs['name'] = spec['table']
+                print(f"정보: [{schema_name}] 현재 데이터 {n_rows:,}행 생성 ({time.perf_counter() - gen_start:.1f}초, "
+                      f"{df.memory_usage(deep=False).sum() / 1024 / 1024:,.0f}MB)")
+                # df/q_processor는 기본 인자로 묶어 둠 (루프 변수 늦은 참조 방지)
+                items = [(name, (lambda f=func, p=params, d=df, qp=q_processor: f(d, qp, p)))
+                         for name, _, _, params, func in cases]
+                if not args.skip_full_run:
+                    rules_config = build_rules_config(cases)
+                    items.append(('run_data_validation', lambda rc=rules_config, d=df, qp=q_processor,
+                                                                table=spec['table']: run_data_validation(
+                        dataframe=d, rules_config=rc, query_processor_instance=qp, log_to_console=False,
+                        disable_outer_tqdm=True, dataset_name=table)))
+                for name, func in items:
+                    if selected and name not in selected: continue
+                    key = f"{schema_name}|{n_rows}|{name}"
+                    try:
+                        measurement = measure(func, args.repeat, not args.skip_memory, args.verbose, q_processor)
+                    except Exception as e:
+                        print(f"경고: {key} 측정 실패: {e}")
+                        results[key] = {'error': str(e)}
+                        continue
+                    measurement['rows'] = n_rows
+                    measurement['rows_per_second'] = n_rows / measurement['seconds'] if measurement['seconds'] else None
+                    results[key] = measurement
+                    memory_str = f", 최대 메모리 {measurement['peak_memory_mb']:,.1f}MB" \
+                        if 'peak_memory_mb' in measurement else ""
+                    print(f"  {key:<60} {measurement['seconds']:>9.3f}초 (CPU {measurement['cpu_seconds']:.3f}초)"
+                          f"{memory_str}, 결과 {measurement['result_count']}건")
+                del df
+            q_processor.close()
+    return results
+
+
+def environment_info():
+    return {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(), 'node': platform.node(),
+            'cpu_count': os.cpu_count()}
+
+
+def compare_with_baseline(results, baseline, args):
+    """기준 측정값 대비 실행 시간/최대 메모리 회귀와 결과 건수 변경을 찾아 출력하고 회귀 목록을 반환합니다."""
+    base_results, base_env, env = baseline.get('results', {}), baseline.get('environment', {}), environment_info()
+    if {k: base_env.get(k) for k in ('machine', 'node', 'pandas', 'numpy')} != \
+            {k: env.get(k) for k in ('machine', 'node', 'pandas', 'numpy')}:
+        print(f"경고: 기준 측정 환경({base_env.get('node')}, pandas {base_env.get('pandas')})이 현재 환경과 다릅니다. "
+              f"시간 비교는 참고용입니다.")
+    regressions = []
+    print(f"\n{'항목':<60} {'기준(초)':>10} {'현재(초)':>10} {'비율':>7}  판정")
+    for key, current in results.items():
+        base = base_results.get(key)
+        if 'error' in current or not base or 'error' in base:
+            print(f"{key:<60} {'-':>10} {current.get('seconds', float('nan')):>10.3f} {'-':>7}  비교 불가")
+            continue
+        ratio = current['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        verdicts = []
+        if current['seconds'] > base['seconds'] * (1 + args.time_tolerance) and \
+                current['seconds'] - base['seconds'] > args.min_seconds:
+            verdicts.append('시간 회귀')
+        if 'peak_memory_mb' in current and 'peak_memory_mb' in base and \
+                current['peak_memory_mb'] > base['peak_memory_mb'] * (1 + args.memory_tolerance) and \
+                current['peak_memory_mb'] - base['peak_memory_mb'] > args.min_memory_mb:
+            verdicts.append(f"메모리 회귀({base['peak_memory_mb']:.1f}→{current['peak_memory_mb']:.1f}MB)")
+        if verdicts: regressions.append((key, verdicts))
+        if current.get('result_count') != base.get('result_count'):
+            verdicts.append(f"결과 건수 변경({base.get('result_count')}→{current.get('result_count')})")
+        if not verdicts and ratio < 1 - args.time_tolerance and base['seconds'] - current['seconds'] > args.min_seconds:
+            verdicts.append('개선')
+        print(f"{key:<60} {base['seconds']:>10.3f} {current['seconds']:>10.3f} {ratio:>6.2f}x  "
+              f"{', '.join(verdicts) or '정상'}")
+    return regressions
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    print(f"INFO: 벤치마크 시작 - 스키마 {args.schemas}, 크기 {args.sizes}, 과거 테이블 {args.history_rows:,}행 ({args.backend})")
+    results = run_benchmarks(args)
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'), 'environment': environment_info(),
+              'settings': {'history_rows': args.history_rows, 'backend': args.backend, 'repeat': args.repeat,
+                           'seed': args.seed}, 'results': results}
+    output_path = args.baseline if args.save_baseline else args.output
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nINFO: 측정 결과를 '{output_path}'에 저장했습니다.")
+    if args.save_baseline: sys.exit(0)
+    if not os.path.exists(args.baseline):
+        print(f"경고: 기준 파일 '{args.baseline}'이(가) 없어 비교를 건너뜁니다. --save-baseline으로 먼저 저장하세요.")
+        sys.exit(0)
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args)
+    if regressions:
+        print(f"\n>>> 성능 회귀 {len(regressions)}건 발견:")
+        for key, verdicts in regressions: print(f"  - {key}: {', '.join(verdicts)}")
+        sys.exit(1)
+    print("\n>>> 기준 대비 성능 회귀 없음.")
@@ -8,7 +8,7 @@ import argparse
 
 # dqmlib.py와 datalabQuery.py가 있는 경로를 sys.path에 추가하거나,
 # 같은 디렉토리에 위치시켜야 합니다.
-from dqmlib import run_data_validation
+from dqmlib import run_data_validation, CachedQueryProcessor
 from datalabQuery import QueryProcessor
 
 # ====================================================================
@@ -37,15 +37,18 @@ else:
     print(f"INFO: 인자가 없어 현재 년월 '{current_validation_month}'를 기준으로 검증을 시작합니다.")
 # ====================================================================
 
+table_name = 'mdb.bmalsa0025'
+partition_key_column = "bgda_plf_pti_id"
+
 # 실제 DB 연결을 위한 QueryProcessor 인스턴스 생성
-real_q_processor = QueryProcessor(clear_auth_tf=False)
+# 검증 년월 이전 파티션은 적재가 끝난 불변 데이터이므로 과거 조회 결과를 로컬 캐시에 보관 (최신 파티션만 Hive 조회)
+real_q_processor = CachedQueryProcessor(QueryProcessor(clear_auth_tf=False),
+                                        immutable_partition_before=current_validation_month,
+                                        partition_column=partition_key_column)
 
 # --- 1. 현재 검증 대상 데이터 로드 ---
 print("-" * 30)
 
-table_name = 'mdb.bmalsa0025'
-partition_key_column = "bgda_plf_pti_id"
-
 current_data_query = f"SELECT * from {table_name} where {partition_key_column} = {current_validation_month}"
 current_data_df = real_q_processor.fetch_to_pandas(query=current_data_query, engine="hive", limit=None)
 current_data_df.attrs['name'] = table_name
@@ -8,9 +8,40 @@ import calendar
 from tqdm import tqdm
 import os
 import time
+import itertools
+import sqlite3
+import hashlib
+import threading
+import contextlib
+import base64
+import concurrent.futures
+import asyncio
+import functools
+import ast
+import io
+import tokenize
+import inspect
+import cProfile
+import pstats
+import tracemalloc
+import sys
+
+try:
+    import resource  # 규칙별 최대 RSS 증가량 측정용 (Windows에는 없음)
+except ImportError:
+    resource = None
+
+try:
+    import pyarrow  # optimize_validation_dtypes의 Arrow 문자열 컬럼용 (없으면 범주형 변환만 수행)
+except ImportError:
+    pyarrow = None
 
 # --- 스키마 기준 파일 저장 디렉토리 (사용자 환경에 맞게 설정 가능) ---
 SCHEMA_BASELINE_DIR = "./schema_baselines/"
+# --- 과거 조회 결과 로컬 캐시 디렉토리 (CachedQueryProcessor 기본값) ---
+QUERY_CACHE_DIR = "./dqm_query_cache/"
+# --- 과거 파티션 프로파일 저장소 디렉토리 (ProfileStore 기본값) ---
+PROFILE_STORE_DIR = "./dqm_profile_store/"
 
 try:
     from datalabQuery import QueryProcessor as DatalabQueryProcessor
@@ -22,6 +53,24 @@ except ImportError:
         def fetch_to_pandas(self, query, engine=None, limit=None):
             query_preview = query[:150].replace('\n', ' ') + "..."
             print(f"INFO: Mock DatalabQueryProcessor - fetch_to_pandas 호출됨 (Query: {query_preview})")
+            if "AS hist_period" in query:
+                mock_periods = sorted(set(re.findall(r"'(\d{8}|\d{6})'", query)))
+                if "SUBSTRING(" in query: mock_periods = sorted(set(p[:6] for p in mock_periods))
+                gb_match = re.search(r"AS hist_period, (.*?), (?:SUM|AVG|COUNT)\(", query)
+                mock_group_cols = [gc.strip() for gc in gb_match.group(1).split(',')] if gb_match else []
+                mock_value_cols = re.findall(r"AS ((?:agg_value|not_null_count)(?:_\d+)?)", query)
+                mock_grouping_cols = re.findall(r"AS (grouping_\d+)", query)
+                mock_data = []
+                for period in mock_periods:
+                    # GROUPING SETS 병합 조회면 그룹 없는 (롤업) 행도 함께 생성
+                    for grp in (['A', 'B'] if mock_group_cols else []) + (
+                            [None] if not mock_group_cols or mock_grouping_cols else []):
+                        row = {'hist_period': period}
+                        for value_col in mock_value_cols: row[value_col] = np.random.randint(500, 2000)
+                        for gc_name in mock_group_cols: row[gc_name] = grp
+                        for grouping_col in mock_grouping_cols: row[grouping_col] = 0 if grp is not None else 1
+                        mock_data.append(row)
+                return pd.DataFrame(mock_data)
             if "COUNT(1) AS agg_value" in query or "COUNT(*) AS agg_value" in query:
                 if "GROUP BY" in query and re.search(r"SELECT .*?, COUNT", query, re.IGNORECASE):
                     mock_dates = [(datetime.now() - timedelta(days=i)).strftime("%Y%m%d") for i in range(5)]
@@ -127,6 +176,687 @@ except ImportError:
             return True
 
 
+_FRAME_PAYLOAD_MAGIC = b'DQMFRAME1'
+
+
+def _frame_to_payload(df):
+    """캐시 저장용 직렬화 (JSON 헤더 + 숫자/날짜 컬럼 원시 바이트, 로드 시 코드 실행 없음). 지원하지 않는 타입이면 None."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1: return None
+    if df.columns.has_duplicates or not all(isinstance(c, str) for c in df.columns): return None
+    columns, buffers, offset = [], [], 0
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            data = np.ascontiguousarray(series.to_numpy()).tobytes()
+            columns.append({'name': name, 'dtype': series.dtype.str, 'offset': offset, 'size': len(data)})
+            buffers.append(data)
+            offset += len(data)
+            continue
+        if not (series.dtype == object or isinstance(series.dtype, pd.StringDtype)): return None
+        values = series.tolist()
+        if not all(v is None or isinstance(v, (str, bool, int, float)) for v in values): return None
+        columns.append({'name': name, 'dtype': str(series.dtype), 'values': values})
+    header = json.dumps({'rows': len(df), 'columns': columns}, ensure_ascii=False).encode('utf-8')
+    return b''.join([_FRAME_PAYLOAD_MAGIC, len(header).to_bytes(8, 'little'), header] + buffers)
+
+
+def _frame_from_payload(payload):
+    """_frame_to_payload 결과를 DataFrame으로 복원합니다 (형식이 다르면 None)."""
+    payload = bytes(payload)
+    if not payload.startswith(_FRAME_PAYLOAD_MAGIC): return None
+    pos = len(_FRAME_PAYLOAD_MAGIC)
+    header_len = int.from_bytes(payload[pos:pos + 8], 'little')
+    header = json.loads(payload[pos + 8:pos + 8 + header_len].decode('utf-8'))
+    data_start = pos + 8 + header_len
+    data = {}
+    for col in header['columns']:
+        if 'values' in col:
+            data[col['name']] = pd.Series(col['values'], dtype=object if col['dtype'] == 'object' else col['dtype'])
+        else:
+            dtype = np.dtype(col['dtype'])
+            data[col['name']] = np.frombuffer(payload, dtype=dtype, count=col['size'] // dtype.itemsize,
+                                              offset=data_start + col['offset']).copy()
+    return pd.DataFrame(data, columns=[col['name'] for col in header['columns']], index=pd.RangeIndex(header['rows']))
+
+
+_db_fetch_timing = threading.local()  # _RuleQueryMeter가 측정 중인 조회의 실제 DB 조회 시간 (잠금 대기 제외)
+
+
+def _report_db_fetch_seconds(seconds):
+    fetch_seconds = getattr(_db_fetch_timing, 'fetch_seconds', None)
+    if fetch_seconds is not None: fetch_seconds.append(seconds)
+
+
+@contextlib.contextmanager
+def _timed_db_fetch():
+    """잠금을 잡은 뒤의 실제 조회 구간을 측정해 _RuleQueryMeter에 알립니다 (안쪽에서 이미 측정했으면 그 값을 사용)."""
+    fetch_seconds = getattr(_db_fetch_timing, 'fetch_seconds', None)
+    reported_before = len(fetch_seconds) if fetch_seconds is not None else 0
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        if fetch_seconds is not None and len(fetch_seconds) == reported_before:
+            fetch_seconds.append(time.perf_counter() - start_time)
+
+
+class CachedQueryProcessor:
+    """조회 결과를 로컬 SQLite 파일에 캐시하는 QueryProcessor 래퍼 (불변 파티션 조회는 만료 없이, 그 외는 ttl_seconds 동안 보관)."""
+
+    def __init__(self, q_processor, cache_dir=QUERY_CACHE_DIR, ttl_seconds=None, immutable_partition_before=None,
+                 max_cache_bytes=512 * 1024 * 1024, partition_column=None):
+        self.q_processor = q_processor
+        self.partition_columns = [partition_column] if isinstance(partition_column, str) else list(partition_column or [])
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.immutable_partition_before = str(immutable_partition_before) if immutable_partition_before else None
+        self.max_cache_bytes = max_cache_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expired': 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, 'query_cache.sqlite')
+        with self._connect() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS query_cache (cache_key TEXT PRIMARY KEY, engine TEXT, "
+                        "query_text TEXT, payload BLOB, size_bytes INTEGER, is_immutable INTEGER, "
+                        "created_at REAL, last_access_at REAL)")
+
+    def __getattr__(self, name):
+        if name == 'q_processor': raise AttributeError(name)
+        return getattr(self.q_processor, name)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.cache_path, timeout=30)
+        try:
+            with con: yield con
+        finally:
+            con.close()
+
+    @staticmethod
+    def normalize_query(query):
+        normalized = re.sub(r"\s+", " ", str(query)).strip().rstrip(';').strip()
+        # 문자열 리터럴 밖의 SQL 키워드/식별자 대소문자 차이는 같은 쿼리로 취급
+        return "".join(part if i % 2 else part.lower() for i, part in enumerate(normalized.split("'")))
+
+    def _cache_key(self, query, engine, limit):
+        return hashlib.sha256(f"{engine}|{limit}|{self.normalize_query(query)}".encode('utf-8')).hexdigest()
+
+    def is_immutable_query(self, query):
+        """partition_column 조건의 상한이 immutable_partition_before 이전이면 True (OR/NOT이 있는 쿼리는 판단하지 않고 False)."""
+        if not self.immutable_partition_before or not self.partition_columns: return False
+        sql = str(query)
+        sql_without_literals = re.sub(r"\bIS\s+NOT\s+NULL\b", "", re.sub(r"'[^']*'", "''", sql), flags=re.I)
+        if re.search(r"\b(OR|NOT)\b", sql_without_literals, re.IGNORECASE): return False
+        literal = r"'?(\d{8}|\d{6})'?(?!\d)"
+        for col in self.partition_columns:
+            col_expr = (rf"(?:SUBSTR(?:ING)?\(\s*CAST\(\s*{re.escape(col)}\s+AS\s+STRING\s*\)\s*,\s*1\s*,\s*\d+\s*\)"
+                        rf"|\b{re.escape(col)}\b)")
+            if any(m.group(2) <= self.immutable_partition_before[:len(m.group(2))]
+                   for m in re.finditer(rf"{col_expr}\s*(<)(?![=>])\s*{literal}", sql, re.I)): return True
+            upper_bounds = [[m.group(1)] for m in re.finditer(rf"{col_expr}\s*(?:=|<=)\s*{literal}", sql, re.I)]
+            upper_bounds += [[m.group(2)] for m in re.finditer(rf"{col_expr}\s+BETWEEN\s+{literal}\s+AND\s+{literal}",
+                                                               sql, re.I)]
+            for m in re.finditer(rf"{col_expr}\s+IN\s*\(([^)]*)\)", sql, re.I):
+                items = [item.strip() for item in m.group(1).split(',')]
+                if all(re.fullmatch(literal, item) for item in items):
+                    upper_bounds.append([re.fullmatch(literal, item).group(1) for item in items])
+            if any(all(_is_partition_before(p, self.immutable_partition_before) for p in bound) for bound in upper_bounds):
+                return True
+        return False
+
+    def get_cached_frame(self, query, engine=None, limit=None):
+        """캐시된 결과 DataFrame(새 객체)을 반환하고, 없거나 만료되었으면 None을 반환합니다."""
+        cache_key = self._cache_key(query, engine, limit)
+        with self._lock, self._connect() as con:
+            row = con.execute("SELECT payload, is_immutable, created_at FROM query_cache WHERE cache_key = ?",
+                              (cache_key,)).fetchone()
+            cached_df = _frame_from_payload(row[0]) if row is not None else None
+            if row is not None and (cached_df is None or not row[1] and (
+                    self.ttl_seconds is None or time.time() - row[2] > self.ttl_seconds)):
+                con.execute("DELETE FROM query_cache WHERE cache_key = ?", (cache_key,))
+                self.stats['expired'] += 1
+                row = None
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            con.execute("UPDATE query_cache SET last_access_at = ? WHERE cache_key = ?", (time.time(), cache_key))
+            self.stats['hits'] += 1
+        return cached_df
+
+    def store_frame(self, query, engine, df, limit=None, immutable=None):
+        """조회 결과를 캐시에 저장합니다. immutable이 None이면 쿼리의 파티션 값으로 판단합니다."""
+        is_immutable = self.is_immutable_query(query) if immutable is None else bool(immutable)
+        if df is None or (not is_immutable and self.ttl_seconds is None): return False
+        payload = _frame_to_payload(df)
+        if payload is None: return False
+        now = time.time()
+        with self._lock, self._connect() as con:
+            con.execute("INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (self._cache_key(query, engine, limit), str(engine), self.normalize_query(query), payload,
+                         len(payload), int(is_immutable), now, now))
+            self.stats['stores'] += 1
+            self._evict_if_needed(con)
+        return True
+
+    def _evict_if_needed(self, con):
+        total_bytes = con.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM query_cache").fetchone()[0]
+        if total_bytes <= self.max_cache_bytes: return
+        for cache_key, size_bytes in con.execute(
+                "SELECT cache_key, size_bytes FROM query_cache ORDER BY last_access_at").fetchall():
+            if total_bytes <= self.max_cache_bytes: break
+            con.execute("DELETE FROM query_cache WHERE cache_key = ?", (cache_key,))
+            total_bytes -= size_bytes
+            self.stats['evictions'] += 1
+
+    def fetch_to_pandas(self, query, engine=None, limit=None, use_cache=True):
+        is_select = re.match(r"\s*(SELECT|WITH)\b", str(query), re.IGNORECASE) is not None
+        if use_cache and is_select:
+            cached_df = self.get_cached_frame(query, engine, limit)
+            if cached_df is not None:
+                _report_db_fetch_seconds(0.0)  # 캐시 적중은 DB 조회 시간 없음
+                return cached_df
+        with _timed_db_fetch():
+            result_df = self.q_processor.fetch_to_pandas(query=query, engine=engine, limit=limit)
+        if use_cache and is_select: self.store_frame(query, engine, result_df, limit)
+        return result_df
+
+    def cache_stats(self):
+        with self._lock, self._connect() as con:
+            entries, total_bytes = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM query_cache").fetchone()
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({'entries': entries, 'size_bytes': total_bytes,
+                      'hit_ratio': stats['hits'] / lookups if lookups else 0.0})
+        return stats
+
+    def clear_cache(self):
+        with self._lock, self._connect() as con:
+            con.execute("DELETE FROM query_cache")
+
+
+class AsyncQueryProcessor:
+    """동기 QueryProcessor 조회를 스레드 풀에서 실행해 asyncio로 기다리는 어댑터 (전체/엔진별 동시 실행 수 제한)."""
+
+    def __init__(self, q_processor, max_concurrency=4, engine_limits=None):
+        self.q_processor = q_processor
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.engine_limits = dict(engine_limits or {})
+        self.stats = {'queries': 0, 'in_flight': 0, 'max_in_flight': 0, 'wait_seconds': 0.0}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                               thread_name_prefix='dqm-query')
+        self._loop_state = None  # (이벤트 루프, 전체 세마포어, {엔진: 세마포어}) - asyncio 세마포어는 루프별로 생성
+
+    def __getattr__(self, name):
+        if name == 'q_processor': raise AttributeError(name)
+        return getattr(self.q_processor, name)
+
+    def _semaphores(self, engine):
+        loop = asyncio.get_running_loop()
+        if self._loop_state is None or self._loop_state[0] is not loop:
+            self._loop_state = (loop, asyncio.Semaphore(self.max_concurrency), {})
+        _, global_semaphore, engine_semaphores = self._loop_state
+        engine_limit = self.engine_limits.get(engine)
+        if engine_limit and engine not in engine_semaphores:
+            engine_semaphores[engine] = asyncio.Semaphore(max(1, int(engine_limit)))
+        return global_semaphore, engine_semaphores.get(engine)
+
+    @contextlib.asynccontextmanager
+    async def _query_slot(self, engine):
+        global_semaphore, engine_semaphore = self._semaphores(engine)
+        wait_start = time.time()
+        # 엔진 제한을 먼저 잡아야 한 엔진의 대기 조회가 전체 슬롯을 차지하지 않음
+        async with contextlib.AsyncExitStack() as stack:
+            if engine_semaphore is not None: await stack.enter_async_context(engine_semaphore)
+            await stack.enter_async_context(global_semaphore)
+            self.stats['wait_seconds'] += time.time() - wait_start
+            self.stats['queries'] += 1
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+            try:
+                yield
+            finally:
+                self.stats['in_flight'] -= 1
+
+    async def run_blocking(self, engine, func, *args, **kwargs):
+        """func(감싼 q_processor, *args, **kwargs)를 조회 슬롯(engine 기준)을 잡은 채 스레드 풀에서 실행합니다."""
+        async with self._query_slot(engine):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor,
+                                              functools.partial(func, self.q_processor, *args, **kwargs))
+
+    async def _call(self, method_name, slot_engine, **kwargs):
+        async_method = getattr(self.q_processor, f"{method_name}_async", None)
+        if async_method is not None and asyncio.iscoroutinefunction(async_method):
+            async with self._query_slot(slot_engine):
+                return await async_method(**kwargs)
+        return await self.run_blocking(slot_engine, lambda qp: getattr(qp, method_name)(**kwargs))
+
+    async def fetch_to_pandas(self, query, engine=None, limit=None):
+        return await self._call('fetch_to_pandas', engine, query=query, engine=engine, limit=limit)
+
+    async def describe_table(self, table_name, engine=None):
+        return await self._call('describe_table', engine, table_name=table_name, engine=engine)
+
+    async def fetch_many(self, queries, return_exceptions=False):
+        """[(query, engine), ...] 또는 [query, ...]를 동시에 조회하고 입력 순서대로 DataFrame 목록을 반환합니다."""
+        query_items = [q if isinstance(q, (tuple, list)) else (q, None) for q in queries]
+        return await asyncio.gather(*(self.fetch_to_pandas(query=q, engine=eng) for q, eng in query_items),
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class _SqliteSampleAggregate:
+    """SQLite에 없는 Hive 표본 통계 집계(STDDEV_SAMP/VAR_SAMP) - LocalQueryProcessor에서 등록해 사용합니다."""
+    ddof_power = 0.5
+
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None: self.values.append(float(value))
+
+    def finalize(self):
+        if len(self.values) < 2: return None
+        return float(np.var(self.values, ddof=1) ** self.ddof_power)
+
+
+class _SqliteVarianceAggregate(_SqliteSampleAggregate):
+    ddof_power = 1
+
+
+class _SqlitePercentileAggregate:
+    """Hive PERCENTILE_APPROX(컬럼, p)를 정확한 분위수(선형 보간)로 계산하는 SQLite 집계입니다."""
+
+    def __init__(self):
+        self.values, self.percentile = [], 0.5
+
+    def step(self, value, percentile):
+        self.percentile = float(percentile)
+        if value is not None: self.values.append(float(value))
+
+    def finalize(self):
+        return float(np.percentile(self.values, self.percentile * 100)) if self.values else None
+
+
+def _sqlite_try_double(value):
+    # Hive CAST(... AS DOUBLE)처럼 숫자로 바꿀 수 없는 값은 NULL (SQLite CAST는 0을 반환)
+    if value is None or isinstance(value, float): return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sqlite_regexp(pattern, value):
+    # SQLite 'X REGEXP Y'는 regexp(Y, X)로 호출됨. Hive RLIKE와 같이 문자열 일부만 맞아도 True (Java find())
+    if value is None or pattern is None: return None
+    return re.search(pattern, str(value)) is not None
+
+
+def _split_sql_top_level(sql_text, separator=','):
+    """괄호 밖의 separator(',' 또는 정규식 대상 키워드가 아닌 단순 문자열) 위치에서 SQL 조각을 나눕니다."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(sql_text):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and sql_text.startswith(separator, i):
+            parts.append(sql_text[start:i].strip()); start = i + len(separator)
+    parts.append(sql_text[start:].strip())
+    return [p for p in parts if p]
+
+
+class LocalQueryProcessor:
+    """Hive SQL을 로컬 SQLite/DuckDB에서 실행하는 QueryProcessor 대체 구현 (과거 조회 경로 검증/성능 측정용)."""
+
+    _HIVE_TYPE_NAMES = {'text': 'string', 'varchar': 'string', 'integer': 'bigint', 'bigint': 'bigint',
+                        'int': 'int', 'real': 'double', 'double': 'double', 'float': 'float', 'boolean': 'boolean',
+                        'date': 'date', 'timestamp': 'timestamp'}
+
+    def __init__(self, tables=None, backend='sqlite', database=':memory:', partition_columns=None,
+                 slow_query_seconds=1.0, verbose=False):
+        self.backend = str(backend).lower()
+        if self.backend not in ('sqlite', 'duckdb'):
+            raise ValueError(f"지원하지 않는 backend '{backend}' (sqlite 또는 duckdb).")
+        self.database = database
+        self.slow_query_seconds = slow_query_seconds
+        self.verbose = verbose
+        self.partition_columns = {str(t).lower(): list(cols) for t, cols in (partition_columns or {}).items()}
+        self.column_comments = {}
+        self.query_log = []
+        self.stats = {'queries': 0, 'errors': 0, 'rows': 0, 'total_seconds': 0.0, 'slow_queries': 0}
+        self._lock = threading.RLock()
+        self._schemas = set()
+        if self.backend == 'duckdb':
+            try:
+                import duckdb
+            except ImportError:
+                raise ImportError("backend='duckdb'에는 duckdb 패키지가 필요합니다. (pip install duckdb)")
+            self.con = duckdb.connect(database)
+        else:
+            self.con = sqlite3.connect(database, check_same_thread=False)
+            self.con.create_aggregate('STDDEV_SAMP', 1, _SqliteSampleAggregate)
+            self.con.create_aggregate('STDDEV', 1, _SqliteSampleAggregate)
+            self.con.create_aggregate('VAR_SAMP', 1, _SqliteVarianceAggregate)
+            self.con.create_aggregate('PERCENTILE_APPROX', 2, _SqlitePercentileAggregate)
+            self.con.create_function('DQM_TRY_DOUBLE', 1, _sqlite_try_double, deterministic=True)
+            self.con.create_function('REGEXP', 2, _sqlite_regexp, deterministic=True)
+        for table_name, source in (tables or {}).items():
+            self.load_table(table_name, source)
+
+    # ----- 테이블 적재 -----
+    def _ensure_schema(self, table_name):
+        if '.' not in table_name: return
+        schema = table_name.split('.', 1)[0].lower()
+        if schema in self._schemas: return
+        if self.backend == 'duckdb':
+            self.con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        else:
+            # SQLite는 'mdb.테이블'을 첨부(ATTACH)한 DB 'mdb'의 테이블로 해석하므로 스키마마다 DB를 첨부
+            schema_db = ':memory:' if self.database == ':memory:' else f"{os.path.splitext(self.database)[0]}.{schema}.sqlite"
+            self.con.execute("ATTACH DATABASE ? AS " + schema, (schema_db,))
+        self._schemas.add(schema)
+
+    def _table_exists(self, table_name):
+        schema, _, name = table_name.lower().rpartition('.')
+        if self.backend == 'duckdb':
+            return self.con.execute("SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = ? AND "
+                                    "table_name = ?", (schema or 'main', name)).fetchone()[0] > 0
+        if schema and schema not in self._schemas: return False
+        master = f"{schema}.sqlite_master" if schema else "sqlite_master"
+        return self.con.execute(f"SELECT COUNT(*) FROM {master} WHERE type = 'table' AND lower(name) = ?",
+                                (name,)).fetchone()[0] > 0
+
+    def _local_column_type(self, series):
+        if pd.api.types.is_bool_dtype(series): return 'BOOLEAN' if self.backend == 'duckdb' else 'INTEGER'
+        if pd.api.types.is_integer_dtype(series): return 'BIGINT' if self.backend == 'duckdb' else 'INTEGER'
+        if pd.api.types.is_float_dtype(series): return 'DOUBLE' if self.backend == 'duckdb' else 'REAL'
+        if pd.api.types.is_datetime64_any_dtype(series): return 'TIMESTAMP' if self.backend == 'duckdb' else 'TEXT'
+        return 'VARCHAR' if self.backend == 'duckdb' else 'TEXT'
+
+    @staticmethod
+    def _sqlite_column_values(series):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.astype(object).where(series.notna(), None).map(lambda v: v if v is None else str(v)).tolist()
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series) or \
+                pd.api.types.is_float_dtype(series):
+            return series.astype(object).where(series.notna(), None).map(
+                lambda v: v.item() if isinstance(v, np.generic) else v).tolist()
+        values = series.astype(object).where(series.notna(), None)
+        return [v if v is None or isinstance(v, (str, int, float, bytes)) else
+                (v.item() if isinstance(v, np.generic) else str(v)) for v in values]
+
+    def _insert_frame(self, table_name, df):
+        if df.empty: return
+        if self.backend == 'duckdb':
+            self.con.register('dqm_insert_frame', df)
+            try:
+                self.con.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM dqm_insert_frame")
+            finally:
+                self.con.unregister('dqm_insert_frame')
+            return
+        column_values = [self._sqlite_column_values(df[c]) for c in df.columns]
+        col_list_str = ", ".join(f'"{c}"' for c in df.columns)
+        with self.con:
+            self.con.executemany(f"INSERT INTO {table_name} ({col_list_str}) VALUES "
+                                 f"({', '.join('?' * len(df.columns))})", zip(*column_values))
+
+    def _create_table(self, table_name, df):
+        col_defs_str = ", ".join(f'"{c}" {self._local_column_type(df[c])}' for c in df.columns)
+        self.con.execute(f"CREATE TABLE {table_name} ({col_defs_str})")
+
+    def load_table(self, table_name, source, partition_columns=None, column_comments=None, replace=True,
+                   **read_kwargs):
+        """source(DataFrame 또는 .parquet/.csv 경로)를 table_name 테이블로 적재합니다 (read_kwargs는 pd.read_* 인자)."""
+        table_name = str(table_name).lower()
+        if isinstance(source, pd.DataFrame):
+            df = source
+        else:
+            source_path = str(source)
+            if source_path.lower().endswith('.csv'):
+                df = pd.read_csv(source_path, **read_kwargs)
+            elif source_path.lower().endswith(('.parquet', '.pq')):
+                if self.backend == 'duckdb' and not read_kwargs:
+                    # DuckDB는 pyarrow 없이 Parquet을 직접 읽을 수 있음
+                    df = self.con.execute("SELECT * FROM read_parquet(?)", (source_path,)).df()
+                else:
+                    df = pd.read_parquet(source_path, **read_kwargs)
+            else:
+                raise ValueError(f"지원하지 않는 fixture 형식: {source_path} (.parquet 또는 .csv)")
+        start_time = time.time()
+        with self._lock:
+            self._ensure_schema(table_name)
+            if self._table_exists(table_name):
+                if not replace: raise ValueError(f"테이블 '{table_name}'이(가) 이미 있습니다.")
+                self.con.execute(f"DROP TABLE {table_name}")
+            self._create_table(table_name, df)
+            self._insert_frame(table_name, df)
+        if partition_columns is not None: self.partition_columns[table_name] = list(partition_columns)
+        if column_comments is not None: self.column_comments[table_name] = dict(column_comments)
+        if self.verbose:
+            print(f"정보: LocalQueryProcessor - '{table_name}' 적재 완료 ({len(df)}행, {time.time() - start_time:.2f}초)")
+        return len(df)
+
+    # ----- Hive SQL 변환 -----
+    @staticmethod
+    def _extract_literals(query):
+        """문자열 리터럴(Hive 백슬래시 이스케이프 해석)을 자리표시자로 바꾼 SQL과 리터럴 값 목록을 반환합니다."""
+        escapes = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', 'Z': '\x1a'}
+        out, literals, i = [], [], 0
+        while i < len(query):
+            ch = query[i]
+            if ch in ("'", '"'):
+                value, j = [], i + 1
+                while j < len(query) and query[j] != ch:
+                    if query[j] == '\\' and j + 1 < len(query):
+                        # LIKE 패턴용 '\%', '\_'는 백슬래시를 유지 (Hive와 동일)
+                        nxt = query[j + 1]
+                        value.append('\\' + nxt if nxt in '%_' else escapes.get(nxt, nxt)); j += 2
+                    else:
+                        value.append(query[j]); j += 1
+                out.append(f" __dqm_lit_{len(literals)}__ "); literals.append(''.join(value)); i = j + 1
+            elif ch == '`':
+                j = query.find('`', i + 1)
+                j = len(query) if j < 0 else j
+                out.append(f'"{query[i + 1:j]}"'); i = j + 1
+            else:
+                out.append(ch); i += 1
+        return ''.join(out), literals
+
+    def _rewrite_casts(self, sql_text):
+        out, pos = [], 0
+        for match in re.finditer(r"\bCAST\s*\(", sql_text, re.IGNORECASE):
+            if match.start() < pos: continue
+            depth, end = 1, match.end()
+            while end < len(sql_text) and depth:
+                depth += {'(': 1, ')': -1}.get(sql_text[end], 0); end += 1
+            inner = sql_text[match.end():end - 1]
+            as_parts = re.split(r"\s+AS\s+", inner, flags=re.IGNORECASE)
+            expr, cast_type = self._rewrite_casts(' AS '.join(as_parts[:-1])), as_parts[-1].strip().upper()
+            base_type = cast_type.split('(')[0].strip()
+            if base_type in ('STRING', 'VARCHAR', 'CHAR'):
+                cast_sql = f"CAST({expr} AS {'VARCHAR' if self.backend == 'duckdb' else 'TEXT'})"
+            elif base_type in ('DOUBLE', 'FLOAT', 'DECIMAL', 'REAL'):
+                cast_sql = f"TRY_CAST({expr} AS DOUBLE)" if self.backend == 'duckdb' else f"DQM_TRY_DOUBLE({expr})"
+            else:
+                cast_sql = f"CAST({expr} AS {cast_type})"
+            out.append(sql_text[pos:match.start()] + cast_sql); pos = end
+        out.append(sql_text[pos:])
+        return ''.join(out)
+
+    @staticmethod
+    def _expand_grouping_sets(sql_text):
+        """SQLite용: 'SELECT ... GROUP BY a, b GROUPING SETS ((a), (a, b))'를 집합별 SELECT의 UNION ALL로 바꿉니다."""
+        match = re.match(r"\s*SELECT\s+(?P<select>.*?)\s+(?P<from>FROM\s.*?)\s+GROUP\s+BY\s+(?P<group_by>.*?)"
+                         r"\s+GROUPING\s+SETS\s*\((?P<sets>.*)\)\s*$", sql_text, re.IGNORECASE | re.DOTALL)
+        if not match: return sql_text
+        norm = lambda s: re.sub(r"\s+", " ", s).strip().lower()
+        group_by_exprs = [norm(g) for g in _split_sql_top_level(match.group('group_by'))]
+        select_items = []
+        for item in _split_sql_top_level(match.group('select')):
+            as_parts = re.split(r"\s+AS\s+", item, flags=re.IGNORECASE)
+            expr = ' AS '.join(as_parts[:-1]) if len(as_parts) > 1 else item
+            select_items.append((item, expr, as_parts[-1].strip() if len(as_parts) > 1 else item))
+        union_parts = []
+        for grouping_set in _split_sql_top_level(match.group('sets')):
+            set_exprs = [norm(g) for g in _split_sql_top_level(grouping_set.strip()[1:-1] if grouping_set.strip().startswith('(') else grouping_set)]
+            select_list = []
+            for item, expr, alias in select_items:
+                grouping_match = re.fullmatch(r"GROUPING\s*\((.*)\)", expr.strip(), re.IGNORECASE)
+                if grouping_match:
+                    select_list.append(f"{0 if norm(grouping_match.group(1)) in set_exprs else 1} AS {alias}")
+                elif norm(expr) in group_by_exprs and norm(expr) not in set_exprs:
+                    select_list.append(f"NULL AS {alias}")
+                else:
+                    select_list.append(item)
+            union_parts.append(f"SELECT {', '.join(select_list)} {match.group('from')}" +
+                               (f" GROUP BY {', '.join(set_exprs)}" if set_exprs else ""))
+        return " UNION ALL ".join(union_parts)
+
+    def translate_query(self, query):
+        """Hive SQL을 현재 backend(SQLite/DuckDB)에서 실행 가능한 SQL로 변환합니다."""
+        sql_text, literals = self._extract_literals(str(query).strip().rstrip(';'))
+        sql_text = self._rewrite_casts(sql_text)
+        if self.backend == 'duckdb':
+            sql_text = re.sub(r"\bPERCENTILE_APPROX\s*\(", "QUANTILE_CONT(", sql_text, flags=re.IGNORECASE)
+            # DuckDB '~'는 전체 일치이므로 Hive RLIKE(부분 일치)와 같도록 패턴 앞뒤를 '.*'로 감쌈
+            for lit_idx in re.findall(r"\bRLIKE\s+__dqm_lit_(\d+)__", sql_text, flags=re.IGNORECASE):
+                literals[int(lit_idx)] = f"(?s).*(?:{literals[int(lit_idx)]}).*"
+            sql_text = re.sub(r"\bNOT\s+RLIKE\b", "!~", sql_text, flags=re.IGNORECASE)
+            sql_text = re.sub(r"\bRLIKE\b", "~", sql_text, flags=re.IGNORECASE)
+            sql_text = re.sub(r"\bGROUP\s+BY\s+[^()]*?\s+GROUPING\s+SETS\b", "GROUP BY GROUPING SETS", sql_text,
+                              flags=re.IGNORECASE)
+        else:
+            sql_text = re.sub(r"\bRLIKE\b", "REGEXP", sql_text, flags=re.IGNORECASE)
+            sql_text = self._expand_grouping_sets(sql_text)
+        return re.sub(r" __dqm_lit_(\d+)__ ", lambda m: "'" + literals[int(m.group(1))].replace("'", "''") + "'",
+                      sql_text)
+
+    # ----- QueryProcessor 인터페이스 -----
+    def _record_query(self, query, translated_sql, engine, seconds, rows, error=None):
+        entry = {'query_no': len(self.query_log) + 1, 'engine': engine, 'seconds': seconds, 'rows': rows,
+                 'status': 'Error' if error else 'Success', 'error': str(error) if error else None,
+                 'query': query, 'translated_sql': translated_sql}
+        self.query_log.append(entry)
+        self.stats['queries'] += 1
+        self.stats['errors'] += int(error is not None)
+        self.stats['rows'] += rows
+        self.stats['total_seconds'] += seconds
+        if self.slow_query_seconds is not None and seconds >= self.slow_query_seconds:
+            self.stats['slow_queries'] += 1
+            query_preview = re.sub(r"\s+", " ", str(query))[:200]
+            print(f"경고: LocalQueryProcessor - 느린 쿼리 #{entry['query_no']} ({seconds:.2f}초, {rows}행): {query_preview}")
+        elif self.verbose:
+            print(f"정보: LocalQueryProcessor - 쿼리 #{entry['query_no']} {seconds:.3f}초, {rows}행")
+
+    def fetch_to_pandas(self, query, engine=None, limit=None):
+        translated_sql = self.translate_query(query)
+        if limit is not None: translated_sql = f"SELECT * FROM ({translated_sql}) dqm_limited LIMIT {int(limit)}"
+        is_select = re.match(r"\s*(SELECT|WITH)\b", translated_sql, re.IGNORECASE) is not None
+        with self._lock, _timed_db_fetch():
+            start_time = time.perf_counter()
+            try:
+                if self.backend == 'duckdb':
+                    cursor = self.con.execute(translated_sql)
+                    result_df = cursor.df() if is_select else pd.DataFrame()
+                elif is_select:
+                    result_df = pd.read_sql_query(translated_sql, self.con)
+                else:
+                    with self.con: self.con.execute(translated_sql)
+                    result_df = pd.DataFrame()
+            except Exception as e:
+                self._record_query(query, translated_sql, engine, time.perf_counter() - start_time, 0, e)
+                raise
+            self._record_query(query, translated_sql, engine, time.perf_counter() - start_time, len(result_df))
+        return result_df
+
+    def _local_columns(self, table_name):
+        schema, _, name = table_name.rpartition('.')
+        if self.backend == 'duckdb':
+            rows = self.con.execute("SELECT column_name, data_type FROM information_schema.columns WHERE "
+                                    "table_schema = ? AND table_name = ? ORDER BY ordinal_position",
+                                    (schema or 'main', name)).fetchall()
+        else:
+            rows = [(r[1], r[2]) for r in self.con.execute(
+                f"PRAGMA {schema + '.' if schema else ''}table_info({name})").fetchall()]
+        return [(col, self._HIVE_TYPE_NAMES.get(str(col_type).split('(')[0].strip().lower(), str(col_type).lower()))
+                for col, col_type in rows]
+
+    def describe_table(self, table_name, engine=None):
+        """Hive DESCRIBE(COL_NAME/DATA_TYPE/COMMENT, 파티션 정보 포함) 또는 EDW 컬럼 메타 형식으로 스키마를 반환합니다."""
+        table_name = str(table_name).lower()
+        with self._lock, _timed_db_fetch():
+            if not self._table_exists(table_name): return pd.DataFrame()
+            columns = self._local_columns(table_name)
+        comments = self.column_comments.get(table_name, {})
+        if engine and engine.lower() == 'edw':
+            return pd.DataFrame([{'COLUMN_ID': i + 1, 'OWNER': table_name.rpartition('.')[0].upper(),
+                                  'TABLE_NAME': table_name.rpartition('.')[2].upper(), 'COLUMN_NAME': col.upper(),
+                                  'COMMENTS': comments.get(col, ''), 'DATA_TYPE': col_type.upper(), 'NULLABLE': 'Y'}
+                                 for i, (col, col_type) in enumerate(columns)])
+        rows = [{'COL_NAME': col, 'DATA_TYPE': col_type, 'COMMENT': comments.get(col, '')} for col, col_type in columns]
+        partition_cols = [c for c in self.partition_columns.get(table_name, []) if c in dict(columns)]
+        if partition_cols:
+            rows += [{'COL_NAME': '# Partition Information', 'DATA_TYPE': None, 'COMMENT': None},
+                     {'COL_NAME': '# col_name', 'DATA_TYPE': 'data_type', 'COMMENT': 'comment'}]
+            rows += [{'COL_NAME': c, 'DATA_TYPE': dict(columns)[c], 'COMMENT': comments.get(c, '')}
+                     for c in partition_cols]
+        return pd.DataFrame(rows, columns=['COL_NAME', 'DATA_TYPE', 'COMMENT'])
+
+    def save_pandas_to_datalake(self, df, db_name, table_name, partition_column, overwrite_tf=False):
+        """df를 로컬 테이블 db_name.table_name에 추가합니다. overwrite_tf=True면 df에 있는 파티션 값의 기존 행을 먼저 지웁니다."""
+        full_table_name = f"{db_name}.{table_name}".lower()
+        start_time = time.perf_counter()
+        with self._lock:
+            self._ensure_schema(full_table_name)
+            if not self._table_exists(full_table_name):
+                self._create_table(full_table_name, df)
+            else:
+                existing_cols = {c.lower() for c, _ in self._local_columns(full_table_name)}
+                for c in df.columns:
+                    # Hive 결과 테이블에 컬럼이 추가된 경우와 같이 새 컬럼은 테이블 끝에 추가
+                    if str(c).lower() not in existing_cols:
+                        self.con.execute(f'ALTER TABLE {full_table_name} ADD COLUMN "{c}" '
+                                         f'{self._local_column_type(df[c])}')
+                if overwrite_tf and partition_column in df.columns:
+                    partition_values = [str(v) for v in df[partition_column].dropna().unique()]
+                    if partition_values:
+                        self.con.execute(f'DELETE FROM {full_table_name} WHERE CAST("{partition_column}" AS '
+                                         f"{'VARCHAR' if self.backend == 'duckdb' else 'TEXT'}) IN "
+                                         f"({', '.join('?' * len(partition_values))})", partition_values)
+            self._insert_frame(full_table_name, df)
+            self._record_query(f"INSERT INTO {full_table_name} ({len(df)}행)", None, 'datalake',
+                               time.perf_counter() - start_time, len(df))
+        self.partition_columns.setdefault(full_table_name, [partition_column] if partition_column else [])
+        return True
+
+    # ----- 쿼리 시간 보고 -----
+    def slowest_queries(self, top_n=10):
+        """실행 시간이 긴 순서로 상위 top_n개 쿼리 기록(DataFrame)을 반환합니다."""
+        if not self.query_log: return pd.DataFrame(columns=['query_no', 'engine', 'seconds', 'rows', 'status', 'query'])
+        log_df = pd.DataFrame(self.query_log)
+        return log_df.sort_values('seconds', ascending=False, kind='mergesort').head(top_n).reset_index(drop=True)
+
+    def print_query_report(self, top_n=5):
+        print(f"정보: LocalQueryProcessor - 쿼리 {self.stats['queries']}개, 총 {self.stats['total_seconds']:.2f}초, "
+              f"오류 {self.stats['errors']}개, 느린 쿼리 {self.stats['slow_queries']}개")
+        for _, row in self.slowest_queries(top_n).iterrows():
+            query_preview = re.sub(r"\s+", " ", str(row['query']))[:150]
+            print(f"  #{row['query_no']} {row['seconds']:.3f}초 {row['rows']}행 [{row['status']}] {query_preview}")
+
+    def reset_query_log(self):
+        with self._lock:
+            self.query_log = []
+            self.stats = {'queries': 0, 'errors': 0, 'rows': 0, 'total_seconds': 0.0, 'slow_queries': 0}
+
+    def close(self):
+        self.con.close()
+
+
 def _get_offset_date_str(base_date_str, days_offset=0, months_offset=0, current_format_str="%Y%m%d",
                          output_format_str="%Y%m%d"):
     try:
@@ -240,20 +970,858 @@ def _get_historical_grouped_aggregates(q_processor, table, agg_column, agg_func,
         return {}
 
 
+def _build_historical_period_filter(date_col_in_db, date_col_format_in_db, is_partitioned_by_date_col, target_periods):
+    """여러 과거 기간(YYYYMM/YYYYMMDD)을 한 번에 조회할 (WHERE 조건, SELECT/GROUP BY용 기간 표현식)을 반환합니다."""
+    periods = sorted(set(str(p) for p in target_periods))
+    if not periods: raise ValueError("조회할 과거 기간이 없습니다.")
+    period_len = len(periods[0])
+    if not all(len(p) == period_len and p.isdigit() for p in periods):
+        raise ValueError(f"과거 기간 형식 불일치: {periods}")
+    in_list_str = ", ".join(f"'{p}'" for p in periods)
+    if date_col_format_in_db == "YYYYMM":
+        if period_len != 6: raise ValueError(f"date_col_format_in_db 'YYYYMM', 과거 기간({periods}) 형식 오류.")
+        period_expr = date_col_in_db
+    elif date_col_format_in_db == "YYYYMMDD":
+        if period_len == 8:
+            period_expr = date_col_in_db
+        elif period_len == 6:
+            period_expr = f"SUBSTRING(CAST({date_col_in_db} AS STRING), 1, 6)"
+            if is_partitioned_by_date_col:
+                start_day, end_day = get_month_start_end_dates(periods[0])[0], get_month_start_end_dates(periods[-1])[1]
+                where_clause = f"{date_col_in_db} BETWEEN '{start_day}' AND '{end_day}'"
+                if len(periods) > 1: where_clause += f" AND {period_expr} IN ({in_list_str})"
+                return where_clause, period_expr
+        else:
+            raise ValueError(f"date_col_format_in_db 'YYYYMMDD', 과거 기간({periods}) 형식 오류.")
+    else:
+        raise ValueError(f"지원하지 않는 date_column_format '{date_col_format_in_db}'.")
+    where_clause = f"{period_expr} = '{periods[0]}'" if len(periods) == 1 else f"{period_expr} IN ({in_list_str})"
+    return where_clause, period_expr
+
+
+def _historical_period_aggregate_maps(result_df, group_by_columns, value_column='agg_value'):
+    """'GROUP BY 기간(, 그룹)' 조회 결과(hist_period 컬럼 포함)를 {기간: {그룹키: 값}} 형태로 변환합니다."""
+    output_map = {}
+    if result_df is None or result_df.empty: return output_map
+    period_s = result_df['hist_period'].astype(str)
+    agg_values = pd.to_numeric(result_df[value_column], errors='coerce').fillna(0.0).astype(float)
+    if group_by_columns:
+        key_cols = [result_df[gc].astype(object).where(result_df[gc].notna(), '__NONE_GROUP_KEY__').astype(str)
+                    for gc in group_by_columns]
+        for period, key, value in zip(period_s, zip(*key_cols), agg_values):
+            output_map.setdefault(period, {})[key] = float(value)
+    else:
+        for period, value in zip(period_s, agg_values):
+            output_map.setdefault(period, {})['__overall__'] = float(value)
+    return output_map
+
+
+def _build_period_aggregate_query(request, target_periods):
+    """기간별 집계 조회 요청 dict(_describe_historical_aggregate_request 형식)로 'GROUP BY 기간, 그룹' 쿼리를 만듭니다."""
+    where_clause_for_date, period_expr = _build_historical_period_filter(request['date_col'], request['date_fmt'],
+                                                                        request['is_part'], target_periods)
+    agg_col_filter = f"AND {request['agg_column']} IS NOT NULL" if request['agg_column'] != '*' else ""
+    gb_select_str = "".join(f", {gc}" for gc in request['group_by_columns'])
+    return f"""SELECT {period_expr} AS hist_period{gb_select_str}, {request['agg_func']}({request['agg_column']}) AS agg_value FROM {request['table']} WHERE {where_clause_for_date} AND ({request['base_filter']}) {agg_col_filter} GROUP BY {period_expr}{gb_select_str}"""
+
+
+def _split_cached_periods(q_processor, request, target_periods):
+    """CachedQueryProcessor 캐시에서 기간별 결과를 찾아 ({기간: DataFrame}, 조회가 필요한 기간 목록)을 반환합니다."""
+    periods = sorted(set(str(p) for p in target_periods))
+    if not hasattr(q_processor, 'get_cached_frame'): return {}, periods
+    cached_frames, missing_periods = {}, []
+    for period in periods:
+        cached_df = q_processor.get_cached_frame(_build_period_aggregate_query(request, [period]), request['engine'])
+        if cached_df is None:
+            missing_periods.append(period)
+        else:
+            cached_frames[period] = cached_df
+    return cached_frames, missing_periods
+
+
+def _store_period_frames(q_processor, request, result_df, periods):
+    """여러 기간을 한 번에 조회한 결과를 기간별로 나누어 기간별 단일 쿼리 키로 캐시에 저장합니다 (데이터 없는 기간은 빈 결과로 저장)."""
+    if not hasattr(q_processor, 'store_frame'): return
+    if result_df is None or result_df.empty or 'hist_period' not in result_df.columns:
+        result_df = pd.DataFrame(columns=['hist_period', *request['group_by_columns'], 'agg_value'])
+    period_s = result_df['hist_period'].astype(str)
+    for period in periods:
+        q_processor.store_frame(_build_period_aggregate_query(request, [period]), request['engine'],
+                                result_df[period_s == period].reset_index(drop=True))
+
+
+def _fetch_bypassing_query_cache(q_processor, query, engine):
+    # 기간별로 나누어 캐시하는 조회는 여러 기간을 묶은 쿼리 자체를 다시 캐시하지 않음
+    if hasattr(q_processor, 'get_cached_frame'):
+        return q_processor.fetch_to_pandas(query=query, engine=engine, limit=None, use_cache=False)
+    return q_processor.fetch_to_pandas(query=query, engine=engine, limit=None)
+
+
+def _sql_base_filter_to_pandas(base_filter, columns):
+    """historical_base_filter를 같은 의미의 DataFrame.eval 조건식으로 옮깁니다 (NULL 처리가 달라질 수 있으면 None)."""
+    sql = (base_filter or '').strip()
+    if not sql or re.fullmatch(r'\(?\s*1\s*=\s*1\s*\)?', sql): return ''
+    if re.search(r"<>|!=|\b(NOT|IS|NULL|LIKE|RLIKE|BETWEEN|CASE)\b", sql, re.I): return None
+    expr = re.sub(r"(?<![<>=!])=(?!=)", "==", sql)
+    for keyword in ['AND', 'OR', 'IN']: expr = re.sub(rf"\b{keyword}\b", keyword.lower(), expr, flags=re.I)
+    try:
+        round_trip_sql = _pandas_expr_to_sql(expr, columns)
+    except ValueError:
+        return None
+    return expr if re.sub(r'\s+', '', round_trip_sql).upper() == re.sub(r'\s+', '', sql).upper() else None
+
+
+def _local_history_periods(local_df, request, target_periods):
+    """local_df에서 집계할 과거 기간 목록: 호출자가 전체 적재를 선언한 기간(attrs['complete_periods']) 중 데이터에 있는 기간."""
+    if local_df is None or local_df.empty: return []
+    periods = set(str(p) for p in target_periods) & set(str(p) for p in local_df.attrs.get('complete_periods') or [])
+    if not periods: return []
+    if str(local_df.attrs.get('name', '')).lower() != str(request['table']).lower(): return []
+    date_col, agg_column = request['date_col'], request['agg_column']
+    if any(col not in local_df.columns for col in [date_col, *request['group_by_columns']] + (
+            [agg_column] if agg_column != '*' else [])): return []
+    if any(len(p) != (6 if request['date_fmt'] == 'YYYYMM' else 8) for p in periods): return []  # 일별 컬럼의 월 집계는 DB
+    if _sql_base_filter_to_pandas(request['base_filter'], local_df.columns) is None: return []
+    return sorted(periods & set(pd.Index(pd.unique(local_df[date_col])).astype(str)))
+
+
+def _local_period_aggregate_frame(local_df, request, target_periods):
+    """local_df에 전체 적재된 과거 기간을 pandas로 집계해 (집계 DataFrame 또는 None, DB 조회가 필요한 기간 목록)을 반환합니다."""
+    periods = sorted(set(str(p) for p in target_periods))
+    local_periods = _local_history_periods(local_df, request, periods)
+    if not local_periods: return None, periods
+    date_col, agg_column, group_by_columns = request['date_col'], request['agg_column'], list(
+        request['group_by_columns'])
+    base_expr = _sql_base_filter_to_pandas(request['base_filter'], local_df.columns)
+    try:
+        date_codes, date_uniques = pd.factorize(local_df[date_col])
+        date_labels = pd.Index(date_uniques).astype(str)
+        positions = np.flatnonzero(np.isin(date_codes, np.flatnonzero(date_labels.isin(local_periods))))
+        rows = local_df.iloc[positions]
+        if base_expr:
+            base_mask = rows.eval(base_expr).to_numpy(dtype=bool)
+            rows, positions = rows[base_mask], positions[base_mask]
+        keys = [pd.Series(date_labels[date_codes[positions]], index=rows.index, name='hist_period')] + [
+            _group_key_series(rows[gc]) for gc in group_by_columns]
+        if agg_column == '*':
+            agg_values = rows.groupby(keys, sort=False, observed=True).size()
+        else:
+            not_null = rows[agg_column].notna().to_numpy()  # 개별 조회의 'agg_column IS NOT NULL' 조건
+            target = rows[agg_column][not_null] if request['agg_func'] == 'COUNT' else pd.to_numeric(
+                rows[agg_column][not_null], errors='coerce')
+            grouped = target.groupby([key[not_null] for key in keys], sort=False, observed=True)
+            agg_values = {'SUM': grouped.sum, 'AVG': grouped.mean, 'COUNT': grouped.count}[request['agg_func']]()
+        local_frame = agg_values.rename('agg_value').reset_index()
+    except Exception as e:
+        print(f"경고: 과거 집계 - 검증 DataFrame에서 집계하지 못해 DB에서 조회합니다 ({request['table']}): {e}")
+        return None, periods
+    return local_frame, [p for p in periods if p not in local_periods]
+
+
+def _get_historical_period_aggregates(q_processor, table, agg_column, agg_func, group_by_columns, date_col_in_db,
+                                      date_col_format_in_db, is_partitioned_by_date_col, target_periods, engine,
+                                      base_filter="1=1", raise_errors=False, local_df=None):
+    """여러 과거 기간의 (그룹별) 집계값을 'GROUP BY 기간, 그룹' 한 번으로 조회해 {기간: {그룹키: 값}}으로 반환합니다."""
+    if not q_processor: print("경고: QueryProcessor가 없어 과거 기간별 집계값을 조회할 수 없습니다."); return {}
+    group_by_columns = list(group_by_columns or [])
+    request = {'table': table, 'engine': engine, 'date_col': date_col_in_db, 'date_fmt': date_col_format_in_db,
+               'is_part': is_partitioned_by_date_col, 'base_filter': base_filter, 'agg_func': agg_func,
+               'agg_column': '*' if agg_func.upper() == 'COUNT' and agg_column in ['*', '1'] else agg_column,
+               'group_by_columns': tuple(group_by_columns)}
+    try:
+        _build_historical_period_filter(date_col_in_db, date_col_format_in_db, is_partitioned_by_date_col,
+                                        target_periods)
+    except ValueError as ve:
+        if raise_errors: raise
+        print(f"경고: 과거 기간별 집계 - 날짜 조건 생성 오류: {ve}");
+        return {}
+    try:
+        local_frame, db_periods = _local_period_aggregate_frame(local_df, request, target_periods)
+        cached_frames, missing_periods = _split_cached_periods(q_processor, request, db_periods)
+        period_frames = ([local_frame] if local_frame is not None else []) + list(cached_frames.values())
+        if missing_periods:
+            result_df = _fetch_bypassing_query_cache(q_processor, _build_period_aggregate_query(request, missing_periods),
+                                                     engine)
+            _store_period_frames(q_processor, request, result_df, missing_periods)
+            if result_df is not None and not result_df.empty: period_frames.append(result_df)
+        return _historical_period_aggregate_maps(pd.concat(period_frames, ignore_index=True) if period_frames else None,
+                                                 group_by_columns)
+    except Exception as e:
+        if raise_errors: raise
+        print(f"경고: 과거 기간별 집계값 조회 중 오류 ({table}, {agg_column}, 그룹: {group_by_columns}, 기간: {sorted(set(target_periods))}): {e}");
+        return {}
+
+
+def _period_aggregates_to_frame(period_maps, date_col, group_by_columns):
+    """{기간: {그룹키: 값}}을 [날짜 컬럼, 그룹 컬럼..., agg_value] DataFrame으로 펼칩니다 (consecutive_trend_check용)."""
+    rows = []
+    for period, group_map in period_maps.items():
+        for key, value in group_map.items():
+            row = {date_col: period}
+            if group_by_columns: row.update(zip(group_by_columns, key))
+            row['agg_value'] = value
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _get_trend_comparison_periods(current_period_value, comp_type, n_p):
+    """aggregate_value_trend의 comparison_periods 정의에 따라 조회할 과거 기간 문자열 목록을 반환합니다 (형식 오류 시 ValueError)."""
+    fmt_offset_in = "%Y%m%d" if len(current_period_value) == 8 else ("%Y%m" if len(current_period_value) == 6 else "")
+    if not fmt_offset_in or not isinstance(comp_type, str): raise ValueError("current_period_value/comparison_periods 형식 오류")
+    if comp_type in ["previous_n_months", "previous_n_days"]:
+        offset_kwargs = {'months_offset': -n_p} if 'months' in comp_type else {'days_offset': -n_p}
+        return [_get_offset_date_str(current_period_value, current_format_str=fmt_offset_in,
+                                     output_format_str='%Y%m' if 'months' in comp_type else '%Y%m%d', **offset_kwargs)]
+    if "average" in comp_type:
+        if "months" in comp_type:
+            return [_get_offset_date_str(current_period_value, months_offset=-i, current_format_str=fmt_offset_in,
+                                         output_format_str="%Y%m") for i in range(1, n_p + 1)]
+        if "days" in comp_type:
+            return [_get_offset_date_str(current_period_value, days_offset=-i, current_format_str="%Y%m%d",
+                                         output_format_str="%Y%m%d") for i in range(1, n_p + 1)]
+    raise ValueError(f"지원하지 않는 comparison_periods 타입: {comp_type}")
+
+
+def _get_consecutive_history_periods(latest_date, period_unit, lookback_periods):
+    """consecutive_trend_check의 과거 조회 구간(최신 기간 직전 lookback 개)을 기간 문자열 목록으로 반환합니다."""
+    if period_unit == 'months':
+        end_date = latest_date.replace(day=1) - relativedelta(months=1)
+        return [(end_date - relativedelta(months=i)).strftime('%Y%m') for i in range(lookback_periods - 1, -1, -1)]
+    end_date = latest_date - timedelta(days=1)
+    return [(end_date - timedelta(days=i)).strftime('%Y%m%d') for i in range(lookback_periods - 1, -1, -1)]
+
+
+def _describe_historical_aggregate_request(rule_type, params, df=None):
+    """과거 조회 플래너용으로 규칙의 기간별 과거 집계 조회를 dict로 기술합니다 (병합 대상이 아니면 None)."""
+    group_by_columns = params.get('group_by_columns')
+    if group_by_columns and not isinstance(group_by_columns, list): return None
+    if rule_type in ['aggregate_value_trend', 'total_row_count_trend']:
+        if rule_type == 'total_row_count_trend':
+            agg_col, agg_func = params.get('count_aggregate_column', '1'), 'COUNT'
+        else:
+            agg_col, agg_func = params.get('column_to_aggregate'), params.get('aggregate_function', 'SUM').upper()
+        date_col, date_fmt = params.get('date_column_for_period'), params.get('date_column_format', 'YYYYMM')
+        current_period_value = str(params.get('current_period_value', ''))
+        comp_def = params.get('comparison_periods', {})
+        if not all([agg_col, current_period_value, params.get('historical_data_table'), date_col, date_fmt]): return None
+        if not comp_def or 'type' not in comp_def or 'n' not in comp_def: return None
+        try:
+            periods = _get_trend_comparison_periods(current_period_value, comp_def.get('type'), comp_def.get('n', 1))
+        except (ValueError, TypeError):
+            return None
+        is_part = params.get('date_column_is_partition_key', False)
+    elif rule_type == 'consecutive_trend_check':
+        agg_col, agg_func = params.get('column_to_aggregate'), params.get('aggregate_function', 'SUM').upper()
+        date_col = params.get('date_column_for_trend')
+        date_fmt = params.get('date_column_format', 'YYYYMMDD').upper()
+        period_unit = params.get('period_unit', 'days').lower()
+        lookback = params.get('historical_lookback_periods', params.get('consecutive_periods', 7) + 5)
+        if not all([agg_col, date_col, params.get('historical_data_table')]) or df is None or date_col not in df.columns:
+            return None
+        if (period_unit, date_fmt) not in [('days', 'YYYYMMDD'), ('months', 'YYYYMM')]: return None
+        date_str_s = df[date_col].astype(str) + ('01' if date_fmt == 'YYYYMM' else '')
+        latest_date = pd.to_datetime(date_str_s, format='%Y%m%d', errors='coerce').max()
+        if pd.isna(latest_date): return None
+        periods = _get_consecutive_history_periods(latest_date, period_unit, lookback)
+        is_part = False
+    else:
+        return None
+    if agg_func not in ['SUM', 'AVG', 'COUNT'] or not periods: return None
+    return {'table': params.get('historical_data_table'), 'engine': params.get('db_engine', 'hive'),
+            'date_col': date_col, 'date_fmt': date_fmt, 'is_part': is_part,
+            'base_filter': params.get('historical_base_filter', '1=1') or '1=1', 'agg_func': agg_func,
+            'agg_column': '*' if agg_func == 'COUNT' and agg_col in ['*', '1'] else agg_col,
+            'group_by_columns': tuple(group_by_columns or []), 'periods': sorted(set(periods))}
+
+
+def _fetch_planned_historical_aggregates(q_processor, requests, use_grouping_sets=True, local_df=None):
+    """과거 집계 조회 요청들을 테이블/기간 단위별 넓은 쿼리로 병합 조회해 {요청ID: {기간: {그룹키: 값}}}을 반환합니다."""
+    planned_results, buckets, fetch_periods, cached_frames_by_req = {}, {}, {}, {}
+    for req_id, req in requests.items():
+        local_frame, db_periods = _local_period_aggregate_frame(local_df, req, req['periods'])
+        cached_frames, missing_periods = _split_cached_periods(q_processor, req, db_periods)
+        known_frames = ([local_frame] if local_frame is not None else []) + list(cached_frames.values())
+        if not missing_periods:
+            planned_results[req_id] = _historical_period_aggregate_maps(
+                pd.concat(known_frames, ignore_index=True) if known_frames else None, list(req['group_by_columns']))
+            continue
+        fetch_periods[req_id], cached_frames_by_req[req_id] = missing_periods, known_frames
+        period_len = len(missing_periods[0])
+        is_part = req['is_part'] if req['date_fmt'] == 'YYYYMMDD' and period_len == 6 else False
+        bucket_key = (req['table'], req['engine'], req['date_col'], req['date_fmt'], is_part, req['base_filter'],
+                      period_len)
+        buckets.setdefault(bucket_key, []).append(req_id)
+
+    query_count, merged_rule_count = 0, 0
+    for (table, engine, date_col, date_fmt, is_part, base_filter, _), req_ids in buckets.items():
+        if len(req_ids) < 2: continue
+        all_periods = sorted(set(p for r in req_ids for p in fetch_periods[r]))
+        try:
+            where_clause_for_date, period_expr = _build_historical_period_filter(date_col, date_fmt, is_part,
+                                                                                all_periods)
+        except ValueError as ve:
+            print(f"경고: 과거 조회 플래너 - 날짜 조건 생성 오류 ({table}): {ve}");
+            continue
+        agg_aliases, not_null_aliases, group_sets = {}, {}, []
+        for r in req_ids:
+            req = requests[r]
+            agg_aliases.setdefault((req['agg_func'], req['agg_column']), f"agg_value_{len(agg_aliases)}")
+            if req['agg_column'] != '*':
+                not_null_aliases.setdefault(req['agg_column'], f"not_null_count_{len(not_null_aliases)}")
+            if req['group_by_columns'] not in group_sets: group_sets.append(req['group_by_columns'])
+        # 개별 조회의 'IS NOT NULL' 조건은 넓은 쿼리에 넣을 수 없으므로, COUNT(컬럼)=0 인 (기간, 그룹)을 결과에서 제외해 동일하게 맞춤
+        agg_select_str = ", ".join([f"{func}({col}) AS {alias}" for (func, col), alias in agg_aliases.items()] +
+                                   [f"COUNT({col}) AS {alias}" for col, alias in not_null_aliases.items()])
+        from_where_str = f"FROM {table} WHERE {where_clause_for_date} AND ({base_filter})"
+        use_sets_query = use_grouping_sets and len(group_sets) > 1 and period_expr == date_col
+        if use_sets_query:
+            all_gb_cols = list(dict.fromkeys(gc for gs in group_sets for gc in gs))
+            grouping_select_str = "".join(f", GROUPING({gc}) AS grouping_{i}" for i, gc in enumerate(all_gb_cols))
+            sets_str = ", ".join("(" + ", ".join([period_expr, *gs]) + ")" for gs in group_sets)
+            gb_str = "".join(f", {gc}" for gc in all_gb_cols)
+            planned_queries = [(f"SELECT {period_expr} AS hist_period{gb_str}, {agg_select_str}{grouping_select_str} "
+                                f"{from_where_str} GROUP BY {period_expr}{gb_str} GROUPING SETS ({sets_str})",
+                                group_sets, all_gb_cols)]
+        else:
+            planned_queries = []
+            for gs in group_sets:
+                gb_str = "".join(f", {gc}" for gc in gs)
+                planned_queries.append((f"SELECT {period_expr} AS hist_period{gb_str}, {agg_select_str} "
+                                        f"{from_where_str} GROUP BY {period_expr}{gb_str}", [gs], list(gs)))
+        bucket_results = {}
+        try:
+            for query, query_group_sets, query_gb_cols in planned_queries:
+                result_df = _fetch_bypassing_query_cache(q_processor, query, engine)
+                query_count += 1
+                if result_df is None: result_df = pd.DataFrame()
+                for r in req_ids:
+                    req = requests[r]
+                    if req['group_by_columns'] not in query_group_sets: continue
+                    req_frames = list(cached_frames_by_req[r])
+                    if not result_df.empty:
+                        slice_mask = result_df['hist_period'].astype(str).isin(fetch_periods[r])
+                        if use_sets_query:
+                            for i, gc in enumerate(query_gb_cols):
+                                grouping_flag = pd.to_numeric(result_df[f"grouping_{i}"], errors='coerce')
+                                slice_mask &= grouping_flag == (0 if gc in req['group_by_columns'] else 1)
+                        if req['agg_column'] != '*':
+                            slice_mask &= pd.to_numeric(result_df[not_null_aliases[req['agg_column']]],
+                                                        errors='coerce').fillna(0) > 0
+                        req_slice = result_df[slice_mask]
+                        # 개별 조회와 같은 모양(hist_period, 그룹 컬럼, agg_value)으로 맞춰 기간별 캐시 저장에도 사용
+                        req_frame = req_slice[['hist_period', *req['group_by_columns']]].assign(
+                            agg_value=req_slice[agg_aliases[(req['agg_func'], req['agg_column'])]])
+                        _store_period_frames(q_processor, req, req_frame, fetch_periods[r])
+                        req_frames.append(req_frame)
+                    bucket_results[r] = _historical_period_aggregate_maps(
+                        pd.concat(req_frames, ignore_index=True) if req_frames else None,
+                        list(req['group_by_columns']))
+        except Exception as e:
+            print(f"경고: 과거 조회 플래너 - 병합 조회 실패 ({table}): {e}. 규칙별 개별 조회로 대체합니다.");
+            continue
+        planned_results.update(bucket_results)
+        merged_rule_count += len(req_ids)
+    if merged_rule_count:
+        print(f"정보: 과거 조회 플래너 - 규칙 {merged_rule_count}개의 과거 집계 조회를 쿼리 {query_count}개로 병합했습니다.")
+    return planned_results
+
+
+PROFILE_KNOT_COUNT = 4  # 파티션별 분위수 knot 개수 (기본 사분위수, 규칙 params의 profile_knot_count로 변경)
+
+
+class QuantileSketch:
+    """병합 가능한 KLL 분위수 스케치 (NumPy 배열 기반, to_dict/from_dict로 JSON 저장)."""
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.levels = [np.empty(0, dtype=float)]
+        self.count = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** (len(self.levels) - level - 1))))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if self.levels[level].size <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels): self.levels.append(np.empty(0, dtype=float))
+            items = np.sort(self.levels[level])
+            leftover, items = (items[-1:], items[:-1]) if items.size % 2 else (items[:0], items)
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[int(self._rng.integers(2))::2]])
+            self.levels[level] = leftover
+            level = 0  # 레벨이 늘면 하위 레벨 용량도 바뀌므로 처음부터 다시 확인
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += int(values.size)
+            self.min, self.max = min(self.min, float(values.min())), max(self.max, float(values.max()))
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        if other.count == 0: return self
+        while len(self.levels) < len(other.levels): self.levels.append(np.empty(0, dtype=float))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        if self.count == 0: return [float('nan') for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(items.size, 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, cum_weights = values[order], np.cumsum(weights[order])
+        result = []
+        for q in qs:
+            if q <= 0: result.append(self.min); continue
+            if q >= 1: result.append(self.max); continue
+            pos = min(int(np.searchsorted(cum_weights, q * cum_weights[-1], side='left')), values.size - 1)
+            result.append(float(values[pos]))
+        return result
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def to_dict(self):
+        return {'k': self.k, 'count': self.count, 'min': self.min, 'max': self.max,
+                'levels': [base64.b64encode(items.astype('<f8').tobytes()).decode('ascii') for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data.get('k', 200))
+        sketch.levels = [np.frombuffer(base64.b64decode(items), dtype='<f8').copy() for items in data['levels']] or [
+            np.empty(0, dtype=float)]
+        sketch.count, sketch.min, sketch.max = int(data['count']), float(data['min']), float(data['max'])
+        return sketch
+
+
+class ProfileStore:
+    """과거 파티션별 프로파일(numeric 충분통계/코드 빈도)을 store_dir의 JSON 파일로 보관합니다."""
+
+    def __init__(self, store_dir=PROFILE_STORE_DIR, immutable_partition_before=None):
+        self.store_dir = store_dir
+        # 이 값(YYYYMMDD/YYYYMM) 이후 파티션은 적재 중일 수 있어 저장하지 않음 (None이면 오늘 날짜)
+        self.immutable_partition_before = str(immutable_partition_before) if immutable_partition_before else None
+        self._lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _path(self, profile_key):
+        key_str = json.dumps(profile_key, sort_keys=True, ensure_ascii=False)
+        return os.path.join(self.store_dir, hashlib.sha1(key_str.encode('utf-8')).hexdigest() + '.json')
+
+    def load_partitions(self, profile_key):
+        path = self._path(profile_key)
+        with self._lock:
+            if not os.path.exists(path): return {}
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('partitions', {})
+
+    def save_partitions(self, profile_key, partition_profiles):
+        if not partition_profiles: return
+        path = self._path(profile_key)
+        with self._lock:
+            stored = {}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f).get('partitions', {})
+            stored.update(partition_profiles)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'profile_key': profile_key, 'partitions': stored}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+def _enumerate_partitions(start_value, end_value):
+    """YYYYMMDD 또는 YYYYMM 시작/끝(포함) 사이의 파티션 값 목록."""
+    start_value, end_value = str(start_value), str(end_value)
+    if len(start_value) != len(end_value) or len(start_value) not in (6, 8):
+        raise ValueError(f"파티션 범위 형식 오류: {start_value} ~ {end_value}")
+    if len(start_value) == 8:
+        dates = pd.date_range(datetime.strptime(start_value, '%Y%m%d'), datetime.strptime(end_value, '%Y%m%d'), freq='D')
+        return [d.strftime('%Y%m%d') for d in dates]
+    months = pd.date_range(datetime.strptime(start_value, '%Y%m'), datetime.strptime(end_value, '%Y%m'), freq='MS')
+    return [d.strftime('%Y%m') for d in months]
+
+
+def _is_partition_before(partition_value, cutoff):
+    """partition_value(YYYYMMDD/YYYYMM)가 cutoff가 속한 파티션보다 앞서면 True."""
+    partition_value = str(partition_value)
+    return partition_value < str(cutoff)[:len(partition_value)]
+
+
+def _group_key_from_row_values(values):
+    return tuple(str(v) if pd.notna(v) else '__NONE_GROUP_KEY__' for v in values)
+
+
+def _group_key_series(series):
+    """그룹 컬럼을 fillna('__NONE_GROUP_KEY__').astype(str)와 같은 그룹 키 시리즈로 만듭니다 (범주형은 범주만 변환)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        str_categories = [str(c) for c in series.cat.categories]
+        if len(set(str_categories)) == len(str_categories) and '__NONE_GROUP_KEY__' not in str_categories:
+            keyed = series.cat.rename_categories(str_categories)
+            if keyed.isna().any():
+                keyed = keyed.cat.add_categories(['__NONE_GROUP_KEY__']).fillna('__NONE_GROUP_KEY__')
+            return keyed.cat.reorder_categories(sorted(keyed.cat.categories))
+    return series.fillna('__NONE_GROUP_KEY__').astype(str)
+
+
+def _profile_numeric_partitions(q_processor, table, column, partition_column, partitions, group_by_columns,
+                                base_filter, engine, knot_count=PROFILE_KNOT_COUNT):
+    """파티션(, 그룹)별 numeric 충분통계를 한 번의 'GROUP BY 파티션' 쿼리로 계산합니다. {파티션: [[그룹키 리스트, 통계], ...]}"""
+    gb_select_str = "".join(f", {gc}" for gc in group_by_columns)
+    knot_select_str = "".join(f", PERCENTILE_APPROX({column}, {i / knot_count}) AS knot_{i}"
+                              for i in range(1, knot_count))
+    in_list_str = ", ".join(f"'{p}'" for p in partitions)
+    query = f"""SELECT {partition_column} AS hist_partition{gb_select_str}, COUNT({column}) AS count_val, SUM({column}) AS sum_val, VAR_SAMP({column}) AS var_val, MIN({column}) AS min_val, MAX({column}) AS max_val{knot_select_str} FROM {table} WHERE {partition_column} IN ({in_list_str}) AND ({base_filter}) AND {column} IS NOT NULL GROUP BY {partition_column}{gb_select_str}"""
+    result_df = q_processor.fetch_to_pandas(query=query, engine=engine, limit=None)
+    partition_profiles = {str(p): [] for p in partitions}  # 행이 없는 파티션도 빈 프로파일로 기록
+    if result_df is None or result_df.empty: return partition_profiles
+    for row in result_df.to_dict('records'):
+        count_val = int(row['count_val']) if pd.notna(row['count_val']) else 0
+        if count_val == 0: continue
+        var_val = float(row['var_val']) if pd.notna(row['var_val']) else 0.0
+        knots = [float(row['min_val'])] + [float(row[f"knot_{i}"]) for i in range(1, knot_count)] + [
+            float(row['max_val'])]
+        stats = {'count': count_val, 'sum': float(row['sum_val']), 'm2': var_val * (count_val - 1),
+                 'min': float(row['min_val']), 'max': float(row['max_val']), 'knots': knots}
+        group_key = list(_group_key_from_row_values([row[gc] for gc in group_by_columns]))
+        partition_profiles.setdefault(str(row['hist_partition']), []).append([group_key, stats])
+    return partition_profiles
+
+
+def _merge_numeric_profiles(partials):
+    """파티션별 numeric 통계 목록을 병합해 check_numeric_volatility 프로파일(mean/std/min/max/median/q1/q3/count)로 만듭니다."""
+    partials = [p for p in partials if p.get('count', 0) > 0]
+    if not partials: return None
+    counts = np.array([p['count'] for p in partials], dtype=float)
+    sums = np.array([p['sum'] for p in partials], dtype=float)
+    total_count = counts.sum()
+    mean_val = sums.sum() / total_count
+    # 병렬 분산 병합 (Chan et al.): 파티션 내 편차 제곱합 + 파티션 평균 간 편차
+    m2_val = sum(p['m2'] for p in partials) + float((counts * (sums / counts - mean_val) ** 2).sum())
+    if all('sketch' in p for p in partials):
+        merged_sketch = QuantileSketch.from_dict(partials[0]['sketch'])
+        for p in partials[1:]: merged_sketch.merge(QuantileSketch.from_dict(p['sketch']))
+        q1_val, median_val, q3_val = merged_sketch.quantiles([0.25, 0.5, 0.75])
+    else:
+        # 파티션별 knot(등분위 지점 값)을 CDF로 보고 count 가중 평균한 뒤 역보간 (스케치는 같은 개수의 knot으로 변환)
+        sketch_knot_count = max([len(p['knots']) - 1 for p in partials if 'knots' in p] or [PROFILE_KNOT_COUNT])
+        partial_knots = [np.maximum.accumulate(np.asarray(
+            p['knots'] if 'knots' in p else QuantileSketch.from_dict(p['sketch']).quantiles(
+                np.linspace(0.0, 1.0, sketch_knot_count + 1)), dtype=float)) for p in partials]
+        knot_grid = np.unique(np.concatenate(partial_knots))
+        merged_cdf = np.zeros(knot_grid.size)
+        for c, knots in zip(counts, partial_knots):
+            # 같은 값이 반복되는 knot은 마지막 지점의 확률만 남겨 x가 엄격히 증가하도록 맞춤
+            unique_knots, last_from_end = np.unique(knots[::-1], return_index=True)
+            knot_probs = np.linspace(0.0, 1.0, knots.size)[knots.size - 1 - last_from_end]
+            merged_cdf += c * np.interp(knot_grid, unique_knots, knot_probs, left=0.0, right=1.0)
+        # CDF가 평평한 구간은 처음 지점만 남겨 역보간
+        merged_cdf, first_idx = np.unique(np.maximum.accumulate(merged_cdf / total_count), return_index=True)
+        q1_val, median_val, q3_val = (float(np.interp(q, merged_cdf, knot_grid[first_idx])) for q in (0.25, 0.5, 0.75))
+    return {'mean': float(mean_val), 'std': float(np.sqrt(m2_val / (total_count - 1))) if total_count > 1 else 0.0,
+            'min': float(min(p['min'] for p in partials)), 'max': float(max(p['max'] for p in partials)),
+            'median': median_val, 'q1': q1_val, 'q3': q3_val, 'count': int(total_count)}
+
+
+def _profile_frequency_partitions(q_processor, table, column, partition_column, partitions, base_filter, engine):
+    """파티션별 코드 빈도(NULL 포함)를 한 번의 'GROUP BY 파티션, 코드' 쿼리로 계산합니다."""
+    in_list_str = ", ".join(f"'{p}'" for p in partitions)
+    query = f"SELECT {partition_column} AS hist_partition, CAST({column} AS STRING) AS code, COUNT(*) AS frequency FROM {table} WHERE {partition_column} IN ({in_list_str}) AND ({base_filter}) GROUP BY {partition_column}, CAST({column} AS STRING)"
+    result_df = q_processor.fetch_to_pandas(query=query, engine=engine, limit=None)
+    partition_profiles = {str(p): {'count': 0, 'null_count': 0, 'frequencies': {}} for p in partitions}
+    if result_df is None or result_df.empty: return partition_profiles
+    for row in result_df.to_dict('records'):
+        profile = partition_profiles.setdefault(str(row['hist_partition']),
+                                                {'count': 0, 'null_count': 0, 'frequencies': {}})
+        frequency = int(row['frequency'])
+        profile['count'] += frequency
+        if pd.isna(row['code']):
+            profile['null_count'] += frequency
+        else:
+            profile['frequencies'][str(row['code'])] = profile['frequencies'].get(str(row['code']), 0) + frequency
+    return partition_profiles
+
+
+def _merge_frequency_profiles(partials):
+    """파티션별 빈도 프로파일을 병합해 check_distribution_change의 과거 프로파일 형식으로 만듭니다."""
+    total_count = sum(p['count'] for p in partials)
+    if total_count == 0:
+        return {'unique_codes': [], 'frequencies': {}, 'total_unique_count': 0, 'count': 0, 'null_count': 0}
+    null_count = sum(p['null_count'] for p in partials)
+    code_counts = {}
+    for p in partials:
+        for code, cnt in p['frequencies'].items(): code_counts[code] = code_counts.get(code, 0) + cnt
+    frequencies = {code: cnt / total_count for code, cnt in code_counts.items()}
+    frequencies[str(np.nan)] = null_count / total_count
+    return {'unique_codes': list(code_counts) + ([str(np.nan)] if null_count > 0 else []), 'frequencies': frequencies,
+            'total_unique_count': len(code_counts) + (1 if null_count > 0 else 0), 'count': total_count,
+            'null_count': null_count}
+
+
+def profile_numeric_series(series, k=200):
+    """숫자 Series를 한 번 훑어 병합 가능한 프로파일(count, sum, m2, min, max, KLL 스케치)로 만듭니다."""
+    values = pd.to_numeric(series, errors='coerce').dropna().to_numpy(dtype=float)
+    if values.size == 0: return None
+    mean_val = values.mean()
+    return {'count': int(values.size), 'sum': float(values.sum()), 'm2': float(((values - mean_val) ** 2).sum()),
+            'min': float(values.min()), 'max': float(values.max()),
+            'sketch': QuantileSketch(k=k).update(values).to_dict()}
+
+
+def profile_numeric_frame(df, column, group_by_columns=None, k=200):
+    """df[column]을 group_by_columns별로 프로파일링해 [[그룹키 리스트, 프로파일], ...]로 반환합니다 (그룹 없으면 키는 [])."""
+    if not group_by_columns:
+        profile = profile_numeric_series(df[column], k=k)
+        return [[[], profile]] if profile else []
+    numeric_s = pd.to_numeric(df[column], errors='coerce')
+    valid_mask = numeric_s.notna()
+    key_series = [_group_key_series(df[gc])[valid_mask] for gc in group_by_columns]
+    group_profiles = []
+    for group_key, group_values in numeric_s[valid_mask].groupby(key_series, sort=True):
+        profile = profile_numeric_series(group_values, k=k)
+        if profile: group_profiles.append([list(group_key if isinstance(group_key, tuple) else (group_key,)), profile])
+    return group_profiles
+
+
+def update_numeric_profile_file(profile_path, df, column, partition_value, group_by_columns=None, k=200,
+                                keep_partitions=None):
+    """df[column]의 (그룹별) 스케치 프로파일을 프로파일 JSON 파일의 partition_value 항목으로 저장합니다."""
+    group_by_columns = list(group_by_columns or [])
+    profile_data = {'profile_type': 'numeric_sketch', 'column': column, 'group_by_columns': group_by_columns,
+                    'partitions': {}}
+    if os.path.exists(profile_path):
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            profile_data = json.load(f)
+        if profile_data.get('profile_type') != 'numeric_sketch' or profile_data.get('group_by_columns',
+                                                                                    []) != group_by_columns:
+            raise ValueError(f"프로파일 파일 형식/그룹 기준 불일치: {profile_path}")
+    profile_data['partitions'][str(partition_value)] = profile_numeric_frame(df, column, group_by_columns, k=k)
+    if keep_partitions:
+        for old_partition in sorted(profile_data['partitions'])[:-keep_partitions]:
+            del profile_data['partitions'][old_partition]
+    profile_dir = os.path.dirname(profile_path)
+    if profile_dir: os.makedirs(profile_dir, exist_ok=True)
+    with open(profile_path, 'w', encoding='utf-8') as f:
+        json.dump(profile_data, f, ensure_ascii=False)
+    return profile_data
+
+
+def _numeric_profile_map_from_sketch_file(profile_data, group_by_columns, params):
+    """스케치 프로파일 파일 내용에서 (historical_partition_start/end 범위의) 파티션을 병합해 {그룹키: 프로파일}을 만듭니다."""
+    if list(profile_data.get('group_by_columns', [])) != list(group_by_columns or []):
+        raise ValueError(f"프로파일 파일 그룹 기준({profile_data.get('group_by_columns')})과 규칙 그룹 기준({group_by_columns}) 불일치")
+    partitions = profile_data.get('partitions', {})
+    if params.get('historical_partition_start'):
+        window = _enumerate_partitions(params['historical_partition_start'],
+                                       params.get('historical_partition_end', params['historical_partition_start']))
+        partitions = {p: partitions[p] for p in window if p in partitions}
+    group_partials = {}
+    for partition_profile in partitions.values():
+        for group_key, stats in partition_profile: group_partials.setdefault(tuple(group_key), []).append(stats)
+    profile_map = {}
+    for group_key, partials in group_partials.items():
+        merged_profile = _merge_numeric_profiles(partials)
+        if merged_profile: profile_map[group_key if group_by_columns else '__overall__'] = merged_profile
+    return profile_map
+
+
+def _get_store_window_partition_profiles(params, kind, q_processor, group_by_columns=None):
+    """historical_partition_* 윈도우의 파티션 프로파일 목록을 반환합니다 (없는 파티션만 조회, 저장소 모드가 아니면 None)."""
+    profile_store = params.get('_profile_store') or (
+        ProfileStore(params['profile_store_dir']) if params.get('profile_store_dir') else None)
+    partition_column = params.get('historical_partition_column')
+    if profile_store is None or not partition_column or not params.get('historical_partition_start'): return None
+    table, column = params['historical_data_table'], params['historical_data_column']
+    base_filter = params.get('historical_base_filter', '1=1') or '1=1'
+    engine = params.get('db_engine', 'hive')
+    partitions = _enumerate_partitions(params['historical_partition_start'],
+                                       params.get('historical_partition_end', params['historical_partition_start']))
+    knot_count = int(params.get('profile_knot_count', PROFILE_KNOT_COUNT))
+    immutable_before = str(params.get('historical_partition_immutable_before') or profile_store.immutable_partition_before
+                           or datetime.now().strftime('%Y%m%d'))
+    profile_key = {'kind': kind, 'table': table, 'column': column, 'partition_column': partition_column,
+                   'group_by_columns': list(group_by_columns or []), 'base_filter': base_filter, 'engine': engine}
+    if kind == 'numeric': profile_key['knot_count'] = knot_count
+    stored = profile_store.load_partitions(profile_key)
+    missing_partitions = [p for p in partitions if p not in stored]
+    if missing_partitions:
+        if not q_processor: raise ValueError("저장소에 없는 파티션을 프로파일링할 QueryProcessor가 없습니다.")
+        if kind == 'numeric':
+            new_profiles = _profile_numeric_partitions(q_processor, table, column, partition_column, missing_partitions,
+                                                       list(group_by_columns or []), base_filter, engine,
+                                                       knot_count)
+        else:
+            new_profiles = _profile_frequency_partitions(q_processor, table, column, partition_column,
+                                                         missing_partitions, base_filter, engine)
+        profile_store.save_partitions(profile_key, {p: profile for p, profile in new_profiles.items()
+                                                    if _is_partition_before(p, immutable_before)})
+        stored.update(new_profiles)
+        print(f"정보: 프로파일 저장소 - '{column}' 신규 파티션 {len(new_profiles)}개 프로파일링, "
+              f"저장된 파티션 {len(partitions) - len(missing_partitions)}개 재사용.")
+    return [stored[p] for p in partitions if p in stored]
+
+
 # --- 1. 개별 검증 로직을 담당하는 함수들 ---
-def check_not_null(series, column_name, params=None, disable_tqdm=True):
-    errors = [];
+# ----- asyncio용 과거 이력 조회 (AsyncQueryProcessor 사용, 각 조회는 조회 슬롯을 잡고 스레드 풀에서 실행) -----
+async def async_get_historical_aggregate_value(async_q_processor, table, agg_column, agg_func, date_col_in_db,
+                                               date_col_format_in_db, is_partitioned_by_date_col,
+                                               target_historical_period, engine, base_filter="1=1"):
+    return await async_q_processor.run_blocking(engine, _get_historical_aggregate_value, table, agg_column, agg_func,
+                                                date_col_in_db, date_col_format_in_db, is_partitioned_by_date_col,
+                                                target_historical_period, engine, base_filter)
+
+
+async def async_get_historical_grouped_aggregates(async_q_processor, table, agg_column, agg_func, group_by_columns,
+                                                  date_col_in_db, date_col_format_in_db, is_partitioned_by_date_col,
+                                                  target_historical_period, engine, base_filter="1=1"):
+    return await async_q_processor.run_blocking(engine, _get_historical_grouped_aggregates, table, agg_column,
+                                                agg_func, group_by_columns, date_col_in_db, date_col_format_in_db,
+                                                is_partitioned_by_date_col, target_historical_period, engine,
+                                                base_filter)
+
+
+async def async_get_historical_period_aggregates(async_q_processor, table, agg_column, agg_func, group_by_columns,
+                                                 date_col_in_db, date_col_format_in_db, is_partitioned_by_date_col,
+                                                 target_periods, engine, base_filter="1=1", raise_errors=False,
+                                                 local_df=None):
+    return await async_q_processor.run_blocking(engine, _get_historical_period_aggregates, table, agg_column,
+                                                agg_func, group_by_columns, date_col_in_db, date_col_format_in_db,
+                                                is_partitioned_by_date_col, target_periods, engine,
+                                                base_filter=base_filter, raise_errors=raise_errors, local_df=local_df)
+
+
+async def async_profile_numeric_partitions(async_q_processor, table, column, partition_column, partitions,
+                                           group_by_columns, base_filter, engine):
+    return await async_q_processor.run_blocking(engine, _profile_numeric_partitions, table, column, partition_column,
+                                                partitions, group_by_columns, base_filter, engine)
+
+
+async def async_profile_frequency_partitions(async_q_processor, table, column, partition_column, partitions,
+                                             base_filter, engine):
+    return await async_q_processor.run_blocking(engine, _profile_frequency_partitions, table, column,
+                                                partition_column, partitions, base_filter, engine)
+
+
+async def async_fetch_planned_historical_aggregates(async_q_processor, requests, use_grouping_sets=True,
+                                                    local_df=None):
+    """_fetch_planned_historical_aggregates의 asyncio 버전 (병합 단위별 조회를 동시에 실행)."""
+    request_groups = {}
+    for req_id, req in requests.items():
+        request_groups.setdefault((req['table'], req['engine'], req['date_col'], req['date_fmt'], req['base_filter']),
+                                  {})[req_id] = req
+    group_results = await asyncio.gather(*(
+        async_q_processor.run_blocking(group_key[1], _fetch_planned_historical_aggregates, group_requests,
+                                       use_grouping_sets, local_df)
+        for group_key, group_requests in request_groups.items()))
+    planned_results = {}
+    for result in group_results: planned_results.update(result)
+    return planned_results
+
+
+def run_async_lookups(coro):
+    """동기 코드에서 비동기 조회 코루틴을 실행합니다. 이미 이벤트 루프가 도는 환경(Jupyter 등)에서는 별도 스레드에서 실행합니다."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class ColumnarErrors:
+    """행 단위 검증 오류를 컬럼형(행 인덱스/값/오류 유형 코드 배열)으로 보관하고 dict는 iter_dicts() 시점에 만듭니다."""
+
+    def __init__(self, column_name, row_index, error_codes, error_types, message_specs, values=None,
+                 native_values=True):
+        self.column_name = column_name
+        self.row_index = row_index  # 실패 행 인덱스 (Index 또는 ndarray)
+        self.error_codes = np.asarray(error_codes, dtype=np.int8)  # error_types 위치 코드
+        self.error_types = tuple(error_types)
+        self.message_specs = tuple(message_specs)  # 오류 유형별 (메시지 템플릿, 고정 포맷 인자, value 전달 여부)
+        self.values = values  # None이면 오류 dict에 'value' 키를 넣지 않음
+        self.native_values = native_values  # True면 Series.items()처럼 파이썬 기본형으로 변환
+
+    def __len__(self):
+        return len(self.error_codes)
+
+    def _render_message(self, code, value):
+        template, fmt_kwargs, pass_value = self.message_specs[code]
+        return template.format(value=value, **fmt_kwargs) if pass_value else template.format(**fmt_kwargs)
+
+    def iter_dicts(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop: return
+        idx_list = self.row_index[start:stop].tolist()
+        codes = self.error_codes[start:stop].tolist()
+        if self.values is None:
+            for idx, code in zip(idx_list, codes):
+                yield {'column': self.column_name, 'row_index': idx, 'error_type': self.error_types[code],
+                       'message': self._render_message(code, None)}
+            return
+        vals = self.values[start:stop]
+        vals = vals.tolist() if self.native_values else list(vals)
+        for idx, code, val in zip(idx_list, codes, vals):
+            yield {'column': self.column_name, 'row_index': idx, 'value': val, 'error_type': self.error_types[code],
+                   'message': self._render_message(code, val)}
+
+    def to_dicts(self):
+        return list(self.iter_dicts())
+
+
+def _columnar_errors_from_masks(series, column_name, mask_specs, include_values=True, native_values=True):
+    """mask_specs [(error_type, 실패 마스크, 메시지 템플릿, 포맷 인자, value 전달 여부), ...]를 ColumnarErrors로 합칩니다."""
+    codes = np.full(len(series), -1, dtype=np.int8)
+    for code, (_, mask, _, _, _) in reversed(list(enumerate(mask_specs))):
+        codes[np.asarray(mask, dtype=bool)] = code
+    failed = codes >= 0
+    values = None
+    if include_values:
+        values = series.to_numpy(dtype=object)[failed] if native_values else series.to_numpy()[failed]
+    return ColumnarErrors(column_name, series.index[failed], codes[failed], [spec[0] for spec in mask_specs],
+                          [(spec[2], spec[3], spec[4]) for spec in mask_specs], values=values,
+                          native_values=native_values)
+
+
+def _regex_match_mask(values, pattern, full_match=False):
+    """NULL을 뺀 값들의 re.match(full_match면 re.fullmatch) 결과를 bool 배열로 반환합니다 (고유값만 매칭)."""
+    compiled = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+    codes, uniques = pd.factorize(values)
+    unique_matched = _regex_unique_matches(uniques, compiled, full_match)
+    return unique_matched[codes] & (codes >= 0) if len(unique_matched) else np.zeros(len(codes), dtype=bool)
+
+
+def _regex_unique_matches(uniques, compiled, full_match=False):
+    """factorize 고유값 배열에 대한 정규식 일치 여부 (bool 배열, 문자열이 아닌 값은 불일치)."""
+    # Arrow 문자열도 파이썬 re로 매칭 (Arrow의 RE2는 $, \d, \w 동작이 re와 달라 결과가 바뀜)
+    matcher = compiled.fullmatch if full_match else compiled.match
+    return np.fromiter((isinstance(v, str) and matcher(v) is not None for v in np.asarray(uniques, dtype=object)),
+                       dtype=bool, count=len(uniques))
+
+
+def check_not_null(series, column_name, params=None, disable_tqdm=True, return_columnar=False):
     params = params or {};
     msg_template = params.get('message', "컬럼 '{column_name}'은(는) 필수 값입니다.")
     if series is None: return [
         {'column': column_name, 'error_type': 'SERIES_IS_NONE', 'message': f"컬럼 '{column_name}'의 시리즈(데이터)가 None입니다."}]
-    for idx in series[series.isnull()].index: errors.append(
-        {'column': column_name, 'row_index': idx, 'error_type': 'NOT_NULL',
-         'message': msg_template.format(column_name=column_name)})
-    return errors
+    result = _columnar_errors_from_masks(series, column_name, [
+        ('NOT_NULL', series.isnull().to_numpy(), msg_template, {'column_name': column_name}, False)],
+                                         include_values=False)
+    return result if return_columnar else result.to_dicts()
 
 
-def check_regex_pattern(series, column_name, params, disable_tqdm=True):
+def check_regex_pattern(series, column_name, params, disable_tqdm=True, return_columnar=False):
     errors = [];
     pattern = params.get('pattern')
     if series is None: return [
@@ -261,16 +1829,30 @@ def check_regex_pattern(series, column_name, params, disable_tqdm=True):
     if not pattern: errors.append(
         {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': "정규식 패턴 필요"}); return errors
     msg_template = params.get('message', "컬럼 '{column_name}'의 값 '{value}'이(가) 패턴 '{pattern}'과(와) 불일치.")
-    items_to_iterate = series.dropna()
-    for idx, val in tqdm(items_to_iterate.items(), total=len(items_to_iterate), desc=f"REGEX '{column_name}'",
-                         disable=disable_tqdm, leave=False, unit="행"):
-        if not isinstance(val, str) or not re.match(pattern, val): errors.append(
-            {'column': column_name, 'row_index': idx, 'value': val, 'error_type': 'REGEX_MISMATCH',
-             'message': msg_template.format(column_name=column_name, value=val, pattern=pattern)})
-    return errors
+    # DataValidator가 실행 단위로 컴파일해 둔 정규식 (없으면 여기서 컴파일)
+    compiled_pattern = params.get('_compiled_pattern')
+    if compiled_pattern is None:
+        try:
+            compiled_pattern = re.compile(pattern)
+        except re.error as e:
+            return [{'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': f"정규식 패턴 오류: {e}"}]
+    factorized = params.get('_factorized_column')  # DataValidator 실행 단위 factorize 결과 (같은 행 순서)
+    if factorized is not None:
+        # 고유값만 매칭해 행 단위로 펼침 (NULL 행은 불일치에서 제외되므로 dropna 없이 전체 시리즈 사용)
+        items_to_check = series
+        mismatch_mask = factorized.expand(~_regex_unique_matches(factorized.uniques, compiled_pattern,
+                                                                 params.get('full_match', False)))
+    else:
+        items_to_check = series.dropna()
+        mismatch_mask = ~_regex_match_mask(items_to_check, compiled_pattern, params.get('full_match', False))
+    result = _columnar_errors_from_masks(items_to_check, column_name, [
+        ('REGEX_MISMATCH', mismatch_mask,
+         msg_template,
+         {'column_name': column_name, 'pattern': pattern}, True)])
+    return result if return_columnar else result.to_dicts()
 
 
-def check_allowed_values(series, column_name, params, disable_tqdm=True):
+def check_allowed_values(series, column_name, params, disable_tqdm=True, return_columnar=False):
     errors = [];
     allowed = set(params.get('values', []))
     if series is None: return [
@@ -278,45 +1860,63 @@ def check_allowed_values(series, column_name, params, disable_tqdm=True):
     if not allowed: errors.append(
         {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': "허용 값 목록 필요"}); return errors
     msg_template = params.get('message', "컬럼 '{column_name}'의 값 '{value}'은(는) 허용 목록 {allowed_values}에 없음.")
-    items_to_iterate = series.dropna()
-    for idx, val in tqdm(items_to_iterate.items(), total=len(items_to_iterate), desc=f"ALLOWED '{column_name}'",
-                         disable=disable_tqdm, leave=False, unit="행"):
-        if val not in allowed: errors.append(
-            {'column': column_name, 'row_index': idx, 'value': val, 'error_type': 'INVALID_VALUE',
-             'message': msg_template.format(column_name=column_name, value=val, allowed_values=list(allowed))})
-    return errors
+    factorized = params.get('_factorized_column')  # DataValidator 실행 단위 factorize 결과 (같은 행 순서)
+    if factorized is not None:
+        items_to_check = series
+        invalid_mask = factorized.expand(~factorized.uniques.isin(list(allowed)))
+    else:
+        items_to_check = series.dropna()
+        invalid_mask = ~items_to_check.isin(allowed).to_numpy(dtype=bool)
+    result = _columnar_errors_from_masks(items_to_check, column_name, [
+        ('INVALID_VALUE', invalid_mask, msg_template,
+         {'column_name': column_name, 'allowed_values': list(allowed)}, True)])
+    return result if return_columnar else result.to_dicts()
 
 
-def check_numeric_range(series, column_name, params, disable_tqdm=True):
-    errors = [];
+def check_numeric_range(series, column_name, params, disable_tqdm=True, return_columnar=False):
     min_v, max_v = params.get('min'), params.get('max')
     if series is None: return [
         {'column': column_name, 'error_type': 'SERIES_IS_NONE', 'message': f"컬럼 '{column_name}'의 시리즈(데이터)가 None입니다."}]
     min_s, max_s = str(min_v) if min_v is not None else '-inf', str(max_v) if max_v is not None else 'inf'
     msg_template = params.get('message', "컬럼 '{column_name}'의 값 '{value}'이(가) 범위 [{min_val_str}, {max_val_str}] 벗어남.")
     num_s = pd.to_numeric(series, errors='coerce')
-    for idx, val_numeric in tqdm(num_s.items(), total=len(num_s), desc=f"RANGE '{column_name}'", disable=disable_tqdm,
-                                 leave=False, unit="행"):
-        original_value = series.loc[idx]
-        if pd.isna(val_numeric):
-            if not series.isnull().loc[idx]: errors.append(
-                {'column': column_name, 'row_index': idx, 'value': original_value, 'error_type': 'NOT_NUMERIC',
-                 'message': f"컬럼 '{column_name}'의 값 '{original_value}'은(는) 숫자로 변환할 수 없습니다."})
-            continue
-        if (min_v is not None and val_numeric < min_v) or (max_v is not None and val_numeric > max_v):
-            errors.append(
-                {'column': column_name, 'row_index': idx, 'value': original_value, 'error_type': 'OUT_OF_RANGE',
-                 'message': msg_template.format(column_name=column_name, value=original_value, min_val_str=min_s,
-                                                max_val_str=max_s)})
-    return errors
+    is_numeric = num_s.notna()
+    not_numeric_mask = ~is_numeric & series.notnull()
+    out_of_range_mask = pd.Series(False, index=series.index)
+    if min_v is not None: out_of_range_mask |= (num_s < min_v) & is_numeric
+    if max_v is not None: out_of_range_mask |= (num_s > max_v) & is_numeric
+    result = _columnar_errors_from_masks(series, column_name, [
+        ('NOT_NUMERIC', not_numeric_mask.to_numpy(dtype=bool), "컬럼 '{column_name}'의 값 '{value}'은(는) 숫자로 변환할 수 없습니다.",
+         {'column_name': column_name}, True),
+        ('OUT_OF_RANGE', out_of_range_mask.to_numpy(dtype=bool), msg_template,
+         {'column_name': column_name, 'min_val_str': min_s, 'max_val_str': max_s}, True)], native_values=False)
+    return result if return_columnar else result.to_dicts()
+
+
+def _frequency_profile_from_factorized(factorized):
+    """FactorizedColumn의 고유값별 건수로 check_distribution_change의 현재 분포를 만듭니다 (astype(str) 값 기준과 동일)."""
+    total_count = len(factorized.codes)
+    present = factorized.counts > 0  # 필터 결과에 없는 고유값 제외
+    code_counts = {}
+    for code, cnt in zip(pd.Series(factorized.uniques[present]).astype(str).tolist(),
+                         factorized.counts[present].tolist()):
+        code_counts[code] = code_counts.get(code, 0) + cnt
+    if factorized.null_count: code_counts[str(np.nan)] = code_counts.get(str(np.nan), 0) + factorized.null_count
+    code_counts = dict(sorted(code_counts.items(), key=lambda item: -item[1]))
+    return {'unique_codes': list(code_counts), 'frequencies': {k: v / total_count for k, v in code_counts.items()},
+            'total_unique_count': len(code_counts), 'count': total_count, 'null_count': factorized.null_count}
 
 
 def check_distribution_change(series, column_name, params, q_processor=None):
     errors = [];
     historical_profile = None;
     current_profile_data = {'unique_codes': [], 'frequencies': {}, 'total_unique_count': 0, 'count': 0, 'null_count': 0}
-    if series is None or series.empty:
+    if params.get('_current_profile') is not None:
+        current_profile_data = params['_current_profile']  # validate_chunks: 청크별 빈도를 병합한 현재 분포
+    elif series is None or series.empty:
         print(f"정보: 컬럼 '{column_name}' 현재 데이터 비어 분포 변경 검사 일부 수행/건너뜀.")
+    elif params.get('_factorized_column') is not None:
+        current_profile_data = _frequency_profile_from_factorized(params['_factorized_column'])
     else:
         current_s = series.astype(str);
         vc = current_s.value_counts(dropna=False);
@@ -330,38 +1930,48 @@ def check_distribution_change(series, column_name, params, q_processor=None):
     if 'historical_data_table' in params and 'historical_data_column' in params:
         if not q_processor: errors.append(
             {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': "DB용 QueryProcessor 필요"}); return errors
-        table, hist_col = params['historical_data_table'], params['historical_data_column'];
-        filter_condition = params.get('historical_data_filter', '1=1');
-        query_params = params.get('historical_data_query_params', {});
-        db_engine = params.get('db_engine', 'hive')
-        if query_params: filter_condition = filter_condition.format(**query_params)
-        freq_query = f"SELECT CAST({hist_col} AS STRING) AS code, COUNT(*) AS frequency FROM {table} WHERE {filter_condition} AND {hist_col} IS NOT NULL GROUP BY CAST({hist_col} AS STRING)"
-        summary_query = f"SELECT COUNT(1) AS total_count_with_null, COUNT({hist_col}) AS total_count_not_null, COUNT(DISTINCT {hist_col}) AS total_unique_count_not_null FROM {table} WHERE {filter_condition}"
         try:
-            hist_freq_df = q_processor.fetch_to_pandas(query=freq_query, engine=db_engine, limit=None);
-            hist_summary_df = q_processor.fetch_to_pandas(query=summary_query, engine=db_engine, limit=None)
-            if hist_summary_df.empty or pd.isna(hist_summary_df.iloc[0]['total_count_with_null']) or \
-                    hist_summary_df.iloc[0]['total_count_with_null'] == 0:
-                historical_profile = {'unique_codes': [], 'frequencies': {}, 'total_unique_count': 0, 'count': 0,
-                                      'null_count': 0}
-            else:
-                tc_hist_wn = int(hist_summary_df.iloc[0]['total_count_with_null']);
-                tc_hist_nn = int(hist_summary_df.iloc[0]['total_count_not_null']);
-                nc_hist = tc_hist_wn - tc_hist_nn;
-                tuc_hist_nn = int(hist_summary_df.iloc[0]['total_unique_count_not_null']) if pd.notna(
-                    hist_summary_df.iloc[0]['total_unique_count_not_null']) else 0
-                uc_hist_nn = hist_freq_df['code'].astype(str).tolist() if not hist_freq_df.empty else [];
-                freqs_hist = {str(r['code']): r['frequency'] / tc_hist_wn if tc_hist_wn > 0 else 0 for _, r in
-                              hist_freq_df.iterrows()} if not hist_freq_df.empty else {}
-                if tc_hist_wn > 0: freqs_hist[str(np.nan)] = nc_hist / tc_hist_wn
-                historical_profile = {'unique_codes': uc_hist_nn + ([str(np.nan)] if nc_hist > 0 else []),
-                                      'frequencies': freqs_hist,
-                                      'total_unique_count': tuc_hist_nn + (1 if nc_hist > 0 else 0),
-                                      'count': tc_hist_wn, 'null_count': nc_hist}
+            # profile_store_dir(또는 DataValidator의 profile_store) + historical_partition_* 설정 시 파티션 프로파일 병합
+            window_partition_profiles = _get_store_window_partition_profiles(params, 'frequency', q_processor)
         except Exception as e:
             errors.append({'column': column_name, 'error_type': 'DB_AGGREGATE_PROFILE_ERROR',
-                           'message': f"DB 과거 분포 프로파일 생성 실패 ({column_name}): {e}"});
+                           'message': f"과거 분포 프로파일 저장소 처리 실패 ({column_name}): {e}"});
             return errors
+        if window_partition_profiles is not None:
+            historical_profile = _merge_frequency_profiles(window_partition_profiles)
+        else:
+            table, hist_col = params['historical_data_table'], params['historical_data_column'];
+            filter_condition = params.get('historical_data_filter', '1=1');
+            query_params = params.get('historical_data_query_params', {});
+            db_engine = params.get('db_engine', 'hive')
+            if query_params: filter_condition = filter_condition.format(**query_params)
+            freq_query = f"SELECT CAST({hist_col} AS STRING) AS code, COUNT(*) AS frequency FROM {table} WHERE {filter_condition} AND {hist_col} IS NOT NULL GROUP BY CAST({hist_col} AS STRING)"
+            summary_query = f"SELECT COUNT(1) AS total_count_with_null, COUNT({hist_col}) AS total_count_not_null, COUNT(DISTINCT {hist_col}) AS total_unique_count_not_null FROM {table} WHERE {filter_condition}"
+            try:
+                hist_freq_df = q_processor.fetch_to_pandas(query=freq_query, engine=db_engine, limit=None);
+                hist_summary_df = q_processor.fetch_to_pandas(query=summary_query, engine=db_engine, limit=None)
+                if hist_summary_df.empty or pd.isna(hist_summary_df.iloc[0]['total_count_with_null']) or \
+                        hist_summary_df.iloc[0]['total_count_with_null'] == 0:
+                    historical_profile = {'unique_codes': [], 'frequencies': {}, 'total_unique_count': 0, 'count': 0,
+                                          'null_count': 0}
+                else:
+                    tc_hist_wn = int(hist_summary_df.iloc[0]['total_count_with_null']);
+                    tc_hist_nn = int(hist_summary_df.iloc[0]['total_count_not_null']);
+                    nc_hist = tc_hist_wn - tc_hist_nn;
+                    tuc_hist_nn = int(hist_summary_df.iloc[0]['total_unique_count_not_null']) if pd.notna(
+                        hist_summary_df.iloc[0]['total_unique_count_not_null']) else 0
+                    uc_hist_nn = hist_freq_df['code'].astype(str).tolist() if not hist_freq_df.empty else [];
+                    freqs_hist = {str(r['code']): r['frequency'] / tc_hist_wn if tc_hist_wn > 0 else 0 for _, r in
+                                  hist_freq_df.iterrows()} if not hist_freq_df.empty else {}
+                    if tc_hist_wn > 0: freqs_hist[str(np.nan)] = nc_hist / tc_hist_wn
+                    historical_profile = {'unique_codes': uc_hist_nn + ([str(np.nan)] if nc_hist > 0 else []),
+                                          'frequencies': freqs_hist,
+                                          'total_unique_count': tuc_hist_nn + (1 if nc_hist > 0 else 0),
+                                          'count': tc_hist_wn, 'null_count': nc_hist}
+            except Exception as e:
+                errors.append({'column': column_name, 'error_type': 'DB_AGGREGATE_PROFILE_ERROR',
+                               'message': f"DB 과거 분포 프로파일 생성 실패 ({column_name}): {e}"});
+                return errors
     elif 'historical_profile_path' in params:
         try:
             with open(params['historical_profile_path'], 'r', encoding='utf-8') as f:
@@ -462,43 +2072,57 @@ def check_numeric_volatility(current_df_series, column_name, params, q_processor
     if 'historical_data_table' in params and 'historical_data_column' in params:
         if not q_processor: errors.append(
             {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': "DB용 QueryProcessor 필요"}); return errors
-        table, hist_col = params['historical_data_table'], params['historical_data_column'];
-        filter_condition = params.get('historical_data_filter', '1=1');
-        query_params = params.get('historical_data_query_params', {});
-        db_engine = params.get('db_engine', 'hive')
-        if query_params: filter_condition = filter_condition.format(**query_params)
-        gb_select_str = (", ".join(group_by_columns) + ", ") if group_by_columns else "";
-        gb_clause_str = ("GROUP BY " + ", ".join(group_by_columns)) if group_by_columns else ""
-        query = f"""SELECT {gb_select_str} AVG({hist_col}) AS mean_val, STDDEV_SAMP({hist_col}) AS std_val, MIN({hist_col}) AS min_val, MAX({hist_col}) AS max_val, PERCENTILE_APPROX({hist_col}, 0.5) AS median_val, PERCENTILE_APPROX({hist_col}, 0.25) AS q1_val, PERCENTILE_APPROX({hist_col}, 0.75) AS q3_val, COUNT({hist_col}) AS count_val FROM {table} WHERE {filter_condition} AND {hist_col} IS NOT NULL {gb_clause_str}"""
         try:
-            profile_df_db = q_processor.fetch_to_pandas(query=query, engine=db_engine, limit=None)
-            if profile_df_db.empty:
-                print(f"경고: DB에서 '{hist_col}' 과거 숫자 데이터 없음 (컬럼:{column_name}, 그룹:{group_by_columns}).")
-            else:
-                for _, row in profile_df_db.iterrows():
-                    profile = {'mean': float(row['mean_val']) if pd.notna(row['mean_val']) else 0.0,
-                               'std': float(row['std_val']) if pd.notna(row['std_val']) else 0.0,
-                               'min': float(row['min_val']) if pd.notna(row['min_val']) else 0.0,
-                               'max': float(row['max_val']) if pd.notna(row['max_val']) else 0.0,
-                               'median': float(row['median_val']) if pd.notna(row['median_val']) else 0.0,
-                               'q1': float(row['q1_val']) if pd.notna(row['q1_val']) else 0.0,
-                               'q3': float(row['q3_val']) if pd.notna(row['q3_val']) else 0.0,
-                               'count': int(row['count_val']) if pd.notna(row['count_val']) else 0}
-                    if group_by_columns:
-                        key_tuple = tuple(
-                            str(row[gb_col]) if pd.notna(row[gb_col]) else '__NONE_GROUP_KEY__' for gb_col in
-                            group_by_columns);
-                        historical_profile_map[key_tuple] = profile
-                    else:
-                        historical_profile_map['__overall__'] = profile;
-                        break
+            window_partition_profiles = _get_store_window_partition_profiles(params, 'numeric', q_processor,
+                                                                             group_by_columns)
         except Exception as e:
             errors.append({'column': column_name, 'error_type': 'DB_AGGREGATE_PROFILE_ERROR',
-                           'message': f"DB 과거 숫자 프로파일 생성 실패 ({column_name}, 그룹:{group_by_columns}): {e}"});
+                           'message': f"과거 숫자 프로파일 저장소 처리 실패 ({column_name}, 그룹:{group_by_columns}): {e}"});
             return errors
+        if window_partition_profiles is not None:
+            group_partials = {}
+            for partition_profile in window_partition_profiles:
+                for group_key, stats in partition_profile:
+                    group_partials.setdefault(tuple(group_key), []).append(stats)
+            for group_key, partials in group_partials.items():
+                merged_profile = _merge_numeric_profiles(partials)
+                if merged_profile: historical_profile_map[group_key if group_by_columns else '__overall__'] = merged_profile
+        else:
+            table, hist_col = params['historical_data_table'], params['historical_data_column'];
+            filter_condition = params.get('historical_data_filter', '1=1');
+            query_params = params.get('historical_data_query_params', {});
+            db_engine = params.get('db_engine', 'hive')
+            if query_params: filter_condition = filter_condition.format(**query_params)
+            gb_select_str = (", ".join(group_by_columns) + ", ") if group_by_columns else "";
+            gb_clause_str = ("GROUP BY " + ", ".join(group_by_columns)) if group_by_columns else ""
+            query = f"""SELECT {gb_select_str} AVG({hist_col}) AS mean_val, STDDEV_SAMP({hist_col}) AS std_val, MIN({hist_col}) AS min_val, MAX({hist_col}) AS max_val, PERCENTILE_APPROX({hist_col}, 0.5) AS median_val, PERCENTILE_APPROX({hist_col}, 0.25) AS q1_val, PERCENTILE_APPROX({hist_col}, 0.75) AS q3_val, COUNT({hist_col}) AS count_val FROM {table} WHERE {filter_condition} AND {hist_col} IS NOT NULL {gb_clause_str}"""
+            try:
+                profile_df_db = q_processor.fetch_to_pandas(query=query, engine=db_engine, limit=None)
+                if profile_df_db.empty:
+                    print(f"경고: DB에서 '{hist_col}' 과거 숫자 데이터 없음 (컬럼:{column_name}, 그룹:{group_by_columns}).")
+                else:
+                    for _, row in profile_df_db.iterrows():
+                        profile = {'mean': float(row['mean_val']) if pd.notna(row['mean_val']) else 0.0,
+                                   'std': float(row['std_val']) if pd.notna(row['std_val']) else 0.0,
+                                   'min': float(row['min_val']) if pd.notna(row['min_val']) else 0.0,
+                                   'max': float(row['max_val']) if pd.notna(row['max_val']) else 0.0,
+                                   'median': float(row['median_val']) if pd.notna(row['median_val']) else 0.0,
+                                   'q1': float(row['q1_val']) if pd.notna(row['q1_val']) else 0.0,
+                                   'q3': float(row['q3_val']) if pd.notna(row['q3_val']) else 0.0,
+                                   'count': int(row['count_val']) if pd.notna(row['count_val']) else 0}
+                        if group_by_columns:
+                            key_tuple = tuple(
+                                str(row[gb_col]) if pd.notna(row[gb_col]) else '__NONE_GROUP_KEY__' for gb_col in
+                                group_by_columns);
+                            historical_profile_map[key_tuple] = profile
+                        else:
+                            historical_profile_map['__overall__'] = profile;
+                            break
+            except Exception as e:
+                errors.append({'column': column_name, 'error_type': 'DB_AGGREGATE_PROFILE_ERROR',
+                               'message': f"DB 과거 숫자 프로파일 생성 실패 ({column_name}, 그룹:{group_by_columns}): {e}"});
+                return errors
     elif 'historical_profile_path' in params or 'historical_profile' in params:
-        if group_by_columns: errors.append(
-            {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': '파일/객체 프로파일은 그룹별 검사 미지원'}); return errors
         profile_source = params.get('historical_profile')
         if 'historical_profile_path' in params:
             try:
@@ -516,7 +2140,18 @@ def check_numeric_volatility(current_df_series, column_name, params, q_processor
                 errors.append({'column': column_name, 'error_type': 'PROFILE_FILE_ERROR',
                                'message': f"프로파일 파일 오류: {e}"});
                 return errors
-        if profile_source:
+        if isinstance(profile_source, dict) and profile_source.get('profile_type') == 'numeric_sketch':
+            # update_numeric_profile_file로 만든 파티션별 스케치 프로파일: 그룹별 검사 포함 DB 조회 없이 수행
+            try:
+                historical_profile_map = _numeric_profile_map_from_sketch_file(profile_source, group_by_columns, params)
+            except Exception as e:
+                errors.append({'column': column_name, 'error_type': 'PROFILE_FILE_ERROR',
+                               'message': f"스케치 프로파일 처리 오류: {e}"});
+                return errors
+        elif group_by_columns:
+            errors.append(
+                {'column': column_name, 'error_type': 'CONFIG_ERROR', 'message': '파일/객체 프로파일은 그룹별 검사 미지원'}); return errors
+        elif profile_source:
             cleaned_profile = {
                 key: (int(value) if key == 'count' and pd.notna(value) else (float(value) if pd.notna(value) else 0.0))
                 for key, value in profile_source.items()};
@@ -530,95 +2165,267 @@ def check_numeric_volatility(current_df_series, column_name, params, q_processor
     if not historical_profile_map: print(f"경고: '{column_name}' 과거 프로파일 없음. 변동성 검사 불가."); return errors
     method, thresholds = params.get("method", "z_score").lower(), params.get("thresholds", {})
     num_series_curr = pd.to_numeric(current_df_series, errors='coerce').fillna(0.0)
-    for idx, curr_val in tqdm(num_series_curr.items(), total=len(num_series_curr), desc=f"VOLATILITY '{column_name}'",
-                              disable=disable_tqdm, leave=False, unit="행"):
-        orig_val = current_df_series.loc[idx];
-        hist_prof, grp_key_str = None, "전체"
-        if group_by_columns:
-            if full_current_df is None or full_current_df.empty: err_detail = {'column': column_name, 'row_index': idx,
-                                                                               'error_type': 'CONFIG_ERROR',
-                                                                               'message': "그룹별 검사 시 전체 DataFrame 필요"}; [
-                errors.append(err_detail) if err_detail not in errors else None]; continue
-            try:
-                curr_grp_key = tuple(str(full_current_df.loc[idx, col]) if pd.notna(
-                    full_current_df.loc[idx, col]) else '__NONE_GROUP_KEY__' for col in group_by_columns)
-            except KeyError:
-                print(f"경고: 그룹 키 생성 중 오류 (인덱스 {idx}). 건너뜀.");
-                continue
-            grp_key_str = str(curr_grp_key);
-            hist_prof = historical_profile_map.get(curr_grp_key)
-            if not hist_prof: continue
-        else:
-            hist_prof = historical_profile_map.get('__overall__')
-        if not hist_prof or hist_prof.get('count', 0) == 0: continue
-        is_outlier_flag = False;
-        detail_message_suffix = "";
-        msg_template_str = params.get('message', "컬럼 '{column_name}'(그룹: {group_key_str}) 값 '{value}' 과거 대비 비정상 변동.")
+    curr_values = num_series_curr.to_numpy(dtype=float)
+    msg_template_str = params.get('message', "컬럼 '{column_name}'(그룹: {group_key_str}) 값 '{value}' 과거 대비 비정상 변동.")
+    profile_fields = ['mean', 'std', 'q1', 'q3', 'count']
+    if group_by_columns:
+        if full_current_df is None or full_current_df.empty:
+            return [{'column': column_name, 'row_index': idx, 'error_type': 'CONFIG_ERROR',
+                     'message': "그룹별 검사 시 전체 DataFrame 필요"} for idx in current_df_series.index]
+        if not all(col in full_current_df.columns for col in group_by_columns):
+            print(f"경고: 그룹 키 생성 중 오류 (그룹 컬럼 없음: {group_by_columns}). 건너뜀.");
+            return errors
+        group_source_df = full_current_df if full_current_df.index.equals(current_df_series.index) else \
+            full_current_df.reindex(current_df_series.index)
+        # 과거 프로파일 맵을 DataFrame으로 바꿔 그룹 컬럼 기준으로 현재 행에 조인 (행 순서 유지)
+        row_keys_df = pd.DataFrame({f"__key_{i}__": _group_key_series(group_source_df[col]).to_numpy(dtype=object)
+                                    for i, col in enumerate(group_by_columns)})
+        profile_rows = [{**{f"__key_{i}__": key_part for i, key_part in enumerate(grp_key)},
+                         **{field: hist_prof.get(field, 0) for field in profile_fields}}
+                        for grp_key, hist_prof in historical_profile_map.items() if isinstance(grp_key, tuple)]
+        key_cols = list(row_keys_df.columns)
+        profile_df = pd.DataFrame(profile_rows, columns=key_cols + profile_fields).drop_duplicates(subset=key_cols)
+        joined_df = row_keys_df.merge(profile_df, on=key_cols, how='left')
+    else:
+        hist_prof = historical_profile_map.get('__overall__') or {}
+        joined_df = pd.DataFrame({field: np.full(len(curr_values), hist_prof.get(field, 0) if hist_prof else np.nan,
+                                                 dtype=float) for field in profile_fields})
+    prof_count = joined_df['count'].to_numpy(dtype=float)
+    eligible_mask = ~np.isnan(prof_count) & (prof_count != 0)
+    detail_by_pos = {}
+    if method == "z_score":
+        z_thresh = thresholds.get("z_score_threshold", 3.0)
+        m_arr, s_arr = joined_df['mean'].to_numpy(dtype=float), joined_df['std'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_arr = (curr_values - m_arr) / s_arr
+        zero_std_mask = s_arr == 0
+        outlier_mask = eligible_mask & ((zero_std_mask & (curr_values != m_arr)) | (~zero_std_mask & (np.abs(z_arr) > z_thresh)))
+        for pos in np.flatnonzero(outlier_mask):
+            curr_val, m = float(curr_values[pos]), float(m_arr[pos])
+            detail_by_pos[pos] = f"과거 std 0, 현재값({curr_val}) != 평균({m})" if zero_std_mask[pos] else \
+                f"Z-점수 {(curr_val - m) / float(s_arr[pos]):.2f} (임계값: {z_thresh})"
+    elif method == "iqr":
+        iqr_mult = thresholds.get("iqr_multiplier", 1.5)
+        q1_arr, q3_arr = joined_df['q1'].to_numpy(dtype=float), joined_df['q3'].to_numpy(dtype=float)
+        iqr_arr = np.maximum(0, q3_arr - q1_arr)
+        low_arr, upp_arr = q1_arr - iqr_mult * iqr_arr, q3_arr + iqr_mult * iqr_arr
+        outlier_mask = eligible_mask & ~((low_arr <= curr_values) & (curr_values <= upp_arr))
+        for pos in np.flatnonzero(outlier_mask):
+            detail_by_pos[pos] = f"IQR 범위 [{low_arr[pos]:.2f}, {upp_arr[pos]:.2f}] 벗어남 (Q1:{q1_arr[pos]:.2f}, Q3:{q3_arr[pos]:.2f}, IQR:{iqr_arr[pos]:.2f})"
+    else:
+        outlier_mask = eligible_mask
+    outlier_positions = np.flatnonzero(outlier_mask)
+    row_index_values = current_df_series.index.tolist() if outlier_positions.size else []  # Python 기본형 인덱스
+    for pos in outlier_positions:
+        idx, orig_val = row_index_values[pos], current_df_series.iloc[pos]
+        grp_key_str = str(tuple(row_keys_df.iloc[pos])) if group_by_columns else "전체"
+        if pos not in detail_by_pos:
+            errors.append({'column': column_name, 'row_index': idx, 'value': orig_val,
+                           'group_key': grp_key_str if group_by_columns else '', 'error_type': 'CONFIG_ERROR',
+                           'message': f"알 수 없는 변동성 검증 방법: {method}"});
+            continue
         try:
             formatted_msg_template = msg_template_str.format(column_name=column_name, value=orig_val,
                                                              group_key_str=grp_key_str)
         except KeyError:
             formatted_msg_template = params.get('message', "컬럼 '{column_name}' 값 '{value}' 과거 대비 비정상 변동.").format(
                 column_name=column_name, value=orig_val)
-        if method == "z_score":
-            m, s, z_thresh = hist_prof.get("mean", 0.0), hist_prof.get("std", 0.0), thresholds.get("z_score_threshold",
-                                                                                                   3.0)
-            if s == 0:
-                if curr_val != m: is_outlier_flag = True; detail_message_suffix = f"과거 std 0, 현재값({curr_val}) != 평균({m})"
-            elif abs((curr_val - m) / s) > z_thresh:
-                is_outlier_flag = True;
-                detail_message_suffix = f"Z-점수 {(curr_val - m) / s:.2f} (임계값: {z_thresh})"
-        elif method == "iqr":
-            q1_h, q3_h, iqr_mult = hist_prof.get("q1", 0.0), hist_prof.get("q3", 0.0), thresholds.get("iqr_multiplier",
-                                                                                                      1.5);
-            iqr_h = max(0, q3_h - q1_h);
-            low_b, upp_b = q1_h - iqr_mult * iqr_h, q3_h + iqr_mult * iqr_h
-            if not (
-                    low_b <= curr_val <= upp_b): is_outlier_flag = True; detail_message_suffix = f"IQR 범위 [{low_b:.2f}, {upp_b:.2f}] 벗어남 (Q1:{q1_h:.2f}, Q3:{q3_h:.2f}, IQR:{iqr_h:.2f})"
-        else:
-            errors.append({'column': column_name, 'row_index': idx, 'value': orig_val,
-                           'group_key': grp_key_str if group_by_columns else '', 'error_type': 'CONFIG_ERROR',
-                           'message': f"알 수 없는 변동성 검증 방법: {method}"});
-            continue
-        if is_outlier_flag: errors.append({'column': column_name, 'row_index': idx, 'value': orig_val,
-                                           'group_key': grp_key_str if group_by_columns else '', 'error_type': (
-                                                                                                                   'GROUP_' if group_by_columns else 'OVERALL_') + 'NUMERIC_VOLATILITY_DETECTED',
-                                           'message': f"{formatted_msg_template} ({detail_message_suffix})"})
+        errors.append({'column': column_name, 'row_index': idx, 'value': orig_val,
+                       'group_key': grp_key_str if group_by_columns else '',
+                       'error_type': ('GROUP_' if group_by_columns else 'OVERALL_') + 'NUMERIC_VOLATILITY_DETECTED',
+                       'message': f"{formatted_msg_template} ({detail_by_pos[pos]})"})
     return errors
 
 
-def check_column_equality(df, params, disable_tqdm=True):
+def _column_equality_mismatch_mask(series1, series2, params):
+    """두 컬럼의 행별 불일치 여부(bool 배열)를 계산합니다 (numeric_tolerance/trim_strings/case_insensitive/null_equals_null)."""
+    nulls1, nulls2 = series1.isna().to_numpy(), series2.isna().to_numpy()
+    trim_strings, case_insensitive = params.get('trim_strings', False), params.get('case_insensitive', False)
+    numeric_tolerance = params.get('numeric_tolerance')
+    if series1.dtype == series2.dtype and pd.api.types.is_integer_dtype(series1.dtype):
+        # 정수끼리는 float 변환 없이 비교 (2**53 초과 int64도 정확히 비교, NULL 행은 아래에서 따로 판정)
+        int_dtype = getattr(series1.dtype, 'numpy_dtype', series1.dtype)
+        mismatch = series1.to_numpy(dtype=int_dtype, na_value=0) != series2.to_numpy(dtype=int_dtype, na_value=0)
+        values1 = values2 = None
+    elif (series1.dtype == series2.dtype and pd.api.types.is_numeric_dtype(series1.dtype)
+            and not pd.api.types.is_bool_dtype(series1.dtype)):
+        # 같은 숫자 타입끼리는 문자열로 바꾸지 않고 값으로 비교 (문자열 비교와 같은 결과: -0.0과 0.0만 구분)
+        values1, values2 = series1.to_numpy(dtype=float, na_value=np.nan), series2.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            mismatch = (values1 != values2) | (np.signbit(values1) != np.signbit(values2))
+    else:
+        strings1 = series1.astype(str).fillna('__NONE_PLACEHOLDER__')
+        strings2 = series2.astype(str).fillna('__NONE_PLACEHOLDER__')
+        if trim_strings: strings1, strings2 = strings1.str.strip(), strings2.str.strip()
+        if case_insensitive: strings1, strings2 = strings1.str.casefold(), strings2.str.casefold()
+        mismatch = strings1.to_numpy(dtype=object) != strings2.to_numpy(dtype=object)
+        values1 = values2 = None
+    if numeric_tolerance is not None:
+        if values1 is None:
+            values1 = pd.to_numeric(series1, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            values2 = pd.to_numeric(series2, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        both_numeric = ~np.isnan(values1) & ~np.isnan(values2)
+        mismatch[both_numeric] = np.abs(values1[both_numeric] - values2[both_numeric]) > float(numeric_tolerance)
+    both_null = nulls1 & nulls2
+    mismatch[both_null] = False
+    if not params.get('null_equals_null', True): mismatch |= nulls1 | nulls2
+    else: mismatch |= nulls1 != nulls2
+    return mismatch
+
+
+def check_column_equality(df, params, disable_tqdm=True, lazy_row_data=False):
+    """column1과 column2 값이 다른 행을 찾습니다 (max_mismatch_samples 초과분은 COLUMN_MISMATCH_TRUNCATED 1건으로 요약)."""
     errors = [];
     col1, col2 = params.get('column1'), params.get('column2')
     if df is None or df.empty: return []
     if not all([col1, col2, col1 in df.columns, col2 in df.columns]): errors.append(
         {'error_type': 'CONFIG_ERROR', 'message': f'컬럼 설정 오류: {col1}, {col2}'}); return errors
     msg_template = params.get('message', "행 {row_index}: 컬럼 '{col1_name}'(값: {val1})과 '{col2_name}'(값: {val2}) 불일치.")
-    df_compare = df[[col1, col2]].astype(str).fillna('__NONE_PLACEHOLDER__')
-    for idx, row_series in tqdm(df.iterrows(), total=len(df), desc=f"EQUALITY '{col1}' vs '{col2}'",
-                                disable=disable_tqdm, leave=False, unit="행"):
-        if df_compare.loc[idx, col1] != df_compare.loc[idx, col2]: errors.append(
-            {'columns': [col1, col2], 'row_index': idx, 'error_type': 'COLUMN_MISMATCH',
-             'message': msg_template.format(row_index=idx, col1_name=col1, val1=df.loc[idx, col1], col2_name=col2,
-                                            val2=df.loc[idx, col2]), 'error_row_data': df.loc[idx].to_dict()})
+    mismatch_positions = np.flatnonzero(_column_equality_mismatch_mask(df[col1], df[col2], params))
+    max_samples = params.get('max_mismatch_samples')
+    sample_positions = mismatch_positions[:max_samples] if max_samples is not None else mismatch_positions
+    sample_index = df.index[sample_positions].tolist()
+    sample_values1, sample_values2 = df[col1].iloc[sample_positions].tolist(), df[col2].iloc[sample_positions].tolist()
+    for pos, idx, val1, val2 in tqdm(zip(sample_positions.tolist(), sample_index, sample_values1, sample_values2),
+                                     total=len(sample_positions), desc=f"EQUALITY '{col1}' vs '{col2}'",
+                                     disable=disable_tqdm or not len(sample_positions), leave=False, unit="행"):
+        errors.append({'columns': [col1, col2], 'row_index': idx, 'error_type': 'COLUMN_MISMATCH',
+                       'message': msg_template.format(row_index=idx, col1_name=col1, val1=val1, col2_name=col2,
+                                                      val2=val2)})
+        if not lazy_row_data: errors[-1]['error_row_data'] = df.iloc[pos].to_dict()
+    if len(mismatch_positions) > len(sample_positions):
+        errors.append({'columns': [col1, col2], 'error_type': 'COLUMN_MISMATCH_TRUNCATED',
+                       'mismatch_count': len(mismatch_positions),
+                       'omitted_mismatch_count': len(mismatch_positions) - len(sample_positions),
+                       'message': f"컬럼 '{col1}'과 '{col2}' 불일치 총 {len(mismatch_positions)}건 중 "
+                                  f"{len(sample_positions)}건만 기록했습니다 (max_mismatch_samples)."})
     return errors
 
 
-def check_duplicate_rows(df, params, disable_tqdm=True):
+def _failed_item_count(errors):
+    """검증 함수 오류 목록이 나타내는 실패 항목 수 (중복 그룹은 그룹 행 수, 불일치 생략 안내는 생략된 행 수)."""
+    return sum(err['duplicate_count'] if 'duplicate_count' in err else err.get('omitted_mismatch_count', 1)
+               for err in errors)
+
+
+def _duplicate_row_hashes(df_for_dup_check):
+    """검사 컬럼별 값 해시를 합친 행 해시(uint64). 문자열 변환 사본 없이 컬럼 단위로 계산합니다 (결측값끼리는 같은 값)."""
+    return pd.util.hash_pandas_object(df_for_dup_check, index=False).to_numpy()
+
+
+_NULL_VALUE_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _duplicate_numeric_keys(series):
+    """숫자 컬럼 값을 dtype(int/float/nullable)과 무관한 (정수 값 또는 float 비트, 종류) 배열로 바꿉니다 (종류: 0 정수, 1 실수, 2 결측, 3 큰 uint)."""
+    null_mask = series.isna().to_numpy()
+    if pd.api.types.is_unsigned_integer_dtype(series):
+        raw = series.to_numpy(dtype=np.uint64, na_value=0)
+        return raw.view(np.int64), np.where(null_mask, 2, np.where(raw >= np.uint64(2 ** 63), 3, 0)).astype(np.int8)
+    if pd.api.types.is_integer_dtype(series):
+        return series.to_numpy(dtype=np.int64, na_value=0), np.where(null_mask, 2, 0).astype(np.int8)
+    floats = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid='ignore'):
+        integral = np.isfinite(floats) & (np.floor(floats) == floats) & (np.abs(floats) < 2.0 ** 63) & ~(
+                (floats == 0) & np.signbit(floats))
+    values = np.where(integral, np.where(integral, floats, 0).astype(np.int64), floats.view(np.int64))
+    return np.where(null_mask, 0, values), np.where(null_mask, 2, np.where(integral, 0, 1)).astype(np.int8)
+
+
+def _is_duplicate_numeric_column(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _chunk_duplicate_row_hashes(df_for_dup_check):
+    """청크 간 비교용 행 해시: 숫자는 _duplicate_numeric_keys 값, 결측은 dtype과 무관한 같은 값으로 해시합니다 (int64 5와 float64 5.0은 같은 해시)."""
+    row_hashes = np.zeros(len(df_for_dup_check), dtype=np.uint64)
+    for pos in range(df_for_dup_check.shape[1]):
+        series = df_for_dup_check.iloc[:, pos]
+        if _is_duplicate_numeric_column(series):
+            values, kinds = _duplicate_numeric_keys(series)
+            col_hashes = pd.util.hash_array(values) ^ pd.util.hash_array(kinds.astype(np.int64))
+        else:
+            col_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        col_hashes = np.where(series.isna().to_numpy(), _NULL_VALUE_HASH, col_hashes)
+        row_hashes = row_hashes * np.uint64(1000003) ^ col_hashes
+    return row_hashes
+
+
+def _duplicate_key_text(df_for_dup_check):
+    """청크 후보 행 확인용 키 문자열 (숫자는 _duplicate_numeric_keys 기준, 그 외는 astype(str), 결측은 같은 자리표시자)."""
+    key_columns = {}
+    for pos in range(df_for_dup_check.shape[1]):
+        series = df_for_dup_check.iloc[:, pos]
+        if _is_duplicate_numeric_column(series):
+            values, kinds = _duplicate_numeric_keys(series)
+            text = np.array([f"{kind}:{value}" for kind, value in zip(kinds.tolist(), values.tolist())], dtype=object)
+        else:
+            text = series.astype(str).to_numpy(dtype=object)
+        key_columns[pos] = np.where(series.isna().to_numpy(), '__NAN_PLACEHOLDER__', text)
+    return pd.DataFrame(key_columns, index=range(len(df_for_dup_check)))
+
+
+def _confirmed_duplicate_groups(candidate_hashes, candidate_keys):
+    """해시가 겹치는 후보 행을 키 값(문자열 DataFrame)으로 다시 묶어 실제 중복 그룹만 후보 내 위치 배열 목록으로 반환합니다."""
+    candidate_keys.insert(0, '__row_hash__', candidate_hashes)
+    group_ids = candidate_keys.groupby(list(candidate_keys.columns), sort=False).ngroup().to_numpy()
+    group_sizes = np.bincount(group_ids)
+    confirmed = np.flatnonzero(group_sizes[group_ids] > 1)
+    order = confirmed[np.argsort(group_ids[confirmed], kind='stable')]
+    groups = np.split(order, np.cumsum(group_sizes[group_sizes > 1])[:-1]) if len(order) else []
+    return sorted(groups, key=lambda members: members[0])
+
+
+def _duplicate_row_groups(df_for_dup_check):
+    """중복 행 그룹을 첫 행 순서의 [행 위치 배열, ...]로 반환합니다 (해시 후보만 문자열 값으로 다시 확인)."""
+    row_hashes = _duplicate_row_hashes(df_for_dup_check)
+    candidates = np.flatnonzero(pd.Series(row_hashes).duplicated(keep=False).to_numpy())
+    if not len(candidates): return []
+    candidate_frame = df_for_dup_check.iloc[candidates].astype(str).fillna('__NAN_PLACEHOLDER__')
+    return [candidates[members] for members in _confirmed_duplicate_groups(row_hashes[candidates], candidate_frame)]
+
+
+def _duplicate_group_error(member_index, subset, msg_template, max_indices):
+    shown_index = member_index[:max_indices] if max_indices is not None else member_index
+    return {'columns': subset or 'all', 'row_index': member_index[0], 'error_type': 'DUPLICATE_ROW',
+            'duplicate_count': len(member_index), 'duplicate_row_indices': shown_index,
+            'message': msg_template.format(row_index=member_index[0], checked_columns=subset or '모든 컬럼',
+                                           duplicate_count=len(member_index),
+                                           row_indices=shown_index if len(shown_index) == len(member_index) else
+                                           f"{shown_index} 외 {len(member_index) - len(shown_index)}개")}
+
+
+def check_duplicate_rows(df, params, disable_tqdm=True, lazy_row_data=False):
+    """subset_columns 값이 같은 행을 중복 그룹당 오류 1건으로 보고합니다 (report_each_row=True이면 행마다 1건)."""
     errors = [];
     subset = params.get('subset_columns')
     if df is None or df.empty: return []
     if subset and not all(col in df.columns for col in subset): subset = None
-    msg_template = params.get('message', "중복 행 발견 (행 인덱스: {row_index}). 검사 대상: {checked_columns}")
-    df_for_dup_check = df[subset].astype(str).fillna('__NAN_PLACEHOLDER__') if subset else df.astype(str).fillna(
-        '__NAN_PLACEHOLDER__')
-    duplicates_series = df_for_dup_check.duplicated(keep=False)
-    for idx in tqdm(df[duplicates_series].index, total=duplicates_series.sum(),
-                    desc=f"DUPLICATES (subset: {subset or 'all'})", disable=disable_tqdm or not duplicates_series.any(),
-                    leave=False, unit="행"):
-        errors.append({'columns': subset or 'all', 'row_index': idx, 'error_type': 'DUPLICATE_ROW',
-                       'message': msg_template.format(row_index=idx, checked_columns=subset or '모든 컬럼'),
-                       'error_row_data': df.loc[idx].to_dict()})
+    report_each_row = params.get('report_each_row', False)
+    msg_template = params.get('message', "중복 행 발견 (행 인덱스: {row_index}). 검사 대상: {checked_columns}"
+                              if report_each_row else
+                              "중복 행 그룹 발견 ({duplicate_count}개 행, 행 인덱스: {row_indices}). 검사 대상: {checked_columns}")
+    df_for_dup_check = df[subset] if subset else df
+    if params.get('_duplicate_row_tracker') is not None:
+        # validate_chunks: 청크 간 중복은 마지막 청크까지 본 뒤에 판정 (_DuplicateRowTracker.finalize)
+        params['_duplicate_row_tracker'].add(df_for_dup_check, subset, msg_template, report_each_row,
+                                             params.get('max_group_row_indices', 100))
+        return errors
+    groups = _duplicate_row_groups(df_for_dup_check)
+    if report_each_row:
+        positions = np.sort(np.concatenate(groups)) if groups else np.array([], dtype=np.int64)
+        for pos in tqdm(positions.tolist(), desc=f"DUPLICATES (subset: {subset or 'all'})",
+                        disable=disable_tqdm or not len(positions), leave=False, unit="행"):
+            idx = df.index[pos]
+            errors.append({'columns': subset or 'all', 'row_index': idx, 'error_type': 'DUPLICATE_ROW',
+                           'message': msg_template.format(row_index=idx, checked_columns=subset or '모든 컬럼')})
+            if not lazy_row_data: errors[-1]['error_row_data'] = df.iloc[pos].to_dict()
+        return errors
+    for members in tqdm(groups, desc=f"DUPLICATE GROUPS (subset: {subset or 'all'})",
+                        disable=disable_tqdm or not groups, leave=False, unit="그룹"):
+        errors.append(_duplicate_group_error(df.index[members].tolist(), subset, msg_template,
+                                             params.get('max_group_row_indices', 100)))
+        if not lazy_row_data: errors[-1]['error_row_data'] = df.iloc[members[0]].to_dict()
     return errors
 
 
@@ -637,6 +2444,9 @@ def check_aggregate_value_trend(df, params, q_processor=None):
     inc_thresh = params.get('threshold_ratio_increase')
     dec_thresh = params.get('threshold_ratio_decrease')
     hist_base_filter = params.get('historical_base_filter', '1=1')
+    # DataValidator의 과거 조회 플래너가 다른 규칙과 병합 조회해 둔 결과 ({기간: {그룹키: 값}})
+    planned_hist_maps = params.get('_planned_historical_aggregates')
+    local_history_df = params.get('_local_history_frame')  # 검증 DataFrame에 있는 과거 기간은 pandas로 집계
 
     # --- 필수 파라미터 검증 ---
     if not all([agg_col, current_period_value, q_processor, table, date_col_db, date_fmt_db]):
@@ -652,43 +2462,46 @@ def check_aggregate_value_trend(df, params, q_processor=None):
                  'message': "group_by_columns는 리스트여야 함"}]
 
     # --- 현재 값 계산 ---
-    current_aggregates_map = {}
-    if not df.empty:
-        if group_by_columns:
-            if not all(col in df.columns for col in group_by_columns):
-                return [{'rule_type': 'aggregate_value_trend', 'error_type': 'CONFIG_ERROR',
-                         'message': f"group_by_columns 일부 컬럼 없음: {group_by_columns}"}]
-            df_grouped = df.copy()
-            for gb_col in group_by_columns:
-                if gb_col in df_grouped.columns:
-                    df_grouped[gb_col] = df_grouped[gb_col].fillna('__NONE_GROUP_KEY__').astype(str)
-
-            if agg_func == 'COUNT':
-                agg_series = df_grouped.groupby(group_by_columns, observed=True, dropna=False).size()
-            else:
-                if agg_col not in df.columns:
-                    return [{'rule_type': 'aggregate_value_trend', 'error_type': 'COLUMN_NOT_FOUND',
-                             'message': f"컬럼 '{agg_col}' 없음"}]
-                numeric_col = pd.to_numeric(df_grouped[agg_col], errors='coerce').fillna(0)
-                df_grouped['__agg_target__'] = numeric_col
-                grouped_obj_agg = df_grouped.groupby(group_by_columns, observed=True, dropna=False)
-                agg_series = grouped_obj_agg['__agg_target__'].sum() if agg_func == 'SUM' else grouped_obj_agg[
-                    '__agg_target__'].mean().fillna(0.0)
-
-            if agg_series is not None:
-                current_aggregates_map = {(k if isinstance(k, tuple) else (k,)): float(v) for k, v in
-                                          agg_series.items()}
-        else:
-            if agg_func == 'COUNT':
-                val = float(len(df) if agg_col in ['*', '1'] else df[agg_col].count())
+    # 청크 단위 검증(validate_chunks)에서는 청크별 부분 집계를 병합한 현재 값을 params로 전달받음
+    current_aggregates_map = params.get('_current_aggregates')
+    if current_aggregates_map is None:
+        current_aggregates_map = {}
+        if not df.empty:
+            if group_by_columns:
+                if not all(col in df.columns for col in group_by_columns):
+                    return [{'rule_type': 'aggregate_value_trend', 'error_type': 'CONFIG_ERROR',
+                             'message': f"group_by_columns 일부 컬럼 없음: {group_by_columns}"}]
+                df_grouped = df.copy()
+                for gb_col in group_by_columns:
+                    if gb_col in df_grouped.columns:
+                        df_grouped[gb_col] = _group_key_series(df_grouped[gb_col])
+
+                if agg_func == 'COUNT':
+                    agg_series = df_grouped.groupby(group_by_columns, observed=True, dropna=False).size()
+                else:
+                    if agg_col not in df.columns:
+                        return [{'rule_type': 'aggregate_value_trend', 'error_type': 'COLUMN_NOT_FOUND',
+                                 'message': f"컬럼 '{agg_col}' 없음"}]
+                    numeric_col = pd.to_numeric(df_grouped[agg_col], errors='coerce').fillna(0)
+                    df_grouped['__agg_target__'] = numeric_col
+                    grouped_obj_agg = df_grouped.groupby(group_by_columns, observed=True, dropna=False)
+                    agg_series = grouped_obj_agg['__agg_target__'].sum() if agg_func == 'SUM' else grouped_obj_agg[
+                        '__agg_target__'].mean().fillna(0.0)
+
+                if agg_series is not None:
+                    current_aggregates_map = {(k if isinstance(k, tuple) else (k,)): float(v) for k, v in
+                                              agg_series.items()}
             else:
-                if agg_col not in df.columns:
-                    return [{'rule_type': 'aggregate_value_trend', 'error_type': 'COLUMN_NOT_FOUND',
-                             'message': f"컬럼 '{agg_col}' 없음"}]
-                num_col = pd.to_numeric(df[agg_col], errors='coerce').fillna(0)
-                val = float(num_col.sum()) if agg_func == 'SUM' else (
-                    float(num_col.mean()) if not num_col.empty else 0.0)
-            current_aggregates_map['__overall__'] = val
+                if agg_func == 'COUNT':
+                    val = float(len(df) if agg_col in ['*', '1'] else df[agg_col].count())
+                else:
+                    if agg_col not in df.columns:
+                        return [{'rule_type': 'aggregate_value_trend', 'error_type': 'COLUMN_NOT_FOUND',
+                                 'message': f"컬럼 '{agg_col}' 없음"}]
+                    num_col = pd.to_numeric(df[agg_col], errors='coerce').fillna(0)
+                    val = float(num_col.sum()) if agg_func == 'SUM' else (
+                        float(num_col.mean()) if not num_col.empty else 0.0)
+                current_aggregates_map['__overall__'] = val
 
     final_hist_map = {}
     final_comp_label = "과거 기간 (조회 불가)"
@@ -710,24 +2523,23 @@ def check_aggregate_value_trend(df, params, q_processor=None):
             target_hist_p_str = _get_offset_date_str(base_offset, current_format_str=fmt_offset_in,
                                                      output_format_str=output_fmt, **offset_kwargs)
 
+            period_hist_maps = planned_hist_maps if planned_hist_maps is not None else _get_historical_period_aggregates(
+                q_processor, table, agg_col, agg_func, group_by_columns, date_col_db, date_fmt_db, is_part,
+                [target_hist_p_str], engine, hist_base_filter, local_df=local_history_df)
             if group_by_columns:
-                final_hist_map = _get_historical_grouped_aggregates(q_processor, table, agg_col, agg_func,
-                                                                    group_by_columns, date_col_db, date_fmt_db, is_part,
-                                                                    target_hist_p_str, engine, hist_base_filter)
+                final_hist_map = period_hist_maps.get(target_hist_p_str, {})
             else:
-                final_hist_map = {
-                    '__overall__': _get_historical_aggregate_value(q_processor, table, agg_col, agg_func, date_col_db,
-                                                                   date_fmt_db, is_part, target_hist_p_str, engine,
-                                                                   hist_base_filter)}
+                final_hist_map = {'__overall__': period_hist_maps.get(target_hist_p_str, {}).get('__overall__', 0.0)}
 
             final_comp_label = f"이전 {n_p}{'개월' if 'months' in comp_type else '일'}차 ({target_hist_p_str})"
         except ValueError as ve_off:
             print(f"경고: 과거 기간 문자열 생성 오류 ({ve_off}).")
 
-    # 'average' 타입인 경우 -> 기존의 for 루프 로직 사용
+    # 'average' 타입인 경우 -> n개 기간을 'GROUP BY 기간' 단일 쿼리로 조회한 뒤 기간별로 나누어 평균
     elif "average" in comp_type:
         tmp_hist_vals = {}
         actual_hist_labels = []
+        target_hist_periods = []
         for i in range(1, n_p + 1):
             target_hist_p_str = ""
             try:
@@ -740,14 +2552,19 @@ def check_aggregate_value_trend(df, params, q_processor=None):
             except ValueError as ve_off:
                 print(f"경고: 과거 기간 문자열 생성 오류 ({ve_off}). 건너뜀.")
                 continue
+            target_hist_periods.append(target_hist_p_str)
 
-            period_hist_data = _get_historical_grouped_aggregates(q_processor, table, agg_col, agg_func,
-                                                                  group_by_columns, date_col_db, date_fmt_db, is_part,
-                                                                  target_hist_p_str, engine,
-                                                                  hist_base_filter) if group_by_columns else {
-                '__overall__': _get_historical_aggregate_value(q_processor, table, agg_col, agg_func, date_col_db,
-                                                               date_fmt_db, is_part, target_hist_p_str, engine,
-                                                               hist_base_filter)}
+        if planned_hist_maps is not None:
+            period_hist_maps = planned_hist_maps
+        else:
+            period_hist_maps = _get_historical_period_aggregates(q_processor, table, agg_col, agg_func,
+                                                                 group_by_columns, date_col_db, date_fmt_db, is_part,
+                                                                 target_hist_periods, engine, hist_base_filter,
+                                                                 local_df=local_history_df) if target_hist_periods else {}
+        for target_hist_p_str in target_hist_periods:
+            # 그룹이 없으면 데이터가 없는 기간도 0으로 평균에 포함 (기존 기간별 개별 조회와 동일)
+            period_hist_data = period_hist_maps.get(target_hist_p_str, {}) if group_by_columns else {
+                '__overall__': period_hist_maps.get(target_hist_p_str, {}).get('__overall__', 0.0)}
 
             if period_hist_data:
                 if target_hist_p_str not in actual_hist_labels:
@@ -1029,6 +2846,41 @@ def check_schema_change(df_placeholder, params, q_processor=None):
     return errors
 
 
+def _detect_consecutive_trends(historical_trend_data_df, current_period_aggregates_map, latest_date,
+                               date_column, group_by_columns, trend_type, consecutive_periods, date_format):
+    """그룹별 기간 시계열에서 consecutive_periods개 연속 up/down 추세를 찾아 [(그룹키, 값 목록, 날짜 목록), ...]로 반환합니다."""
+    key_columns = list(group_by_columns) if group_by_columns else ['__trend_group__']
+    hist = historical_trend_data_df[[date_column, 'agg_value'] + (key_columns if group_by_columns else [])]
+    if not group_by_columns: hist = hist.assign(__trend_group__='__overall__')
+    # 최신 기간 행: 현재 데이터 그룹과 과거에만 있는 그룹 모두 (현재 데이터에 없으면 0)
+    latest_keys = pd.concat([pd.DataFrame(list(current_period_aggregates_map.keys()) if group_by_columns else [
+        ('__overall__',)], columns=key_columns, dtype=object), hist[key_columns].astype(object)],
+                            ignore_index=True).drop_duplicates(ignore_index=True)
+    latest_values = [current_period_aggregates_map.get(key if group_by_columns else '__overall__', 0.0) for key in
+                     latest_keys.itertuples(index=False, name=None)]
+    latest_rows = latest_keys.assign(**{date_column: latest_date, 'agg_value': latest_values})
+    combined = pd.concat([hist, latest_rows[hist.columns]], ignore_index=True).sort_values(
+        key_columns + [date_column], kind='mergesort', ignore_index=True)
+    group_ids = combined.groupby(key_columns, sort=False, dropna=False).ngroup().to_numpy()
+    values = combined['agg_value'].astype(float).to_numpy()
+    diffs = pd.Series(values).groupby(group_ids).diff().to_numpy()  # 그룹 첫 행은 NaN (추세 아님)
+    trend_match = diffs < 0 if trend_type == 'down' else diffs > 0
+    run_ids = np.cumsum(~trend_match)  # 비일치 행마다 새 런 시작 (그룹 경계의 첫 행도 비일치라 런이 그룹을 넘지 않음)
+    run_lengths = np.bincount(run_ids, weights=trend_match)[run_ids]
+    qualified = np.flatnonzero(trend_match & (run_lengths >= consecutive_periods - 1))
+    if not len(qualified): return []
+    trend_ends = pd.Series(qualified).groupby(group_ids[qualified]).max()  # 그룹별 가장 최근 충족 구간의 끝 위치
+    date_codes, unique_dates = pd.factorize(combined[date_column])
+    date_labels = pd.DatetimeIndex(unique_dates).strftime(date_format).to_numpy(dtype=object)[date_codes]
+    key_values = combined[key_columns].to_numpy(dtype=object)
+    results = []
+    for end_pos in trend_ends.to_numpy():
+        window = slice(end_pos - consecutive_periods + 1, end_pos + 1)
+        key = tuple(key_values[end_pos]) if group_by_columns else '__overall__'
+        results.append((key, values[window].tolist(), date_labels[window].tolist()))
+    return results
+
+
 def check_consecutive_trend(df, params, q_processor=None):
     errors = [];
     column_to_aggregate = params.get('column_to_aggregate');
@@ -1068,106 +2920,134 @@ def check_consecutive_trend(df, params, q_processor=None):
     strftime_format_for_output = '%Y%m%d' if date_column_format == 'YYYYMMDD' else '%Y%m'
     strftime_format_for_filter = '%Y%m%d' if date_column_format == 'YYYYMMDD' else '%Y%m'
 
-    try:
-        df_copy_for_date = df.copy();
-        if date_column_format == 'YYYYMM':  # YYYYMM이면 월의 1일로 변환하여 datetime 객체 생성
-            df_copy_for_date[date_column_for_trend] = pd.to_datetime(
-                df_copy_for_date[date_column_for_trend].astype(str) + '01', format='%Y%m%d', errors='coerce')
-        else:  # YYYYMMDD
-            df_copy_for_date[date_column_for_trend] = pd.to_datetime(
-                df_copy_for_date[date_column_for_trend].astype(str), format='%Y%m%d', errors='coerce')
-
-        df_original_dates = df_copy_for_date.dropna(subset=[date_column_for_trend])
-        if df_original_dates.empty: print(
+    current_trend_state = params.get('_current_trend_state')  # validate_chunks: (최신 날짜, 최신 기간 집계) 병합 결과
+    if current_trend_state is not None:
+        latest_date_in_current_df, current_period_aggregates_map = current_trend_state
+        if latest_date_in_current_df is None: print(
             f"정보: 규칙 '{params.get('rule_name', 'N/A')}' - 현재 데이터 비어 추세 분석 불가."); return errors
-        latest_date_in_current_df = df_original_dates[date_column_for_trend].max()  # datetime 객체
-    except Exception as e_date_conv:
-        errors.append(
-            {'error_type': 'DATA_PROCESSING_ERROR', 'message': f"현재 데이터 날짜 컬럼 변환 중 오류: {e_date_conv}"});
-        return errors
+    else:
+        try:
+            df_copy_for_date = df.copy();
+            if date_column_format == 'YYYYMM':  # YYYYMM이면 월의 1일로 변환하여 datetime 객체 생성
+                df_copy_for_date[date_column_for_trend] = pd.to_datetime(
+                    df_copy_for_date[date_column_for_trend].astype(str) + '01', format='%Y%m%d', errors='coerce')
+            else:  # YYYYMMDD
+                df_copy_for_date[date_column_for_trend] = pd.to_datetime(
+                    df_copy_for_date[date_column_for_trend].astype(str), format='%Y%m%d', errors='coerce')
+
+            df_original_dates = df_copy_for_date.dropna(subset=[date_column_for_trend])
+            if df_original_dates.empty: print(
+                f"정보: 규칙 '{params.get('rule_name', 'N/A')}' - 현재 데이터 비어 추세 분석 불가."); return errors
+            latest_date_in_current_df = df_original_dates[date_column_for_trend].max()  # datetime 객체
+        except Exception as e_date_conv:
+            errors.append(
+                {'error_type': 'DATA_PROCESSING_ERROR', 'message': f"현재 데이터 날짜 컬럼 변환 중 오류: {e_date_conv}"});
+            return errors
 
-    # 현재 DF의 가장 최신 날짜/월에 대한 집계값 계산
-    current_period_aggregates_map = {};
-    current_day_or_month_df_filtered = df_original_dates[
-        df_original_dates[date_column_for_trend] == latest_date_in_current_df]
+        # 현재 DF의 가장 최신 날짜/월에 대한 집계값 계산
+        current_period_aggregates_map = {};
+        current_day_or_month_df_filtered = df_original_dates[
+            df_original_dates[date_column_for_trend] == latest_date_in_current_df]
 
-    if current_day_or_month_df_filtered.empty and aggregate_function == 'COUNT':
-        if not group_by_columns: current_period_aggregates_map['__overall__'] = 0.0
-    elif not current_day_or_month_df_filtered.empty:
-        if group_by_columns:
-            if not all(col in current_day_or_month_df_filtered.columns for col in group_by_columns): errors.append(
-                {'error_type': 'CONFIG_ERROR', 'message': f"group_by_columns 일부 컬럼 없음"}); return errors
-            df_grouped_curr = current_day_or_month_df_filtered.copy()
-            for gb_col in group_by_columns:
-                if gb_col in df_grouped_curr.columns: df_grouped_curr[gb_col] = df_grouped_curr[gb_col].fillna(
-                    '__NONE_GROUP_KEY__').astype(str)
-            grouped_obj_curr = df_grouped_curr.groupby(group_by_columns, observed=True, dropna=False);
-            agg_series_curr = None
-            if aggregate_function == 'COUNT':
-                agg_series_curr = grouped_obj_curr.size() if column_to_aggregate in ['*', '1'] else grouped_obj_curr[
-                    column_to_aggregate].count()
-            elif column_to_aggregate not in df_grouped_curr.columns:
-                errors.append({'error_type': 'COLUMN_NOT_FOUND',
-                               'message': f"집계 대상 컬럼 '{column_to_aggregate}' 없음"});
-                return errors
-            else:
-                numeric_col_curr = pd.to_numeric(df_grouped_curr[column_to_aggregate], errors='coerce').fillna(0);
-                df_grouped_curr['__agg_target__'] = numeric_col_curr;
-                grouped_obj_curr_agg = df_grouped_curr.groupby(
-                    group_by_columns, observed=True, dropna=False);
-                agg_series_curr = grouped_obj_curr_agg[
-                    '__agg_target__'].sum() if aggregate_function == 'SUM' else grouped_obj_curr_agg[
-                    '__agg_target__'].mean().fillna(0.0)
-            if agg_series_curr is not None: current_period_aggregates_map = {
-                (k if isinstance(k, tuple) else (k,)): float(v) for k, v in agg_series_curr.items()}
-        else:
-            val_curr = 0.0
-            if aggregate_function == 'COUNT':
-                val_curr = float(len(current_day_or_month_df_filtered) if column_to_aggregate in ['*', '1'] else
-                                 current_day_or_month_df_filtered[column_to_aggregate].count())
-            elif column_to_aggregate not in current_day_or_month_df_filtered.columns:
-                errors.append({'error_type': 'COLUMN_NOT_FOUND',
-                               'message': f"집계 대상 컬럼 '{column_to_aggregate}' 없음"});
-                return errors
+        if current_day_or_month_df_filtered.empty and aggregate_function == 'COUNT':
+            if not group_by_columns: current_period_aggregates_map['__overall__'] = 0.0
+        elif not current_day_or_month_df_filtered.empty:
+            if group_by_columns:
+                if not all(col in current_day_or_month_df_filtered.columns for col in group_by_columns): errors.append(
+                    {'error_type': 'CONFIG_ERROR', 'message': f"group_by_columns 일부 컬럼 없음"}); return errors
+                df_grouped_curr = current_day_or_month_df_filtered.copy()
+                for gb_col in group_by_columns:
+                    if gb_col in df_grouped_curr.columns: df_grouped_curr[gb_col] = _group_key_series(
+                        df_grouped_curr[gb_col])
+                grouped_obj_curr = df_grouped_curr.groupby(group_by_columns, observed=True, dropna=False);
+                agg_series_curr = None
+                if aggregate_function == 'COUNT':
+                    agg_series_curr = grouped_obj_curr.size() if column_to_aggregate in ['*', '1'] else grouped_obj_curr[
+                        column_to_aggregate].count()
+                elif column_to_aggregate not in df_grouped_curr.columns:
+                    errors.append({'error_type': 'COLUMN_NOT_FOUND',
+                                   'message': f"집계 대상 컬럼 '{column_to_aggregate}' 없음"});
+                    return errors
+                else:
+                    numeric_col_curr = pd.to_numeric(df_grouped_curr[column_to_aggregate], errors='coerce').fillna(0);
+                    df_grouped_curr['__agg_target__'] = numeric_col_curr;
+                    grouped_obj_curr_agg = df_grouped_curr.groupby(
+                        group_by_columns, observed=True, dropna=False);
+                    agg_series_curr = grouped_obj_curr_agg[
+                        '__agg_target__'].sum() if aggregate_function == 'SUM' else grouped_obj_curr_agg[
+                        '__agg_target__'].mean().fillna(0.0)
+                if agg_series_curr is not None: current_period_aggregates_map = {
+                    (k if isinstance(k, tuple) else (k,)): float(v) for k, v in agg_series_curr.items()}
             else:
-                num_col_curr_no_grp = pd.to_numeric(current_day_or_month_df_filtered[column_to_aggregate],
-                                                    errors='coerce').fillna(0);
-                val_curr = float(
-                    num_col_curr_no_grp.sum()) if aggregate_function == 'SUM' else (
-                    float(num_col_curr_no_grp.mean()) if not num_col_curr_no_grp.empty else 0.0)
-            current_period_aggregates_map['__overall__'] = val_curr
-    elif not group_by_columns:
-        current_period_aggregates_map['__overall__'] = 0.0
-
-    # 과거 데이터 조회 기간 설정
-    if period_unit == 'months':
-        end_date_for_history = (latest_date_in_current_df.replace(day=1) - relativedelta(months=1))  # 전월의 1일
-        start_date_for_history = (end_date_for_history - relativedelta(
-            months=historical_lookback_periods - 1))  # lookback 기간만큼 이전 월의 1일
-    else:  # days
-        end_date_for_history = latest_date_in_current_df - timedelta(days=1)
-        start_date_for_history = end_date_for_history - timedelta(days=historical_lookback_periods - 1)
-
-    historical_filter_with_date = f"{date_column_for_trend} BETWEEN '{start_date_for_history.strftime(strftime_format_for_filter)}' AND '{end_date_for_history.strftime(strftime_format_for_filter)}'"
-    historical_filter_with_date = f"({historical_filter_with_date}) AND ({historical_base_filter})" if historical_base_filter and historical_base_filter != "1=1" else historical_filter_with_date
-
-    gb_cols_for_hist_query_list = [date_column_for_trend] + (group_by_columns if group_by_columns else []);
-    actual_agg_column_hist = '*' if aggregate_function.upper() == 'COUNT' and column_to_aggregate in ['*',
-                                                                                                      '1'] else column_to_aggregate;
-    agg_col_not_null_filter = f"AND {actual_agg_column_hist} IS NOT NULL" if aggregate_function.upper() != 'COUNT' or (
-            aggregate_function.upper() == 'COUNT' and actual_agg_column_hist not in ['*', '1']) else ""
-    historical_query = f"SELECT {', '.join(gb_cols_for_hist_query_list)}, {aggregate_function}({actual_agg_column_hist}) as agg_value FROM {historical_data_table} WHERE {historical_filter_with_date} {agg_col_not_null_filter} GROUP BY {', '.join(gb_cols_for_hist_query_list)} ORDER BY {', '.join(gb_cols_for_hist_query_list)}"
-    try:
-        historical_trend_data_df = q_processor.fetch_to_pandas(query=historical_query,
-                                                               engine=engine);
-        historical_trend_data_df = pd.DataFrame() if historical_trend_data_df is None or historical_trend_data_df.empty else historical_trend_data_df;
-        [
-            print(
-                f"정보: 규칙 '{params.get('rule_name', 'N/A')}' - 과거 DB 데이터 없음.")] if historical_trend_data_df.empty else None
-    except Exception as e_hist_fetch:
-        errors.append({'rule_type': 'consecutive_trend_check', 'error_type': 'DB_HISTORY_FETCH_ERROR',
-                       'message': f"과거 추세 데이터 조회 실패: {e_hist_fetch}"});
-        return errors
+                val_curr = 0.0
+                if aggregate_function == 'COUNT':
+                    val_curr = float(len(current_day_or_month_df_filtered) if column_to_aggregate in ['*', '1'] else
+                                     current_day_or_month_df_filtered[column_to_aggregate].count())
+                elif column_to_aggregate not in current_day_or_month_df_filtered.columns:
+                    errors.append({'error_type': 'COLUMN_NOT_FOUND',
+                                   'message': f"집계 대상 컬럼 '{column_to_aggregate}' 없음"});
+                    return errors
+                else:
+                    num_col_curr_no_grp = pd.to_numeric(current_day_or_month_df_filtered[column_to_aggregate],
+                                                        errors='coerce').fillna(0);
+                    val_curr = float(
+                        num_col_curr_no_grp.sum()) if aggregate_function == 'SUM' else (
+                        float(num_col_curr_no_grp.mean()) if not num_col_curr_no_grp.empty else 0.0)
+                current_period_aggregates_map['__overall__'] = val_curr
+        elif not group_by_columns:
+            current_period_aggregates_map['__overall__'] = 0.0
+
+    if (period_unit, date_column_format) in [('days', 'YYYYMMDD'), ('months', 'YYYYMM')]:
+        # 기간 단위와 날짜 형식이 일치하면 기간별 집계 공통 경로로 조회 (과거 조회 플래너의 병합 조회 결과 재사용)
+        history_periods = _get_consecutive_history_periods(latest_date_in_current_df, period_unit,
+                                                           historical_lookback_periods)
+        try:
+            period_hist_maps = params.get('_planned_historical_aggregates')
+            if period_hist_maps is None:
+                period_hist_maps = _get_historical_period_aggregates(q_processor, historical_data_table,
+                                                                     column_to_aggregate, aggregate_function,
+                                                                     group_by_columns, date_column_for_trend,
+                                                                     date_column_format, False, history_periods,
+                                                                     engine, historical_base_filter or '1=1',
+                                                                     raise_errors=True,
+                                                                     local_df=params.get('_local_history_frame'))
+            historical_trend_data_df = _period_aggregates_to_frame(period_hist_maps, date_column_for_trend,
+                                                                   group_by_columns)
+            [print(f"정보: 규칙 '{params.get('rule_name', 'N/A')}' - 과거 DB 데이터 없음.")] if historical_trend_data_df.empty else None
+        except Exception as e_hist_fetch:
+            errors.append({'rule_type': 'consecutive_trend_check', 'error_type': 'DB_HISTORY_FETCH_ERROR',
+                           'message': f"과거 추세 데이터 조회 실패: {e_hist_fetch}"});
+            return errors
+    else:
+        # 과거 데이터 조회 기간 설정
+        if period_unit == 'months':
+            end_date_for_history = (latest_date_in_current_df.replace(day=1) - relativedelta(months=1))  # 전월의 1일
+            start_date_for_history = (end_date_for_history - relativedelta(
+                months=historical_lookback_periods - 1))  # lookback 기간만큼 이전 월의 1일
+        else:  # days
+            end_date_for_history = latest_date_in_current_df - timedelta(days=1)
+            start_date_for_history = end_date_for_history - timedelta(days=historical_lookback_periods - 1)
+
+        historical_filter_with_date = f"{date_column_for_trend} BETWEEN '{start_date_for_history.strftime(strftime_format_for_filter)}' AND '{end_date_for_history.strftime(strftime_format_for_filter)}'"
+        historical_filter_with_date = f"({historical_filter_with_date}) AND ({historical_base_filter})" if historical_base_filter and historical_base_filter != "1=1" else historical_filter_with_date
+
+        gb_cols_for_hist_query_list = [date_column_for_trend] + (group_by_columns if group_by_columns else []);
+        actual_agg_column_hist = '*' if aggregate_function.upper() == 'COUNT' and column_to_aggregate in ['*',
+                                                                                                          '1'] else column_to_aggregate;
+        agg_col_not_null_filter = f"AND {actual_agg_column_hist} IS NOT NULL" if aggregate_function.upper() != 'COUNT' or (
+                aggregate_function.upper() == 'COUNT' and actual_agg_column_hist not in ['*', '1']) else ""
+        historical_query = f"SELECT {', '.join(gb_cols_for_hist_query_list)}, {aggregate_function}({actual_agg_column_hist}) as agg_value FROM {historical_data_table} WHERE {historical_filter_with_date} {agg_col_not_null_filter} GROUP BY {', '.join(gb_cols_for_hist_query_list)} ORDER BY {', '.join(gb_cols_for_hist_query_list)}"
+        try:
+            historical_trend_data_df = q_processor.fetch_to_pandas(query=historical_query,
+                                                                   engine=engine);
+            historical_trend_data_df = pd.DataFrame() if historical_trend_data_df is None or historical_trend_data_df.empty else historical_trend_data_df;
+            [
+                print(
+                    f"정보: 규칙 '{params.get('rule_name', 'N/A')}' - 과거 DB 데이터 없음.")] if historical_trend_data_df.empty else None
+        except Exception as e_hist_fetch:
+            errors.append({'rule_type': 'consecutive_trend_check', 'error_type': 'DB_HISTORY_FETCH_ERROR',
+                           'message': f"과거 추세 데이터 조회 실패: {e_hist_fetch}"});
+            return errors
 
     if not historical_trend_data_df.empty:
         try:
@@ -1191,89 +3071,35 @@ def check_consecutive_trend(df, params, q_processor=None):
                            'message': f"과거 데이터 변환 중 오류: {e_hist_conv}"});
             return errors
 
-    all_relevant_groups = set(current_period_aggregates_map.keys())
-    if group_by_columns and not historical_trend_data_df.empty:
-        all_relevant_groups.update(set(tuple(row[g] for g in group_by_columns) for _, row in
-                                       historical_trend_data_df[group_by_columns].drop_duplicates().iterrows()))
-    elif not group_by_columns:
-        all_relevant_groups.add('__overall__')
-
-    for group_key_tuple_or_overall in all_relevant_groups:
-        latest_agg_value = current_period_aggregates_map.get(group_key_tuple_or_overall, 0.0);
-        group_hist_df = pd.DataFrame()
-        if not historical_trend_data_df.empty:
-            if group_by_columns and group_key_tuple_or_overall != '__overall__':
-                if not (isinstance(group_key_tuple_or_overall, tuple) and len(group_key_tuple_or_overall) == len(
-                        group_by_columns) and all(
-                    g in historical_trend_data_df.columns for g in group_by_columns)): continue
-                group_filter = pd.Series([True] * len(historical_trend_data_df))
-                for i, col_n_g in enumerate(group_by_columns): group_filter = group_filter & (
-                        historical_trend_data_df[col_n_g] == group_key_tuple_or_overall[i])
-                group_hist_df = historical_trend_data_df[group_filter]
-            elif not group_by_columns and group_key_tuple_or_overall == '__overall__':
-                group_hist_df = historical_trend_data_df
-
-        latest_row_dict = {date_column_for_trend: latest_date_in_current_df, 'agg_value': latest_agg_value}
-        if group_by_columns and group_key_tuple_or_overall != '__overall__':
-            for i, col_n_g in enumerate(group_by_columns): latest_row_dict[col_n_g] = group_key_tuple_or_overall[i]
-
-        combined_series_df = pd.concat([group_hist_df, pd.DataFrame([latest_row_dict])],
-                                       ignore_index=True) if not group_hist_df.empty else pd.DataFrame(
-            [latest_row_dict]);
-        time_series = combined_series_df.sort_values(by=date_column_for_trend)['agg_value'].tolist()
-        if len(time_series) < consecutive_periods: continue
-
-        consecutive_count = 0;
-        actual_trend_start_idx_in_ts = -1
-        for k in range(len(time_series) - 1, 0, -1):
-            current_val_ts, previous_val_ts = time_series[k], time_series[k - 1];
-            trend_match = (trend_type == 'down' and current_val_ts < previous_val_ts) or (
-                    trend_type == 'up' and current_val_ts > previous_val_ts)
-            if trend_match:
-                if consecutive_count == 0: actual_trend_start_idx_in_ts = k
-                consecutive_count += 1
-                if consecutive_count >= (consecutive_periods - 1):
-                    trend_start_idx_slice = actual_trend_start_idx_in_ts - consecutive_count;
-                    trend_vals_slice = time_series[trend_start_idx_slice: actual_trend_start_idx_in_ts + 1];
-                    trend_dates_dt_obj = combined_series_df.sort_values(by=date_column_for_trend).iloc[
-                                         trend_start_idx_slice: actual_trend_start_idx_in_ts + 1][date_column_for_trend]
-                    trend_dates_slice = trend_dates_dt_obj.dt.strftime(
-                        strftime_format_for_output).tolist()  # MODIFIED: 출력 형식 사용
-                    msg_fmt = {'column_to_aggregate': column_to_aggregate, 'aggregate_function': aggregate_function,
-                               'consecutive_periods_detected': consecutive_count + 1, 'period_unit': period_unit,
-                               'trend_type': trend_type, 'trend_values': str(trend_vals_slice),
-                               'trend_dates_first': trend_dates_slice[0] if trend_dates_slice else '',
-                               'trend_dates_last': trend_dates_slice[-1] if trend_dates_slice else '',
-                               'latest_value': trend_vals_slice[-1] if trend_vals_slice else 0.0}
-                    base_msg_tmpl = params.get('message',
-                                               "컬럼 '{column_to_aggregate}'의 {aggregate_function} 값이 {consecutive_periods_detected}{period_unit_label} 연속 {trend_type} 추세. 최근값: {latest_value}, 기간: {trend_dates_first} ~ {trend_dates_last}, 값: {trend_values}")
-                    msg_fmt['period_unit_label'] = "개월" if period_unit == "months" else "일"  # 메시지용 레이블 추가
-
-                    err_dtl = {'column': column_to_aggregate, 'function': aggregate_function, 'trend_type': trend_type,
-                               'consecutive_periods_detected': consecutive_count + 1, 'trend_values': trend_vals_slice,
-                               'trend_dates': trend_dates_slice, 'error_type': 'CONSECUTIVE_TREND_DETECTED'}
-                    if group_by_columns and group_key_tuple_or_overall != '__overall__':
-                        err_dtl['group_key'] = str(group_key_tuple_or_overall);
-                        msg_fmt['group_key_str'] = str(
-                            group_key_tuple_or_overall);
-                        err_dtl['message'] = (
-                                f"그룹 {str(group_key_tuple_or_overall)}의 " + base_msg_tmpl.format(
-                            **msg_fmt)) if "{group_key_str}" not in base_msg_tmpl else base_msg_tmpl.format(
-                            **msg_fmt)
-                    else:
-                        err_dtl['message'] = base_msg_tmpl.format(**msg_fmt)
-                    errors.append(err_dtl);
-                    break
-            else:
-                consecutive_count = 0;
-                actual_trend_start_idx_in_ts = -1
+    if historical_trend_data_df.empty: return errors  # 최신 기간 값 1개만으로는 연속 추세 판정 불가
+    if group_by_columns and not all(g in historical_trend_data_df.columns for g in group_by_columns): return errors
+    base_msg_tmpl = params.get('message',
+                               "컬럼 '{column_to_aggregate}'의 {aggregate_function} 값이 {consecutive_periods_detected}{period_unit_label} 연속 {trend_type} 추세. 최근값: {latest_value}, 기간: {trend_dates_first} ~ {trend_dates_last}, 값: {trend_values}")
+    for group_key, trend_vals_slice, trend_dates_slice in _detect_consecutive_trends(
+            historical_trend_data_df, current_period_aggregates_map, latest_date_in_current_df, date_column_for_trend,
+            group_by_columns, trend_type, consecutive_periods, strftime_format_for_output):
+        msg_fmt = {'column_to_aggregate': column_to_aggregate, 'aggregate_function': aggregate_function,
+                   'consecutive_periods_detected': consecutive_periods, 'period_unit': period_unit,
+                   'trend_type': trend_type, 'trend_values': str(trend_vals_slice),
+                   'trend_dates_first': trend_dates_slice[0], 'trend_dates_last': trend_dates_slice[-1],
+                   'latest_value': trend_vals_slice[-1],
+                   'period_unit_label': "개월" if period_unit == "months" else "일"}  # 메시지용 레이블 추가
+        err_dtl = {'column': column_to_aggregate, 'function': aggregate_function, 'trend_type': trend_type,
+                   'consecutive_periods_detected': consecutive_periods, 'trend_values': trend_vals_slice,
+                   'trend_dates': trend_dates_slice, 'error_type': 'CONSECUTIVE_TREND_DETECTED'}
+        if group_by_columns:
+            err_dtl['group_key'] = str(group_key);
+            msg_fmt['group_key_str'] = str(group_key);
+            err_dtl['message'] = (f"그룹 {str(group_key)}의 " + base_msg_tmpl.format(
+                **msg_fmt)) if "{group_key_str}" not in base_msg_tmpl else base_msg_tmpl.format(**msg_fmt)
+        else:
+            err_dtl['message'] = base_msg_tmpl.format(**msg_fmt)
+        errors.append(err_dtl)
     return errors
 
 
-def check_conditional(df, params, disable_tqdm=True):
-    """
-    조건부 규칙을 검증합니다. if_condition이 True일 때, then_condition도 True여야 합니다.
-    """
+def check_conditional(df, params, disable_tqdm=True, lazy_row_data=False):
+    """if_condition이 True인 행은 then_condition도 True여야 합니다 (lazy_row_data=True이면 row_index만 기록)."""
     errors = []
     if_condition = params.get('if_condition')
     then_condition = params.get('then_condition')
@@ -1287,7 +3113,7 @@ def check_conditional(df, params, disable_tqdm=True):
 
     try:
         # if_condition을 만족하는 모든 행을 찾습니다.
-        if_true_df = df.query(if_condition)
+        if_true_df = params['_if_condition_frame'] if '_if_condition_frame' in params else df.query(if_condition)
 
         if not if_true_df.empty:
             # 그 중에서 then_condition을 만족하지 못하는 행을 찾습니다.
@@ -1297,14 +3123,24 @@ def check_conditional(df, params, disable_tqdm=True):
             if not expected_outcome:
                 violating_df = if_true_df.query(then_condition)
 
-            for idx, row_series in violating_df.iterrows():
-                errors.append({
-                    'row_index': idx,
-                    'error_type': 'CONDITIONAL_CHECK_VIOLATION',
-                    'rule_type': 'conditional_check',
-                    'message': msg_template.format(if_cond=if_condition, then_cond=then_condition),
-                    'error_row_data': row_series.to_dict()
-                })
+            message = msg_template.format(if_cond=if_condition, then_cond=then_condition)
+            if lazy_row_data:
+                for idx in violating_df.index:
+                    errors.append({
+                        'row_index': idx,
+                        'error_type': 'CONDITIONAL_CHECK_VIOLATION',
+                        'rule_type': 'conditional_check',
+                        'message': message
+                    })
+            else:
+                for idx, row_series in violating_df.iterrows():
+                    errors.append({
+                        'row_index': idx,
+                        'error_type': 'CONDITIONAL_CHECK_VIOLATION',
+                        'rule_type': 'conditional_check',
+                        'message': message,
+                        'error_row_data': row_series.to_dict()
+                    })
 
     except Exception as e:
         errors.append({'error_type': 'QUERY_EXECUTION_ERROR', 'message': f"조건부 규칙 실행 중 오류 발생: {e}"})
@@ -1312,10 +3148,953 @@ def check_conditional(df, params, disable_tqdm=True):
     return errors
 
 
+# ----- 청크 단위 검증(DataValidator.validate_chunks)용 병합 가능한 누적기 -----
+def _current_aggregate_partials(df, agg_col, agg_func, group_by_columns, grouped_count_non_null=False):
+    """현재 데이터의 (그룹별) 집계 부분값 {그룹키: [값, 행 수]}을 계산합니다 (청크 간 병합용, 컬럼이 없으면 None)."""
+    if df.empty: return {}
+    use_non_null_count = agg_func == 'COUNT' and agg_col not in ['*', '1'] and (
+            grouped_count_non_null or not group_by_columns)
+    if (agg_func != 'COUNT' or use_non_null_count) and agg_col not in df.columns: return None
+    if agg_func != 'COUNT':
+        values = pd.to_numeric(df[agg_col], errors='coerce').fillna(0)
+    elif use_non_null_count:
+        values = df[agg_col].notna().astype(np.int64)
+    else:
+        values = pd.Series(1, index=df.index, dtype=np.int64)
+    if not group_by_columns:
+        return {'__overall__': [float(values.sum()), len(df)]}
+    if not all(col in df.columns for col in group_by_columns): return None
+    keys = [_group_key_series(df[gb_col]) for gb_col in group_by_columns]
+    grouped = pd.DataFrame({'__v__': values, '__n__': 1}, index=df.index).groupby(keys, observed=True,
+                                                                                  dropna=False).sum()
+    return {(k if isinstance(k, tuple) else (k,)): [float(v), int(n)] for k, v, n in
+            zip(grouped.index, grouped['__v__'].tolist(), grouped['__n__'].tolist())}
+
+
+def _merge_aggregate_partials(target, partials):
+    for key, (value, rows) in partials.items():
+        acc = target.setdefault(key, [0.0, 0])
+        acc[0] += value
+        acc[1] += rows
+
+
+def _finalize_aggregate_partials(partials, agg_func):
+    """병합된 부분값을 check_aggregate_value_trend/check_consecutive_trend의 현재 집계 map으로 만듭니다 (그룹키 정렬 순서)."""
+    return {key: (float(value / rows) if rows else 0.0) if agg_func == 'AVG' else float(value)
+            for key, (value, rows) in sorted(partials.items(), key=lambda kv: (kv[0] == '__overall__', kv[0]))}
+
+
+def _parse_trend_dates(series, date_column_format):
+    return pd.to_datetime(series.astype(str) + ('01' if date_column_format == 'YYYYMM' else ''), format='%Y%m%d',
+                          errors='coerce')
+
+
+class _FrequencyAccumulator:
+    """check_distribution_change의 현재 분포(값별 건수/NULL 건수/전체 건수)를 청크별로 누적합니다."""
+
+    def __init__(self):
+        self.counts = None
+        self.count = 0
+        self.null_count = 0
+
+    def update(self, series):
+        if series is None or series.empty: return
+        value_counts = series.astype(str).value_counts(dropna=False, sort=False)
+        self.counts = value_counts if self.counts is None else self.counts.add(value_counts, fill_value=0)
+        self.count += len(series)
+        self.null_count += int(series.isnull().sum())
+
+    def profile(self):
+        if self.counts is None or self.count == 0:
+            return {'unique_codes': [], 'frequencies': {}, 'total_unique_count': 0, 'count': 0, 'null_count': 0}
+        vc = self.counts.astype(np.int64).sort_values(ascending=False, kind='stable')
+        return {'unique_codes': [str(code) for code in vc.index],
+                'frequencies': {str(k): v / self.count for k, v in vc.items()},
+                'total_unique_count': len(vc), 'count': self.count, 'null_count': self.null_count}
+
+
+class _DuplicateRowTracker:
+    """duplicate_rows의 청크 간 중복 판정기 (청크별 행 해시와 인덱스를 보관하고 마지막에 해시 후보 행만 키 값으로 확인)."""
+
+    def __init__(self, keep_key_values=False):
+        self.chunk_no = 0
+        self.hashes, self.row_index, self.chunk_nos, self.positions = [], [], [], []
+        self.subset, self.msg_template, self.report_each_row, self.max_indices = None, None, False, None
+        self.keep_key_values = keep_key_values  # 청크를 다시 읽을 수 없으면 키 컬럼 값을 보관
+        self.key_frames = []
+        self._flagged = None
+
+    def add(self, df_for_dup_check, subset, msg_template, report_each_row=False, max_indices=None):
+        self.subset, self.msg_template = subset, msg_template
+        self.report_each_row, self.max_indices = report_each_row, max_indices
+        self.hashes.append(_chunk_duplicate_row_hashes(df_for_dup_check))
+        self.row_index.append(df_for_dup_check.index)
+        self.chunk_nos.append(np.full(len(df_for_dup_check), self.chunk_no, dtype=np.int64))
+        self.positions.append(np.arange(len(df_for_dup_check), dtype=np.int64))
+        if self.keep_key_values: self.key_frames.append((self.chunk_no, df_for_dup_check))
+
+    def candidates(self):
+        """해시가 겹치는 후보 행의 {청크 번호: 청크 내 위치 배열} (청크 번호 순서 = 전체 행 순서)"""
+        if not self.hashes: return {}
+        if self._flagged is None:
+            self._flagged = np.flatnonzero(pd.Series(np.concatenate(self.hashes)).duplicated(keep=False).to_numpy())
+        chunk_nos, positions = np.concatenate(self.chunk_nos)[self._flagged], np.concatenate(self.positions)[self._flagged]
+        return {chunk_no: positions[chunk_nos == chunk_no] for chunk_no in pd.unique(chunk_nos).tolist()}
+
+    def finalize(self, candidate_rows=None):
+        """
+        candidate_rows: candidates() 순서의 청크별 후보 행 DataFrame 목록 (None이면 보관한 키 값 사용)
+        반환: (오류 dict 목록, 오류별 대표 행의 후보 행 내 위치 배열)
+        """
+        candidates = self.candidates()
+        if not candidates: return [], np.array([], dtype=np.int64)
+        if candidate_rows is None:
+            key_frames = dict(self.key_frames)
+            key_parts = [key_frames[chunk_no].iloc[positions] for chunk_no, positions in candidates.items()]
+        else:
+            key_parts = [rows[self.subset] if self.subset else rows for rows in candidate_rows]
+        candidate_keys = pd.concat([_duplicate_key_text(part) for part in key_parts], ignore_index=True)
+        groups = _confirmed_duplicate_groups(np.concatenate(self.hashes)[self._flagged], candidate_keys)
+        row_index = self.row_index[0].append(self.row_index[1:]) if len(self.row_index) > 1 else self.row_index[0]
+        row_index = row_index[self._flagged]
+        errors = []
+        if self.report_each_row:
+            error_rows = np.sort(np.concatenate(groups)) if groups else np.array([], dtype=np.int64)
+            for idx in row_index[error_rows].tolist():
+                errors.append({'columns': self.subset or 'all', 'row_index': idx, 'error_type': 'DUPLICATE_ROW',
+                               'message': self.msg_template.format(row_index=idx,
+                                                                   checked_columns=self.subset or '모든 컬럼')})
+            return errors, error_rows
+        for members in groups:
+            errors.append(_duplicate_group_error(row_index[members].tolist(), self.subset, self.msg_template,
+                                                 self.max_indices))
+        return errors, np.array([members[0] for members in groups], dtype=np.int64)
+
+
+class _ChunkFilterStub:
+    """validate_chunks 마지막 단계용 FilterMaskCache 대체: 필터 식별 대표 행(또는 필터 오류)만 돌려줍니다."""
+
+    def __init__(self, frames):
+        self.frames = frames  # 필터 식 -> 대표 행 DataFrame 또는 예외
+
+    def frame(self, expr, base_expr=''):
+        result = self.frames[expr]
+        if isinstance(result, Exception): raise result
+        return result
+
+
+class _RunQueryMemo:
+    """한 번의 validate_chunks 실행 동안 같은 과거 조회를 청크마다 반복하지 않도록 결과를 메모리에 보관합니다."""
+
+    def __init__(self, q_processor):
+        self.q_processor = q_processor
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name == 'q_processor': raise AttributeError(name)
+        return getattr(self.q_processor, name)
+
+    def fetch_to_pandas(self, query, engine=None, limit=None, **kwargs):
+        key = (query, engine, limit)
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = self.q_processor.fetch_to_pandas(query=query, engine=engine, limit=limit,
+                                                                       **kwargs)
+            result_df = self._results[key]
+        return result_df.copy() if isinstance(result_df, pd.DataFrame) else result_df
+
+
+class _RuleQueryMeter:
+    """QueryProcessor 프록시: 조회 수와 DB 조회 시간(잠금 대기 제외)을 현재 스레드의 규칙(measure())과 totals에 기록합니다."""
+
+    def __init__(self, q_processor, hooks=None):
+        self.q_processor = q_processor
+        self.hooks = hooks if hooks is not None else []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.totals = {'db_query_count': 0, 'db_fetch_seconds': 0.0}
+
+    def __getattr__(self, name):
+        if name in ('q_processor', 'hooks', '_local', '_lock', 'totals'): raise AttributeError(name)
+        return getattr(self.q_processor, name)
+
+    @contextlib.contextmanager
+    def measure(self, rule_info=None):
+        metrics = {'db_query_count': 0, 'db_fetch_seconds': 0.0}
+        previous = (getattr(self._local, 'metrics', None), getattr(self._local, 'rule_info', None))
+        self._local.metrics, self._local.rule_info = metrics, rule_info
+        try:
+            yield metrics
+        finally:
+            self._local.metrics, self._local.rule_info = previous
+
+    def _timed_call(self, method_name, *args, **kwargs):
+        query_info = None
+        if self.hooks:
+            rule_info = getattr(self._local, 'rule_info', None) or {}
+            query_info = {'method': method_name,
+                          'query': kwargs.get('query', kwargs.get('table_name', args[0] if args else None)),
+                          'engine': kwargs.get('engine', args[1] if len(args) > 1 else None),
+                          'rule_name': rule_info.get('rule_name'), 'rule_type': rule_info.get('rule_type')}
+            _dispatch_hooks(self.hooks, 'on_query_start', query_info)
+        previous_fetch_seconds = getattr(_db_fetch_timing, 'fetch_seconds', None)
+        _db_fetch_timing.fetch_seconds = fetch_seconds = []
+        start_time = time.perf_counter()
+        query_exc = None
+        try:
+            return getattr(self.q_processor, method_name)(*args, **kwargs)
+        except Exception as e:
+            query_exc = e
+            raise
+        finally:
+            elapsed_seconds = time.perf_counter() - start_time
+            _db_fetch_timing.fetch_seconds = previous_fetch_seconds
+            db_fetch_seconds = sum(fetch_seconds) if fetch_seconds else elapsed_seconds
+            if query_info is not None: _dispatch_hooks(self.hooks, 'on_query_end', query_info, elapsed_seconds, query_exc)
+            metrics = getattr(self._local, 'metrics', None)
+            if metrics is not None:
+                metrics['db_query_count'] += 1
+                metrics['db_fetch_seconds'] += db_fetch_seconds
+            with self._lock:
+                self.totals['db_query_count'] += 1
+                self.totals['db_fetch_seconds'] += db_fetch_seconds
+
+    def fetch_to_pandas(self, *args, **kwargs):
+        return self._timed_call('fetch_to_pandas', *args, **kwargs)
+
+    def describe_table(self, *args, **kwargs):
+        return self._timed_call('describe_table', *args, **kwargs)
+
+
+# ----- push-down 검증(DataValidator.validate_pushdown)용 SQL 변환 -----
+def _sql_literal(value):
+    if value is None: return 'NULL'
+    if isinstance(value, (bool, np.bool_)): return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, np.integer)): return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        if not np.isfinite(value): raise ValueError(f"SQL 리터럴로 변환할 수 없는 값: {value}")
+        return repr(float(value))
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _pandas_expr_to_sql(expr, columns=None):
+    """DataFrame.query 조건식을 SQL 조건식으로 옮깁니다 (비교/논리/in 연산과 리터럴만 지원, 그 외는 ValueError)."""
+    keywords = {'and': 'AND', 'or': 'OR', 'not': 'NOT', 'in': 'IN', 'True': 'TRUE', 'False': 'FALSE'}
+    operators = {'==': '=', '!=': '<>', '&': 'AND', '|': 'OR', '~': 'NOT', '[': '(', ']': ')', '(': '(', ')': ')',
+                 ',': ',', '<': '<', '>': '>', '<=': '<=', '>=': '>=', '+': '+', '-': '-', '*': '*', '/': '/'}
+    sql_parts = []
+    try:
+        ast.parse(expr.strip(), mode='eval')
+        tokens = list(tokenize.generate_tokens(io.StringIO(expr.strip()).readline))
+    except (tokenize.TokenError, SyntaxError) as e:
+        raise ValueError(f"조건식 해석 실패: {expr} ({e})")
+    for tok_pos, tok in enumerate(tokens):
+        if tok.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER, tokenize.INDENT, tokenize.DEDENT): continue
+        if tok.type == tokenize.STRING:
+            sql_parts.append(_sql_literal(ast.literal_eval(tok.string)))
+        elif tok.type == tokenize.NUMBER:
+            sql_parts.append(tok.string)
+        elif tok.type == tokenize.NAME:
+            is_function = tok_pos + 1 < len(tokens) and tokens[tok_pos + 1].string == '('
+            if columns is not None and tok.string not in keywords and not is_function and tok.string not in columns:
+                raise ValueError(f"name '{tok.string}' is not defined")
+            sql_parts.append(keywords.get(tok.string, tok.string))
+        elif tok.type == tokenize.OP and tok.string in operators:
+            sql_parts.append(operators[tok.string])
+        else:
+            raise ValueError(f"SQL로 변환할 수 없는 구문 '{tok.string}': {expr}")
+    return ' '.join(sql_parts)
+
+
+def _rule_condition_sql(params, key, columns=None):
+    """params[key + '_sql']가 있으면 그대로, 없으면 params[key](pandas 조건식)를 변환해 사용합니다."""
+    if params.get(f'{key}_sql'): return params[f'{key}_sql']
+    return _pandas_expr_to_sql(params[key], columns) if params.get(key) else ''
+
+
+def _compile_pushdown_rule(rule_type, col_name, params, table_columns):
+    """행 단위 규칙을 (검사 대상 조건, [(오류 유형, 위반 조건), ...], 윈도 집계 컬럼 또는 None) SQL로 만듭니다."""
+    if rule_type == 'not_null':
+        return '1=1', [('NOT_NULL', f"{col_name} IS NULL")], None
+    if rule_type == 'regex_pattern':
+        if not params.get('pattern'): raise ValueError("정규식 패턴 필요")
+        regex_literal = _sql_literal(f"^(?:{params['pattern']})" + ('$' if params.get('full_match') else ''))
+        return f"{col_name} IS NOT NULL", [
+            ('REGEX_MISMATCH', f"{col_name} IS NOT NULL AND NOT (CAST({col_name} AS STRING) RLIKE {regex_literal})")], None
+    if rule_type == 'allowed_values':
+        if not params.get('values'): raise ValueError("허용 값 목록 필요")
+        value_list = ', '.join(_sql_literal(v) for v in params['values'])
+        return f"{col_name} IS NOT NULL", [('INVALID_VALUE', f"{col_name} IS NOT NULL AND {col_name} NOT IN ({value_list})")], None
+    if rule_type == 'numeric_range':
+        num_expr = f"CAST({col_name} AS DOUBLE)"
+        range_conditions = ([f"{num_expr} < {_sql_literal(params['min'])}"] if params.get('min') is not None else []) + (
+            [f"{num_expr} > {_sql_literal(params['max'])}"] if params.get('max') is not None else [])
+        violations = [('NOT_NUMERIC', f"{col_name} IS NOT NULL AND {num_expr} IS NULL")]
+        if range_conditions: violations.append(('OUT_OF_RANGE', '(' + ' OR '.join(range_conditions) + ')'))
+        return '1=1', violations, None
+    if rule_type == 'column_equality':
+        col1, col2 = params.get('column1'), params.get('column2')
+        if not all([col1, col2, col1 in table_columns, col2 in table_columns]):
+            raise ValueError(f'컬럼 설정 오류: {col1}, {col2}')
+        def string_expr(col):
+            expr = f"CAST({col} AS STRING)"
+            if params.get('trim_strings'): expr = f"TRIM({expr})"
+            return f"LOWER({expr})" if params.get('case_insensitive') else expr
+
+        mismatch_sql = (f"COALESCE({string_expr(col1)}, '__NONE_PLACEHOLDER__') <> "
+                        f"COALESCE({string_expr(col2)}, '__NONE_PLACEHOLDER__')")
+        if params.get('numeric_tolerance') is not None:
+            num1, num2 = f"CAST({col1} AS DOUBLE)", f"CAST({col2} AS DOUBLE)"
+            mismatch_sql = (f"(CASE WHEN {num1} IS NOT NULL AND {num2} IS NOT NULL "
+                            f"THEN ABS({num1} - {num2}) > {float(params['numeric_tolerance'])} ELSE {mismatch_sql} END)")
+        if not params.get('null_equals_null', True):
+            mismatch_sql = f"({col1} IS NULL OR {col2} IS NULL OR {mismatch_sql})"
+        return '1=1', [('COLUMN_MISMATCH', mismatch_sql)], None
+    if rule_type == 'duplicate_rows':
+        subset = params.get('subset_columns')
+        if not subset or not all(col in table_columns for col in subset): subset = list(table_columns)
+        return '1=1', [('DUPLICATE_ROW', '{window_alias} > 1')], subset
+    if rule_type == 'conditional_check':
+        if not params.get('if_condition') or not params.get('then_condition'):
+            raise ValueError("'if_condition'과 'then_condition' 파라미터는 필수입니다.")
+        if_sql = _rule_condition_sql(params, 'if_condition', table_columns)
+        then_sql = _rule_condition_sql(params, 'then_condition', table_columns)
+        then_check = f"COALESCE(({then_sql}), FALSE)"
+        return if_sql, [('CONDITIONAL_CHECK_VIOLATION', f"({if_sql}) AND " + (
+            f"NOT {then_check}" if params.get('expected_outcome', True) else then_check))], None
+    return None
+
+
+def _current_aggregates_from_sql(q_processor, table, where_sql, agg_col, agg_func, group_by_columns, engine):
+    """aggregate_value_trend/total_row_count_trend의 현재 집계값을 DB에서 계산해 check 함수의 현재 집계 map 형태로 반환합니다."""
+    if agg_func == 'COUNT':
+        agg_expr = 'COUNT(1)' if group_by_columns or agg_col in ['*', '1'] else f"COUNT({agg_col})"
+    else:
+        agg_expr = f"{agg_func}(COALESCE(CAST({agg_col} AS DOUBLE), 0))"
+    group_exprs = [f"COALESCE(CAST({gb_col} AS STRING), '__NONE_GROUP_KEY__')" for gb_col in group_by_columns or []]
+    select_exprs = [f"{expr} AS gb_{i}" for i, expr in enumerate(group_exprs)] + [f"{agg_expr} AS agg_value",
+                                                                                  "COUNT(1) AS row_count"]
+    query = f"SELECT {', '.join(select_exprs)} FROM {table} WHERE {where_sql}" + (
+        f" GROUP BY {', '.join(group_exprs)}" if group_exprs else '')
+    result_df = q_processor.fetch_to_pandas(query=query, engine=engine, limit=None)
+    if result_df is None or result_df.empty: return {}
+    result_df.columns = [str(c).split('.')[-1].lower() for c in result_df.columns]
+    if not group_exprs:
+        row = result_df.iloc[0]
+        return {'__overall__': float(row['agg_value'] or 0.0)} if int(row['row_count'] or 0) > 0 else {}
+    result_df = result_df.sort_values([f"gb_{i}" for i in range(len(group_exprs))])
+    return {tuple(str(row[f"gb_{i}"]) for i in range(len(group_exprs))): float(row['agg_value'] or 0.0)
+            for _, row in result_df.iterrows()}
+
+
+class ValidationResult:
+    """DataValidator 오류 목록을 규칙 단위로 보관하고 메시지/error_row_data는 조회 시점에 만드는 컬럼형 결과 객체입니다."""
+    SNAPSHOT_CHUNK_SIZE = 5000
+
+    def __init__(self):
+        self._rules = []  # rule_id -> 규칙 메타데이터
+        self._segments = []  # (rule_id 또는 None, ColumnarErrors 또는 dict 리스트)
+
+    def _register_rule(self, meta_update, filter_str='', row_source_df=None, batch_snapshots=False,
+                       snapshot_columns=None, snapshot_max_rows=None):
+        self._rules.append({'meta_update': meta_update, 'filter_str': filter_str, 'row_source_df': row_source_df,
+                            'batch_snapshots': batch_snapshots, 'snapshot_columns': snapshot_columns,
+                            'snapshot_max_rows': snapshot_max_rows})
+        return len(self._rules) - 1
+
+    def append(self, error_dict):
+        """규칙 메타데이터가 이미 채워진 단건 오류(설정 오류 등)를 추가합니다."""
+        if self._segments and self._segments[-1][0] is None and isinstance(self._segments[-1][1], list):
+            self._segments[-1][1].append(error_dict)
+        else:
+            self._segments.append((None, [error_dict]))
+
+    def add_rule_errors(self, rule_errors, meta_update, filter_str='', row_source_df=None, batch_snapshots=False,
+                        snapshot_columns=None, snapshot_max_rows=None):
+        """검증 함수의 오류(ColumnarErrors 또는 dict 리스트)를 규칙 메타데이터와 함께 추가합니다."""
+        if not rule_errors: return
+        rule_id = self._register_rule(meta_update, filter_str, row_source_df, batch_snapshots, snapshot_columns,
+                                      snapshot_max_rows)
+        self._segments.append((rule_id, rule_errors))
+
+    def __len__(self):
+        return sum(len(payload) for _, payload in self._segments)
+
+    def __bool__(self):
+        return any(len(payload) for _, payload in self._segments)
+
+    def __iter__(self):
+        return self.iter_dicts()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice) and (key.start or 0) >= 0 and key.stop is not None and key.stop >= 0 and key.step in (
+                None, 1):
+            return list(itertools.islice(self.iter_dicts(), key.start or 0, key.stop))
+        if isinstance(key, int) and key >= 0:
+            item = next(itertools.islice(self.iter_dicts(), key, key + 1), None)
+            if item is None: raise IndexError("ValidationResult index out of range")
+            return item
+        return self.to_list()[key]
+
+    def _enrich(self, err, rule, snapshot_index=None):
+        err.update(rule['meta_update'])
+        if rule['filter_str']: err['current_data_filter_applied'] = rule['filter_str']
+        row_source_df = rule['row_source_df']
+        if row_source_df is not None and 'row_index' in err and err[
+            'row_index'] in row_source_df.index and 'error_row_data' not in err:
+            try:
+                err['error_row_data'] = row_source_df.loc[err['row_index']].to_dict()
+                if snapshot_index is not None: snapshot_index.append(err['row_index'])
+            except KeyError:
+                print(f"경고: 오류 행 데이터 조회 실패 (필터: {rule['filter_str']}, 인덱스: {err['row_index']})")
+        return err
+
+    @staticmethod
+    def _compact_row_source(rule, snapshot_index):
+        """스냅샷을 만든 행(과 스냅샷 컬럼)만 남긴 사본으로 바꿔 원본 DataFrame 참조를 놓습니다."""
+        row_source_df = rule['row_source_df']
+        if row_source_df is None or rule.get('row_source_compacted'): return
+        if rule['batch_snapshots'] and rule['snapshot_columns']:
+            row_source_df = row_source_df[[c for c in rule['snapshot_columns'] if c in row_source_df.columns]]
+        rule['row_source_df'] = row_source_df[row_source_df.index.isin(snapshot_index)].copy()
+        rule['row_source_compacted'] = True
+
+    def _iter_with_batched_snapshots(self, source, rule, snapshot_index=None):
+        row_source_df = rule['row_source_df']
+        remaining = rule['snapshot_max_rows']
+        snapshot_cols = rule['snapshot_columns']
+        col_positions = None
+        if snapshot_cols:
+            col_positions = [row_source_df.columns.get_loc(c) for c in snapshot_cols if c in row_source_df.columns]
+        source = iter(source)
+        while True:
+            chunk = list(itertools.islice(source, self.SNAPSHOT_CHUNK_SIZE))
+            if not chunk: return
+            targets = []
+            for err in chunk:
+                err.update(rule['meta_update'])
+                if rule['filter_str']: err['current_data_filter_applied'] = rule['filter_str']
+                if row_source_df is None or (remaining is not None and len(targets) >= remaining): continue
+                if 'row_index' in err and 'error_row_data' not in err and err['row_index'] in row_source_df.index:
+                    targets.append(err)
+            if targets:
+                if row_source_df.index.is_unique:
+                    positions = row_source_df.index.get_indexer([err['row_index'] for err in targets])
+                    snapshot_df = row_source_df.iloc[positions] if col_positions is None else row_source_df.iloc[
+                        positions, col_positions]
+                    for err, row_data in zip(targets, snapshot_df.to_dict('records')):
+                        err['error_row_data'] = row_data
+                else:
+                    snapshot_source_df = row_source_df if col_positions is None else row_source_df.iloc[:, col_positions]
+                    for err in targets:
+                        err['error_row_data'] = snapshot_source_df.loc[err['row_index']].to_dict()
+                if remaining is not None: remaining -= len(targets)
+                if snapshot_index is not None: snapshot_index.extend(err['row_index'] for err in targets)
+            yield from chunk
+
+    def iter_dicts(self):
+        """기존 all_errors와 동일한 순서/형태의 오류 dict를 하나씩 생성합니다."""
+        for rule_id, payload in self._segments:
+            # 보관 중인 dict는 복사본에 메타데이터/스냅샷을 채워 반복 조회해도 원본이 바뀌지 않게 함
+            if rule_id is None:
+                yield from (dict(err) for err in payload)
+                continue
+            rule = self._rules[rule_id]
+            source = payload.iter_dicts() if isinstance(payload, ColumnarErrors) else (dict(err) for err in payload)
+            snapshot_index = [] if rule['row_source_df'] is not None and not rule.get('row_source_compacted') else None
+            if rule['batch_snapshots']:
+                yield from self._iter_with_batched_snapshots(source, rule, snapshot_index)
+            else:
+                for err in source:
+                    yield self._enrich(err, rule, snapshot_index)
+            if snapshot_index is not None: self._compact_row_source(rule, snapshot_index)
+
+    def head(self, n):
+        return list(itertools.islice(self.iter_dicts(), n))
+
+    def to_list(self):
+        return list(self.iter_dicts())
+
+    def count_by_severity(self):
+        counts = {}
+        for rule_id, payload in self._segments:
+            if rule_id is None or not isinstance(payload, ColumnarErrors):
+                for err in payload:
+                    severity = (err.get('severity') if rule_id is None else
+                                self._rules[rule_id]['meta_update'].get('severity', err.get('severity'))) or 'minor'
+                    counts[severity] = counts.get(severity, 0) + 1
+            else:
+                severity = self._rules[rule_id]['meta_update'].get('severity', 'minor')
+                counts[severity] = counts.get(severity, 0) + len(payload)
+        return counts
+
+    def to_frame(self, include_messages=True):
+        """오류 목록을 (rule_id, 규칙 정보, row_index, error_type, value[, message]) DataFrame으로 반환합니다."""
+        frames = []
+        for rule_id, payload in self._segments:
+            meta = self._rules[rule_id]['meta_update'] if rule_id is not None else {}
+            if isinstance(payload, ColumnarErrors):
+                n = len(payload)
+                part = pd.DataFrame({
+                    'rule_id': np.full(n, rule_id, dtype=np.int32),
+                    'rule_name': meta.get('rule_name', ''), 'rule_type': meta.get('rule_type', ''),
+                    'column': meta.get('column', payload.column_name), 'severity': meta.get('severity', 'minor'),
+                    'row_index': np.asarray(payload.row_index, dtype=object),
+                    'error_type': np.asarray(payload.error_types, dtype=object)[payload.error_codes],
+                    'value': payload.values if payload.values is not None else None})
+                if include_messages:
+                    part['message'] = [err['message'] for err in payload.iter_dicts()]
+            else:
+                records = [{**err, **meta} for err in payload]
+                part = pd.DataFrame({
+                    'rule_id': np.full(len(records), -1 if rule_id is None else rule_id, dtype=np.int32),
+                    'rule_name': [r.get('rule_name', '') for r in records],
+                    'rule_type': [r.get('rule_type', '') for r in records],
+                    'column': [r.get('column') for r in records],
+                    'severity': [r.get('severity', 'minor') for r in records],
+                    'row_index': [r.get('row_index') for r in records],
+                    'error_type': [r.get('error_type', '') for r in records],
+                    'value': [r.get('value') for r in records]})
+                if include_messages:
+                    part['message'] = [r.get('message', '') for r in records]
+            frames.append(part)
+        columns = ['rule_id', 'rule_name', 'rule_type', 'column', 'severity', 'row_index', 'error_type', 'value'] + (
+            ['message'] if include_messages else [])
+        if not frames: return pd.DataFrame(columns=columns)
+        result_df = pd.concat(frames, ignore_index=True)[columns]
+        result_df['error_type'] = result_df['error_type'].astype('category')
+        return result_df
+
+
+class FactorizedColumn:
+    """컬럼 1개의 factorize 결과 (codes: 행별 고유값 위치(NULL은 -1), uniques, counts)."""
+
+    def __init__(self, codes, uniques):
+        self.codes = codes
+        self.uniques = uniques
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.non_null_count = int(self.counts.sum())
+        self.null_count = len(codes) - self.non_null_count
+
+    def expand(self, unique_flags):
+        """고유값별 bool 판정 결과를 행 단위 bool 배열로 펼칩니다 (NULL 행은 False)."""
+        if not len(self.uniques): return np.zeros(len(self.codes), dtype=bool)
+        return np.asarray(unique_flags, dtype=bool)[self.codes] & (self.codes >= 0)
+
+
+class FilterMaskCache:
+    """검증 1회 동안 필터 식 평가 결과와 컬럼 factorize 결과를 식/컬럼 기준으로 재사용합니다."""
+
+    def __init__(self, df):
+        self.df = df
+        self._positions = {}  # (기준 필터, 식) -> 행 위치 배열 또는 예외
+        self._frames = {}  # (기준 필터, 식) -> 필터 결과 DataFrame
+        self._factorized = {}  # (필터 식, 컬럼) -> FactorizedColumn
+        self._key_locks = {}  # 항목별 생성 잠금 (같은 항목은 한 번만 만들고 다른 항목은 동시에 평가)
+        self._lock = threading.Lock()
+        self.stats = {'evaluations': 0, 'reuses': 0}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _evaluate(frame, expr):
+        # df.query와 같은 평가 경로를 eval 한 번으로 수행 (bool 마스크면 위치 배열, 그 외는 df.query와 같은 결과 DataFrame)
+        mask = frame.eval(expr)
+        if isinstance(mask, pd.Series) and mask.dtype == bool and mask.index.equals(frame.index):
+            return np.flatnonzero(mask.to_numpy()), None
+        try:
+            return None, frame.loc[mask]
+        except ValueError:
+            return None, frame[mask]
+
+    def _lookup(self, base_expr, expr):
+        key = (base_expr or '', expr)
+        if key not in self._positions:
+            with self._key_lock(('filter',) + key):
+                if key not in self._positions:
+                    base_frame = self.frame(base_expr) if base_expr else self.df
+                    try:
+                        positions, result_frame = self._evaluate(base_frame, expr)
+                    except Exception as e:
+                        positions, result_frame = e, None
+                    with self._lock:
+                        if result_frame is not None: self._frames[key] = result_frame
+                        self._positions[key] = positions
+                        self.stats['evaluations'] += 1
+                    if isinstance(positions, Exception): raise positions
+                    return key, positions
+        with self._lock:
+            self.stats['reuses'] += 1
+        positions = self._positions[key]
+        if isinstance(positions, Exception): raise positions
+        return key, positions
+
+    def positions(self, expr, base_expr=''):
+        """필터 식을 만족하는 행의 위치 배열 (base_expr가 있으면 그 필터 결과 기준 위치). 위치로 표현할 수 없으면 None."""
+        return self._lookup(base_expr, expr)[1]
+
+    def count(self, expr, base_expr=''):
+        key, positions = self._lookup(base_expr, expr)
+        return len(positions) if positions is not None else len(self._frames[key])
+
+    def frame(self, expr, base_expr=''):
+        """필터 결과 DataFrame (df.query(expr)와 같은 내용). 같은 식이면 같은 객체를 반환합니다."""
+        key, positions = self._lookup(base_expr, expr)
+        if key not in self._frames:
+            with self._key_lock(('filter',) + key):
+                if key not in self._frames:
+                    base_frame = self.frame(base_expr) if base_expr else self.df
+                    self._frames[key] = base_frame.take(positions)
+        return self._frames[key]
+
+    def factorized(self, column, expr=''):
+        """필터 식(없으면 전체) 결과의 컬럼 factorize 결과 (FactorizedColumn). 같은 (식, 컬럼)이면 같은 객체를 반환합니다."""
+        key = (expr or '', column)
+        if key not in self._factorized:
+            with self._key_lock(('factorized',) + key):
+                if key not in self._factorized:
+                    positions = self.positions(expr) if expr else None
+                    if positions is not None:
+                        base = self.factorized(column)
+                        self._factorized[key] = FactorizedColumn(base.codes[positions], base.uniques)
+                    else:
+                        codes, uniques = pd.factorize((self.frame(expr) if expr else self.df)[column])
+                        self._factorized[key] = FactorizedColumn(codes, uniques)
+        return self._factorized[key]
+
+
+class ValidationHooks:
+    """DataValidator 규칙/조회 실행 훅의 기본 클래스 (병렬 실행 시 규칙 스레드에서 호출되므로 스레드 안전해야 함)."""
+
+    def on_validation_start(self, validator):
+        pass
+
+    def on_validation_end(self, validator):
+        pass
+
+    def on_rule_start(self, rule_info):
+        pass
+
+    def on_rule_end(self, rule_info, summary, exc=None):
+        """summary: rule_execution_summary 항목 (실행 지표 포함), exc: 규칙 실행 중 예외 (정상 종료 시 None)"""
+        pass
+
+    def on_query_start(self, query_info):
+        pass
+
+    def on_query_end(self, query_info, elapsed_seconds, exc=None):
+        pass
+
+
+def _dispatch_hooks(hooks, event_name, *args):
+    for hook in hooks:
+        try:
+            getattr(hook, event_name)(*args)
+        except Exception as e:
+            print(f"경고: 훅 {type(hook).__name__}.{event_name} 실행 중 오류 발생 (검증은 계속 진행): {e}")
+
+
+class RuleProfilerHook(ValidationHooks):
+    """rule_names/rule_types로 대상 규칙을 고르는 규칙 단위 프로파일러의 기본 클래스 (둘 다 None이면 모든 규칙)."""
+
+    def __init__(self, rule_names=None, rule_types=None):
+        self.rule_names = set(rule_names) if rule_names else None
+        self.rule_types = set(rule_types) if rule_types else None
+        self._local = threading.local()
+
+    def is_target(self, rule_info):
+        return (self.rule_names is None or rule_info['rule_name'] in self.rule_names) and (
+            self.rule_types is None or rule_info['rule_type'] in self.rule_types)
+
+    @staticmethod
+    def _file_name(rule_info, suffix):
+        return re.sub(r'[^0-9A-Za-z가-힣_.-]+', '_', f"{rule_info['rule_idx']}_{rule_info['rule_name']}") + suffix
+
+
+class CProfileRuleHook(RuleProfilerHook):
+    """대상 규칙을 cProfile로 프로파일링해 profiles[규칙명]에 보관합니다 (output_dir이 있으면 .prof 파일로 저장)."""
+
+    def __init__(self, rule_names=None, rule_types=None, output_dir=None, sort_by='cumulative', print_top_n=20):
+        super().__init__(rule_names, rule_types)
+        self.output_dir, self.sort_by, self.print_top_n = output_dir, sort_by, print_top_n
+        self.profiles = {}
+
+    def on_rule_start(self, rule_info):
+        self._local.profiler = None
+        if not self.is_target(rule_info): return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            print(f"경고: 규칙 '{rule_info['rule_name']}' cProfile 시작 실패 (다른 프로파일러 실행 중): {e}")
+            return
+        self._local.profiler = profiler
+
+    def on_rule_end(self, rule_info, summary, exc=None):
+        profiler = getattr(self._local, 'profiler', None)
+        if profiler is None: return
+        profiler.disable()
+        self._local.profiler = None
+        stats = pstats.Stats(profiler)
+        self.profiles[rule_info['rule_name']] = stats
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stats.dump_stats(os.path.join(self.output_dir, self._file_name(rule_info, '.prof')))
+        if self.print_top_n:
+            stats_output = io.StringIO()
+            pstats.Stats(profiler, stream=stats_output).sort_stats(self.sort_by).print_stats(self.print_top_n)
+            print(f"\n--- cProfile: 규칙 '{rule_info['rule_name']}' ({rule_info['rule_type']}) ---")
+            print(stats_output.getvalue())
+
+
+class TracemallocRuleHook(RuleProfilerHook):
+    """대상 규칙 실행 전후 tracemalloc 스냅샷을 비교해 메모리 증가 상위 top_n개 위치를 reports[규칙명]에 보관합니다."""
+
+    def __init__(self, rule_names=None, rule_types=None, top_n=10, key_type='lineno', print_report=True):
+        super().__init__(rule_names, rule_types)
+        self.top_n, self.key_type, self.print_report = top_n, key_type, print_report
+        self.reports = {}
+        self._started_tracing = False
+
+    def on_rule_start(self, rule_info):
+        self._local.snapshot = None
+        if not self.is_target(rule_info): return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._local.snapshot = tracemalloc.take_snapshot()
+
+    def on_rule_end(self, rule_info, summary, exc=None):
+        start_snapshot = getattr(self._local, 'snapshot', None)
+        if start_snapshot is None or not tracemalloc.is_tracing(): return
+        self._local.snapshot = None
+        top_stats = tracemalloc.take_snapshot().compare_to(start_snapshot, self.key_type)[:self.top_n]
+        self.reports[rule_info['rule_name']] = top_stats
+        if self.print_report:
+            print(f"\n--- tracemalloc: 규칙 '{rule_info['rule_name']}' 메모리 증가 상위 {len(top_stats)}개 위치 ---")
+            for stat in top_stats: print(stat)
+
+    def on_validation_end(self, validator):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class ChromeTraceHook(ValidationHooks):
+    """규칙/조회 실행 구간을 Chrome trace JSON으로 기록해 검증이 끝날 때 output_path에 저장합니다."""
+
+    def __init__(self, output_path, max_query_text_length=500):
+        self.output_path = output_path
+        self.max_query_text_length = max_query_text_length
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def _timestamp_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _add_span(self, name, category, start_us, args):
+        thread = threading.current_thread()
+        with self._lock:
+            if not any(e['ph'] == 'M' and e['tid'] == thread.ident for e in self.events):
+                self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread.ident,
+                                    'args': {'name': thread.name}})
+            self.events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start_us,
+                                'dur': self._timestamp_us() - start_us, 'pid': os.getpid(), 'tid': thread.ident,
+                                'args': args})
+
+    def on_rule_start(self, rule_info):
+        self._local.rule_start_us = self._timestamp_us()
+
+    def on_rule_end(self, rule_info, summary, exc=None):
+        summary = summary or {}
+        args = {'rule_type': rule_info['rule_type'], 'target_column': rule_info['target_column'],
+                **{key: summary.get(key) for key in ['status', 'items_checked', 'items_failed', 'rows_scanned',
+                                                     'db_query_count'] if key in summary}}
+        if exc is not None: args['exception'] = f"{type(exc).__name__}: {exc}"
+        self._add_span(rule_info['rule_name'], 'rule', self._local.rule_start_us, args)
+
+    def on_query_start(self, query_info):
+        self._local.query_start_us = self._timestamp_us()
+
+    def on_query_end(self, query_info, elapsed_seconds, exc=None):
+        args = {'engine': query_info['engine'], 'rule_name': query_info['rule_name'],
+                'query': str(query_info['query'])[:self.max_query_text_length]}
+        if exc is not None: args['exception'] = f"{type(exc).__name__}: {exc}"
+        self._add_span(query_info['method'], 'query', self._local.query_start_us, args)
+
+    def on_validation_end(self, validator):
+        self.save()
+
+    def save(self):
+        with self._lock:
+            trace = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+        output_dir = os.path.dirname(self.output_path)
+        if output_dir: os.makedirs(output_dir, exist_ok=True)
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False, default=str)
+        print(f"정보: Chrome trace {len(trace['traceEvents'])}건을 '{self.output_path}'에 저장했습니다.")
+
+
+# rule_execution_summary 항목에 추가되는 규칙별 실행 지표 (hive_summary_table_name 저장 컬럼)
+RULE_METRIC_DEFAULTS = {'execution_seconds': 0.0, 'cpu_seconds': 0.0, 'rows_scanned': 0, 'rows_per_second': 0.0,
+                        'peak_memory_delta_mb': 0.0, 'db_query_count': 0, 'db_fetch_seconds': 0.0}
+
+
+def _process_peak_rss_mb():
+    if resource is None: return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 1024 / 1024 if sys.platform == 'darwin' else peak_rss / 1024  # macOS는 바이트, Linux는 KB
+
+
+def _instrumented_rule_execution(method):
+    """규칙 실행 결과 요약에 실행 지표(시간/CPU/행 수/메모리/DB 조회)를 추가하고 규칙 훅을 호출합니다."""
+    method_signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        query_meter = getattr(self, '_query_meter', None)
+        hooks = getattr(self, 'hooks', None) or []
+        rule_info = None
+        if hooks or query_meter is not None:
+            bound_args = method_signature.bind(self, *args, **kwargs).arguments
+            rule, col_name, rule_idx = bound_args['rule'], bound_args.get('col_name'), bound_args['rule_idx']
+            rule_type = rule.get('type')
+            rule_info = {'rule_name': rule.get('name', f'{col_name}_{rule_type}_{rule_idx}' if col_name else
+                         f'table_{rule_type}_{rule_idx}'), 'rule_type': rule_type,
+                         'params': rule.get('params', {}), 'target_column': col_name, 'rule_idx': rule_idx}
+        if hooks: _dispatch_hooks(hooks, 'on_rule_start', rule_info)
+        track_memory = not getattr(self, '_concurrent_rule_execution', False)
+        is_tracing = track_memory and tracemalloc.is_tracing()
+        if is_tracing:
+            start_traced_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        elif track_memory:
+            start_peak_rss_mb = _process_peak_rss_mb()
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            with (query_meter.measure(rule_info) if query_meter is not None else contextlib.nullcontext(
+                    {'db_query_count': 0, 'db_fetch_seconds': 0.0})) as query_metrics:
+                outcome = method(self, *args, **kwargs)
+        except Exception as e:
+            if hooks: _dispatch_hooks(hooks, 'on_rule_end', rule_info, None, e)
+            raise
+        execution_seconds = time.perf_counter() - start_wall
+        if is_tracing:
+            peak_memory_delta_mb = max(0, tracemalloc.get_traced_memory()[1] - start_traced_bytes) / 1024 / 1024
+        elif not track_memory:
+            peak_memory_delta_mb = None
+        else:
+            end_peak_rss_mb = _process_peak_rss_mb()
+            peak_memory_delta_mb = end_peak_rss_mb - start_peak_rss_mb if end_peak_rss_mb is not None else None
+        rows_scanned = outcome.pop('rows_scanned', 0)
+        if outcome.get('summary') is not None:
+            outcome['summary'].update({
+                'execution_seconds': execution_seconds, 'cpu_seconds': time.thread_time() - start_cpu,
+                'rows_scanned': rows_scanned,
+                'rows_per_second': rows_scanned / execution_seconds if execution_seconds > 0 else 0.0,
+                'peak_memory_delta_mb': peak_memory_delta_mb, **query_metrics})
+        if hooks: _dispatch_hooks(hooks, 'on_rule_end', rule_info, outcome.get('summary'))
+        return outcome
+
+    return wrapper
+
+
+def _validation_entry_point(method):
+    """검증 메소드 실행 전후로 훅을 호출하고 track_rule_memory=True면 tracemalloc을 켭니다 (중첩 호출은 바깥만 처리)."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._active_validation: return method(self, *args, **kwargs)
+        self._active_validation = True
+        started_tracing = self.track_rule_memory and not tracemalloc.is_tracing()
+        if started_tracing: tracemalloc.start()
+        _dispatch_hooks(self.hooks, 'on_validation_start', self)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _dispatch_hooks(self.hooks, 'on_validation_end', self)
+            if started_tracing: tracemalloc.stop()
+            self._active_validation = False
+
+    return wrapper
+
+
+def _merge_rule_metrics(target_summary, summary):
+    """청크별 규칙 실행 지표를 합산합니다 (메모리는 최대값, 초당 처리 행 수는 합산 후 다시 계산)."""
+    for key in ['execution_seconds', 'cpu_seconds', 'rows_scanned', 'db_query_count', 'db_fetch_seconds']:
+        if key in summary: target_summary[key] = target_summary.get(key, 0) + summary[key]
+    if summary.get('peak_memory_delta_mb') is not None:
+        target_summary['peak_memory_delta_mb'] = max(target_summary.get('peak_memory_delta_mb') or 0.0,
+                                                     summary['peak_memory_delta_mb'])
+    if target_summary.get('execution_seconds'):
+        target_summary['rows_per_second'] = target_summary.get('rows_scanned', 0) / target_summary['execution_seconds']
+
+
+def print_slow_rules_report(rule_execution_summary, top_n=10, planner_query_metrics=None):
+    """rule_execution_summary를 실행 시간 순으로 정렬해 상위 top_n개 규칙의 실행 지표를 표로 출력합니다."""
+    timed_items = [item for item in rule_execution_summary if item.get('execution_seconds') is not None]
+    if not timed_items or not top_n: return
+    report_df = pd.DataFrame(timed_items)
+    report_cols = ['rule_name', 'rule_type', 'target_column', 'status', 'execution_seconds', 'cpu_seconds',
+                   'rows_scanned', 'rows_per_second', 'peak_memory_delta_mb', 'db_query_count', 'db_fetch_seconds']
+    report_df = report_df[[c for c in report_cols if c in report_df.columns]].sort_values(
+        'execution_seconds', ascending=False, kind='mergesort').head(top_n)
+    if 'target_column' in report_df.columns: report_df['target_column'] = report_df['target_column'].fillna('')
+    print(f"\n--- 실행 시간 상위 {len(report_df)}개 규칙 (전체 {len(timed_items)}개 규칙 합계 "
+          f"{sum(item['execution_seconds'] for item in timed_items):.2f}초) ---")
+    print(report_df.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    if any(item.get('peak_memory_delta_mb') is None for item in timed_items) and resource is not None:
+        print("정보: 규칙 병렬 실행(rule_workers > 1) 중에는 규칙별 메모리 증가량을 측정하지 않습니다 (peak_memory_delta_mb 비어 있음).")
+    if planner_query_metrics and planner_query_metrics.get('db_query_count'):
+        print(f"정보: 과거 조회 플래너 - 규칙 실행 전 병합 조회 {planner_query_metrics['db_query_count']}개, "
+              f"{planner_query_metrics['db_fetch_seconds']:.2f}초 (규칙별 지표에는 포함되지 않음)")
+
+
 class DataValidator:
-    def __init__(self, rules_config, q_processor=None):
+    def __init__(self, rules_config, q_processor=None, lazy_row_snapshots=False, row_snapshot_columns=None,
+                 row_snapshot_max_rows_per_rule=None, plan_historical_queries=True, use_grouping_sets=True,
+                 profile_store=None, rule_workers=1, process_workers=0, max_concurrent_queries=1,
+                 engine_query_limits=None, track_rule_memory=False, hooks=None, local_history_aggregation=False,
+                 local_history_periods=None):
         self.rules_config = rules_config;
-        self.q_processor = q_processor
+        # 규칙/조회 실행 전후 훅 (ValidationHooks 또는 그 목록): cProfile/tracemalloc/Chrome trace 등 규칙 단위 프로파일링용
+        self.hooks = list(hooks) if isinstance(hooks, (list, tuple)) else ([hooks] if hooks is not None else [])
+        self._active_validation = False
+        # 규칙별 DB 조회 수/대기 시간 측정용 프록시 (rule_execution_summary의 db_query_count/db_fetch_seconds)
+        self._query_meter = _RuleQueryMeter(q_processor, self.hooks) if q_processor is not None else None
+        self.q_processor = self._query_meter if q_processor is not None else q_processor
+        # track_rule_memory=True이면 tracemalloc으로 규칙별 메모리 증가량 측정 (False면 최대 RSS 증가량)
+        self.track_rule_memory = track_rule_memory
+        self._concurrent_rule_execution = False  # _validate_parallel 실행 중 True (규칙별 메모리 측정 안 함)
+        self.last_planner_query_metrics = None  # 마지막 실행의 과거 조회 플래너 조회 수/대기 시간
+        self._regex_cache = {}  # regex_pattern 규칙 패턴 -> 컴파일된 정규식 (re 모듈 캐시 크기와 무관하게 재사용)
+        # 과거 조회 플래너: 추이 규칙들의 과거 집계 조회를 병합 (use_grouping_sets=False면 그룹 기준별 쿼리)
+        self.plan_historical_queries = plan_historical_queries
+        self.use_grouping_sets = use_grouping_sets
+        # local_history_aggregation=True이면 검증 DataFrame의 과거 기간 중 local_history_periods(필터 없이 전체 적재됐다고
+        # 호출자가 선언한 기간 값 목록)에 있는 기간만 DB 대신 pandas로 집계
+        self.local_history_aggregation = local_history_aggregation
+        self.local_history_periods = local_history_periods
+        if local_history_aggregation and not local_history_periods:
+            print("경고: local_history_aggregation=True이지만 local_history_periods가 없어 과거 기간은 모두 DB에서 조회합니다.")
+        # 과거 파티션 프로파일 저장소 (ProfileStore, distribution_change/numeric_volatility용)
+        self.profile_store = profile_store
+        # error_row_data 지연 생성 (규칙 params의 error_row_data_columns/error_row_data_max_rows로 재정의)
+        # rule_workers > 1: DB 대기 규칙을 스레드 풀에서 (q_processor 스레드 안전 필요), process_workers > 0: CPU 검사를 프로세스 풀에서
+        # (규칙 실행 예외는 순차 실행과 같이 호출자에게 전달)
+        self.rule_workers = rule_workers
+        self.process_workers = process_workers
+        # max_concurrent_queries > 1이면 플래너의 병합 조회를 동시에 실행 (engine_query_limits: 엔진별 제한)
+        self.max_concurrent_queries = max_concurrent_queries
+        self.engine_query_limits = engine_query_limits
+        self.lazy_row_snapshots = lazy_row_snapshots
+        self.row_snapshot_columns = row_snapshot_columns
+        self.row_snapshot_max_rows_per_rule = row_snapshot_max_rows_per_rule
         self.validation_functions = {
             'not_null': check_not_null, 'regex_pattern': check_regex_pattern,
             'allowed_values': check_allowed_values, 'numeric_range': check_numeric_range,
@@ -1331,227 +4110,1043 @@ class DataValidator:
         self.table_level_rule_types = ['column_equality', 'duplicate_rows', 'aggregate_value_trend',
                                        'total_row_count_trend', 'schema_change_check', 'consecutive_trend_check',
                                        'conditional_check']
+        self.row_snapshot_rule_types = ['column_equality', 'duplicate_rows', 'conditional_check']
+        self.historical_planner_rule_types = ['aggregate_value_trend', 'total_row_count_trend',
+                                              'consecutive_trend_check']
+        self.io_bound_rule_types = ['aggregate_value_trend', 'total_row_count_trend', 'schema_change_check',
+                                    'consecutive_trend_check']
+        self.process_pool_rule_types = ['not_null', 'regex_pattern', 'allowed_values', 'numeric_range']
+        # 실행 단위 컬럼 factorize 결과(FilterMaskCache.factorized)를 공유해 고유값 기준으로 판정하는 규칙
+        self.factorized_rule_types = ['allowed_values', 'regex_pattern', 'distribution_change']
+        # validate_chunks: 청크별 부분 집계를 병합해 마지막에 한 번 평가하는 규칙 (나머지는 청크마다 행 단위로 실행)
+        self.chunk_final_rule_types = ['distribution_change', 'aggregate_value_trend', 'total_row_count_trend',
+                                       'consecutive_trend_check', 'schema_change_check']
+
+    def _compiled_regex(self, pattern):
+        """regex_pattern 규칙의 정규식을 DataValidator 단위로 한 번만 컴파일합니다 (패턴 오류는 None, 검사 함수가 보고)."""
+        if pattern not in self._regex_cache:
+            try:
+                self._regex_cache[pattern] = re.compile(pattern)
+            except re.error:
+                self._regex_cache[pattern] = None
+        return self._regex_cache[pattern]
+
+    def _row_snapshot_options(self, params):
+        snapshot_columns = params.get('error_row_data_columns', self.row_snapshot_columns)
+        snapshot_max_rows = params.get('error_row_data_max_rows', self.row_snapshot_max_rows_per_rule)
+        batch_snapshots = bool(self.lazy_row_snapshots or snapshot_columns or snapshot_max_rows is not None)
+        return {'batch_snapshots': batch_snapshots, 'snapshot_columns': snapshot_columns,
+                'snapshot_max_rows': snapshot_max_rows}
+
+    def _local_history_frame(self, df):
+        """과거 기간 로컬 집계용 검증 DataFrame (local_history_periods를 attrs['complete_periods']에 기록한 얕은 복사본)."""
+        if not self.local_history_aggregation or not self.local_history_periods: return None
+        local_history_df = df.copy(deep=False)
+        local_history_df.attrs = {**df.attrs, 'complete_periods': frozenset(str(p) for p in self.local_history_periods)}
+        return local_history_df
+
+    def _plan_historical_queries(self, df, filter_cache=None, local_history_df=None):
+        """테이블 레벨 추이 규칙들의 과거 집계 조회를 미리 병합 조회해 {규칙 인덱스: {기간: {그룹키: 값}}}로 반환합니다."""
+        if not self.plan_historical_queries or not self.q_processor: return {}
+        if self._query_meter is None: return self._plan_historical_queries_unmetered(df, filter_cache, local_history_df)
+        totals_before = dict(self._query_meter.totals)
+        start_time = time.perf_counter()
+        try:
+            return self._plan_historical_queries_unmetered(df, filter_cache, local_history_df)
+        finally:
+            self.last_planner_query_metrics = {
+                key: self._query_meter.totals[key] - totals_before[key] for key in totals_before}
+            self.last_planner_query_metrics['execution_seconds'] = time.perf_counter() - start_time
+
+    def _plan_historical_queries_unmetered(self, df, filter_cache=None, local_history_df=None):
+        requests = {}
+        for rule_idx, rule in enumerate(self.rules_config.get('table_level_rules', [])):
+            if rule.get('type') not in self.historical_planner_rule_types: continue
+            params = rule.get('params', {})
+            try:
+                # 최신 기간을 현재 데이터에서 정하는 consecutive_trend_check만 필터 적용 데이터가 필요
+                df_for_request = (filter_cache or FilterMaskCache(df)).frame(params['current_data_filter']) if params.get(
+                    'current_data_filter') and rule['type'] == 'consecutive_trend_check' else df
+                request = _describe_historical_aggregate_request(rule['type'], params, df_for_request)
+            except Exception:
+                request = None  # 필터 오류 등은 규칙 실행 시 기존대로 보고
+            if request: requests[rule_idx] = request
+        local_periods = sorted(set(p for request in requests.values() for p in _local_history_periods(
+            local_history_df, request, request['periods'])))
+        if local_periods:
+            print(f"정보: 과거 조회 플래너 - 과거 기간 {len(local_periods)}개({local_periods[0]}~{local_periods[-1]})는 "
+                  f"DB 대신 검증 DataFrame에서 집계합니다 (local_history_periods).")
+        if len(requests) < 2: return {}
+        if (self.max_concurrent_queries or 1) > 1:
+            async_q_processor = AsyncQueryProcessor(self.q_processor, max_concurrency=self.max_concurrent_queries,
+                                                    engine_limits=self.engine_query_limits)
+            try:
+                return run_async_lookups(async_fetch_planned_historical_aggregates(async_q_processor, requests,
+                                                                                   self.use_grouping_sets, local_history_df))
+            finally:
+                async_q_processor.close()
+        return _fetch_planned_historical_aggregates(self.q_processor, requests, self.use_grouping_sets,
+                                                    local_history_df)
+
+    def _is_io_bound_rule(self, rule_type, params):
+        """DB 왕복(과거 이력/스키마 조회)이 실행 시간을 차지하는 규칙인지 여부 (스레드 풀 대상)."""
+        if rule_type in self.io_bound_rule_types: return True
+        return rule_type in ['distribution_change', 'numeric_volatility'] and bool(
+            params.get('historical_data_table') or params.get('historical_partition_column'))
+
+    @_instrumented_rule_execution
+    def _execute_column_rule(self, df, col_name, rule_idx, rule, disable_inner_tqdm=True, run_check=None,
+                             filter_cache=None):
+        """컬럼 규칙 1개를 실행해 {'errors', 'summary', 'rule_errors'} 결과를 반환합니다 (run_check: 검증 함수 호출 방식)."""
+        filter_cache = filter_cache if filter_cache is not None else FilterMaskCache(df)
+        df_name_for_summary = getattr(df, 'attrs', {}).get('name', '')
+        outcome = {'errors': [], 'summary': None, 'rule_errors': None}
+        severity = rule.get('severity', 'minor').lower()
+        rule_type, params = rule['type'], rule.get('params', {}).copy()
+        params['rule_name'] = rule.get('name', f'{col_name}_{rule_type}_{rule_idx}')
+        if self.profile_store is not None and rule_type in ['distribution_change', 'numeric_volatility']:
+            params['_profile_store'] = self.profile_store
+        if rule_type == 'regex_pattern' and params.get('pattern'):
+            params['_compiled_pattern'] = self._compiled_regex(params['pattern'])
+        current_filter_applied_str = params.get('current_data_filter', '')
+        df_for_this_rule = df
+        if current_filter_applied_str:
+            try:
+                df_for_this_rule = filter_cache.frame(current_filter_applied_str)
+                if df_for_this_rule.empty and not df.empty:
+                    print(f"경고: 규칙 '{params['rule_name']}' 필터 적용 결과 데이터 없음.")
+            except Exception as e:
+                outcome['errors'].append(
+                    {'column': col_name, 'rule_type': rule_type, 'rule_name': params['rule_name'],
+                     'error_type': 'CONFIG_ERROR',
+                     'message': f"필터 실행 오류: {e}", 'severity': severity}
+                )
+                outcome['summary'] = {'rule_name': params['rule_name'], 'rule_type': rule_type,
+                                      'target_column': col_name, 'target_table': df_name_for_summary,
+                                      'current_data_filter_applied': current_filter_applied_str, 'items_checked': 0,
+                                      'items_passed': 0, 'items_failed': 1, 'status': 'Error (Filter)',
+                                      'rule_severity': severity}
+                return outcome
+        items_checked = 0
+        outcome['rows_scanned'] = len(df_for_this_rule)
+        series_for_check = df_for_this_rule.get(col_name)
+        factorized = None
+        if (series_for_check is not None and run_check is None and rule_type in self.factorized_rule_types
+                and hasattr(filter_cache, 'factorized')):
+            # 같은 컬럼/필터를 쓰는 범주형 규칙들이 factorize 결과를 공유 (프로세스 풀 실행 규칙은 제외)
+            factorized = filter_cache.factorized(col_name, current_filter_applied_str)
+            params['_factorized_column'] = factorized
+        status_for_summary = 'Passed'
+        if series_for_check is None and rule_type not in self.table_level_rule_types:
+            outcome['errors'].append({'column': col_name, 'rule_name': params['rule_name'], 'rule_type': rule_type,
+                                      'error_type': 'COLUMN_NOT_FOUND_AFTER_FILTER',
+                                      'message': f"필터 후 컬럼 '{col_name}' 없음", 'severity': severity})
+            status_for_summary = 'Error (Config)'
+        elif series_for_check is not None:
+            if rule_type == 'not_null':
+                items_checked = len(series_for_check)
+            elif rule_type in ['regex_pattern', 'allowed_values']:
+                items_checked = factorized.non_null_count if factorized is not None else len(series_for_check.dropna())
+            elif rule_type == 'numeric_range':
+                items_checked = len(series_for_check)
+            elif rule_type == 'numeric_volatility':
+                items_checked = len(pd.to_numeric(series_for_check, errors='coerce').dropna())
+            elif rule_type == 'distribution_change':
+                items_checked = 1
+        current_rule_errors = []
+        if rule_type in self.validation_functions and rule_type not in self.table_level_rule_types:
+            if series_for_check is not None:
+                func_args = [series_for_check, col_name, params];
+                func_kwargs = {'disable_tqdm': disable_inner_tqdm} if rule_type in ['not_null', 'regex_pattern',
+                                                                                    'allowed_values',
+                                                                                    'numeric_range'] else {}
+                if rule_type == 'numeric_volatility':
+                    func_kwargs.update({'q_processor': self.q_processor, 'full_current_df': df_for_this_rule})
+                elif rule_type == 'distribution_change':
+                    func_kwargs['q_processor'] = self.q_processor
+                if rule_type in ['not_null', 'regex_pattern', 'allowed_values', 'numeric_range']:
+                    func_kwargs['return_columnar'] = True
+                check_func = self.validation_functions[rule_type]
+                current_rule_errors = run_check(check_func, func_args, func_kwargs) if run_check else check_func(
+                    *func_args, **func_kwargs)
+        elif rule_type not in self.table_level_rule_types:
+            outcome['errors'].append({'column': col_name, 'rule_type': rule_type, 'rule_name': params['rule_name'],
+                                      'error_type': 'UNKNOWN_RULE_TYPE',
+                                      'message': f"알 수 없는 컬럼 규칙: {rule_type}", 'severity': severity});
+            status_for_summary = 'Error (Unknown Rule)'
+        items_failed = (1 if current_rule_errors else 0) if rule_type == 'distribution_change' else (
+            len(current_rule_errors) if current_rule_errors is not None else 1)
+        if current_rule_errors is None: current_rule_errors = [
+            {'column': col_name, 'rule_name': params['rule_name'], 'rule_type': rule_type,
+             'error_type': 'INTERNAL_ERROR',
+             'message': f"검증 함수 {rule_type}가 None 반환"}]; status_for_summary = 'Error (Internal)'
+        items_passed = items_checked - items_failed if items_checked >= items_failed else 0
+        if status_for_summary == 'Passed' and items_failed > 0: status_for_summary = 'Failed'
+        if items_checked == 0 and status_for_summary == 'Passed': status_for_summary = 'Skipped (Filter Empty)' if current_filter_applied_str and df_for_this_rule.empty and not df.empty else (
+            'Skipped (No Data in Series)' if series_for_check is not None and series_for_check.empty else status_for_summary)
+        outcome['summary'] = {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': col_name,
+                              'target_table': df_name_for_summary,
+                              'current_data_filter_applied': current_filter_applied_str,
+                              'items_checked': items_checked, 'items_passed': items_passed,
+                              'items_failed': items_failed, 'status': status_for_summary, 'rule_severity': severity}
+        if current_rule_errors:
+            outcome['rule_errors'] = (current_rule_errors,
+                                      {'rule_type': rule_type, 'rule_name': params['rule_name'], 'column': col_name,
+                                       'severity': severity},
+                                      dict(filter_str=current_filter_applied_str, row_source_df=df_for_this_rule,
+                                           **self._row_snapshot_options(params)))
+        return outcome
+
+    def _missing_column_outcomes(self, df, col_name, rules):
+        df_name_for_summary = getattr(df, 'attrs', {}).get('name', '')
+        outcomes = []
+        for rule_idx, rule_def in enumerate(rules):
+            rule_type_def = rule_def.get('type', 'N/A')
+            rule_name_def = rule_def.get('name', f'{col_name}_{rule_type_def}_{rule_idx}')
+            severity = rule_def.get('severity', 'minor').lower()
+            outcomes.append({'errors': [{'column': col_name, 'rule_name': rule_name_def, 'rule_type': rule_type_def,
+                                         'error_type': 'COLUMN_NOT_FOUND',
+                                         'message': f"컬럼 '{col_name}' 없음", 'severity': severity}],
+                             'summary': {'rule_name': rule_name_def, 'rule_type': rule_type_def,
+                                         'target_column': col_name, 'target_table': df_name_for_summary,
+                                         'current_data_filter_applied': rule_def.get('params', {}).get(
+                                             'current_data_filter', ''),
+                                         'items_checked': 0, 'items_passed': 0, 'items_failed': 1,
+                                         'status': 'Error (Config)', 'rule_severity': severity},
+                             'rule_errors': None})
+        return outcomes
+
+    @_instrumented_rule_execution
+    def _execute_table_rule(self, df, rule_idx, rule, planned_historical_aggregates, disable_inner_tqdm=True,
+                            filter_cache=None, local_history_df=None):
+        """테이블 레벨 규칙 1개를 실행하고 _execute_column_rule과 같은 형태의 결과를 반환합니다."""
+        filter_cache = filter_cache if filter_cache is not None else FilterMaskCache(df)
+        df_name_for_summary = getattr(df, 'attrs', {}).get('name', '')
+        outcome = {'errors': [], 'summary': None, 'rule_errors': None}
+        rule_type, params = rule['type'], rule.get('params', {}).copy()
+        params['rule_name'] = rule.get('name', f'table_{rule_type}_{rule_idx}')
+        if rule_idx in planned_historical_aggregates:
+            params['_planned_historical_aggregates'] = planned_historical_aggregates[rule_idx]
+        if local_history_df is not None and rule_type in self.historical_planner_rule_types:
+            params['_local_history_frame'] = local_history_df
+        severity = rule.get('severity', 'minor').lower()
+
+        current_filter_applied_table_str = params.get('current_data_filter', '')
+        df_for_this_rule_table = df
+        status_for_summary_table = 'Passed'
+        target_table_for_this_rule = params.get('table_name_in_db', df_name_for_summary)
+        if current_filter_applied_table_str and rule_type not in ['schema_change_check']:
+            try:
+                df_for_this_rule_table = filter_cache.frame(current_filter_applied_table_str)
+                if df_for_this_rule_table.empty and not df.empty:
+                    print(f"경고: 규칙 '{params['rule_name']}' 필터 적용 결과 데이터 없음.")
+            except Exception as e:
+                outcome['errors'].append(
+                    {'rule_type': rule_type, 'rule_name': params['rule_name'], 'error_type': 'CONFIG_ERROR',
+                     'message': f"필터 실행 오류: {e}", 'severity': severity})
+                outcome['summary'] = {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': None,
+                                      'target_table': target_table_for_this_rule,
+                                      'current_data_filter_applied': current_filter_applied_table_str,
+                                      'items_checked': 0, 'items_passed': 0, 'items_failed': 1,
+                                      'status': 'Error (Filter)', 'rule_severity': severity}
+                return outcome
+        items_checked_table = 0
+        outcome['rows_scanned'] = len(df_for_this_rule_table) if rule_type != 'schema_change_check' else 0
+        if rule_type == 'schema_change_check':
+            items_checked_table = 1
+        elif rule_type == 'consecutive_trend_check':
+            gb_cols = params.get('group_by_columns')
+            items_checked_table = (
+                df_for_this_rule_table.groupby(gb_cols, observed=True,
+                                               dropna=False).ngroups if not df_for_this_rule_table.empty and gb_cols and all(
+                    col in df_for_this_rule_table.columns for col in gb_cols) else 0
+            ) if gb_cols else 1
+        elif rule_type == 'conditional_check':
+            if_condition = params.get('if_condition', '1==0')
+            try:
+                # check_conditional도 같은 if_condition 결과를 사용하도록 params로 전달
+                items_checked_table = filter_cache.count(if_condition, current_filter_applied_table_str)
+                if params.get('if_condition'):
+                    params['_if_condition_frame'] = filter_cache.frame(if_condition, current_filter_applied_table_str)
+            except Exception:
+                items_checked_table = 0
+        elif not df_for_this_rule_table.empty or rule_type in ['total_row_count_trend', 'aggregate_value_trend']:
+            items_checked_table = len(df_for_this_rule_table) if rule_type in ['column_equality',
+                                                                               'duplicate_rows'] else (
+                1 if rule_type in ['aggregate_value_trend', 'total_row_count_trend'] else 0)
+
+        current_rule_errors = []
+        if rule_type in self.validation_functions and rule_type in self.table_level_rule_types:
+            func_args_table = [df_for_this_rule_table, params] if rule_type not in ['schema_change_check'] else [
+                None, params]
+            func_kwargs_table = {'q_processor': self.q_processor} if rule_type in ['aggregate_value_trend',
+                                                                                   'total_row_count_trend',
+                                                                                   'consecutive_trend_check',
+                                                                                   'schema_change_check'] else (
+                {'disable_tqdm': disable_inner_tqdm} if rule_type in ['column_equality', 'duplicate_rows',
+                                                                      'conditional_check'] else {})
+            snapshot_options = self._row_snapshot_options(params)
+            if rule_type in self.row_snapshot_rule_types and snapshot_options['batch_snapshots']:
+                func_kwargs_table['lazy_row_data'] = True
+
+            # df가 비어있어도 실행해야 하는 규칙들 예외 처리
+            if not (df_for_this_rule_table.empty and rule_type not in ['total_row_count_trend',
+                                                                       'aggregate_value_trend',
+                                                                       'consecutive_trend_check',
+                                                                       'schema_change_check']):
+                current_rule_errors = self.validation_functions[rule_type](*func_args_table, **func_kwargs_table)
+            else:
+                current_rule_errors = []
+
+        elif rule_type in self.table_level_rule_types:
+            outcome['errors'].append(
+                {'rule_type': rule_type, 'rule_name': params['rule_name'], 'error_type': 'UNKNOWN_RULE_TYPE',
+                 'message': f"알 수 없는 테이블 규칙: {rule_type}", 'severity': severity})
+            status_for_summary_table = 'Error (Unknown Rule)'
+
+        # duplicate_rows 그룹 오류/column_equality 생략 안내는 나타내는 행 수만큼 실패 항목으로 집계
+        items_failed_table = _failed_item_count(current_rule_errors) if current_rule_errors is not None else 1
+        if current_rule_errors is None:
+            current_rule_errors = [
+                {'rule_name': params['rule_name'], 'rule_type': rule_type, 'error_type': 'INTERNAL_ERROR',
+                 'message': f"검증 함수 {rule_type}가 None 반환"}]
+            status_for_summary_table = 'Error (Internal)'
+
+        items_passed_table = items_checked_table - items_failed_table if items_checked_table >= items_failed_table else 0
+        if status_for_summary_table == 'Passed' and items_failed_table > 0: status_for_summary_table = 'Failed'
+        if items_checked_table == 0 and status_for_summary_table == 'Passed': status_for_summary_table = 'Skipped (Filter Empty)' if current_filter_applied_table_str and df_for_this_rule_table.empty and not df.empty else (
+            'Skipped (No Data)' if df_for_this_rule_table.empty and not current_filter_applied_table_str else status_for_summary_table)
+
+        summary_item_details = {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': None,
+                                'target_table': target_table_for_this_rule,
+                                'current_data_filter_applied': current_filter_applied_table_str if rule_type != 'schema_change_check' else '',
+                                'items_checked': items_checked_table, 'items_passed': items_passed_table,
+                                'items_failed': items_failed_table, 'status': status_for_summary_table,
+                                'rule_severity': severity}
+
+        if rule_type == 'schema_change_check' and 'table_name_in_db' in params:
+            summary_item_details['target_table'] = params['table_name_in_db']
+
+        outcome['summary'] = summary_item_details
+        if current_rule_errors:
+            lazy_snapshot_rule = rule_type in self.row_snapshot_rule_types
+            outcome['rule_errors'] = (current_rule_errors, {'rule_type': rule_type, 'rule_name': params['rule_name'],
+                                                            'severity': severity},
+                                      dict(filter_str=current_filter_applied_table_str if rule_type != 'schema_change_check' else '',
+                                           row_source_df=df_for_this_rule_table if lazy_snapshot_rule else None,
+                                           **(self._row_snapshot_options(params) if lazy_snapshot_rule else {})))
+        return outcome
+
+    @staticmethod
+    def _apply_rule_outcome(all_errors, rule_execution_summary, outcome):
+        for err in outcome['errors']: all_errors.append(err)
+        if outcome['summary'] is not None: rule_execution_summary.append(outcome['summary'])
+        if outcome['rule_errors'] is not None:
+            rule_errors, meta_update, add_kwargs = outcome['rule_errors']
+            all_errors.add_rule_errors(rule_errors, meta_update, **add_kwargs)
+
+    def _validate_parallel(self, df, disable_outer_tqdm, disable_inner_tqdm):
+        """DB 대기 규칙은 스레드 풀, CPU 컬럼 검사는 프로세스 풀에서 실행하고 결과는 규칙 설정 순서대로 반환합니다."""
+        column_rules = self.rules_config.get('columns', {})
+        table_rules = self.rules_config.get('table_level_rules', [])
+        # 과거 조회 플래너 결과를 테이블 규칙에 넘겨야 하므로 규칙 제출 전에 먼저 조회
+        filter_cache = FilterMaskCache(df)
+        local_history_df = self._local_history_frame(df)
+        planned_historical_aggregates = self._plan_historical_queries(df, filter_cache, local_history_df)
 
-    def validate(self, df, disable_outer_tqdm=False, disable_inner_tqdm=True):
-        all_errors = []
+        tasks = []  # (실행 함수, 인자, 실행 위치) - 리스트 순서가 결과 반영 순서
+        for col_name, rules in column_rules.items():
+            if col_name not in df.columns:
+                tasks.extend((None, outcome, 'done') for outcome in self._missing_column_outcomes(df, col_name, rules))
+                continue
+            for rule_idx, rule in enumerate(rules):
+                rule_type, params = rule.get('type'), rule.get('params', {})
+                placement = 'io' if self._is_io_bound_rule(rule_type, params) else (
+                    'process' if self.process_workers and rule_type in self.process_pool_rule_types else 'inline')
+                tasks.append((functools.partial(self._execute_column_rule, filter_cache=filter_cache),
+                              (df, col_name, rule_idx, rule, disable_inner_tqdm), placement))
+        for rule_idx, rule in enumerate(table_rules):
+            placement = 'io' if self._is_io_bound_rule(rule.get('type'), rule.get('params', {})) else 'inline'
+            tasks.append((functools.partial(self._execute_table_rule, filter_cache=filter_cache,
+                                            local_history_df=local_history_df),
+                          (df, rule_idx, rule, planned_historical_aggregates, disable_inner_tqdm),
+                          placement))
+
+        outcomes = [None] * len(tasks)
+        failures = {}  # 작업 위치 -> 규칙 실행 중 발생한 예외
+        process_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.process_workers) if self.process_workers else None
+        pooled_task_count = sum(1 for task in tasks if task[2] in ['io', 'process'])
+        thread_workers = max(self.rule_workers or 1, self.process_workers or 0) if pooled_task_count else 1
+
+        def run_in_process(func, args, kwargs):
+            return process_pool.submit(func, *args, **kwargs).result()
+
+        # tracemalloc.reset_peak/최대 RSS는 프로세스 전역이라 동시에 실행되는 규칙의 할당이 섞이므로 규칙별 메모리 측정을 끔
+        self._concurrent_rule_execution = pooled_task_count > 0
+        if self._concurrent_rule_execution and self.track_rule_memory:
+            print("경고: 규칙 병렬 실행 중에는 규칙별 메모리 측정(track_rule_memory)을 하지 않습니다.")
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=thread_workers,
+                                                       thread_name_prefix='dqm-rule') as thread_pool:
+                futures = {}
+                for task_pos, (func, args, placement) in enumerate(tasks):
+                    if placement == 'done':
+                        outcomes[task_pos] = args
+                    elif placement == 'io':
+                        futures[task_pos] = thread_pool.submit(func, *args)
+                    elif placement == 'process':
+                        # 프로세스 풀 결과를 기다리는 동안 스레드만 점유 (필터/집계 요약은 현재 프로세스에서 계산)
+                        futures[task_pos] = thread_pool.submit(func, *args, run_check=run_in_process)
+                # DB 대기 중인 규칙과 겹치도록 나머지 규칙은 현재 스레드에서 바로 실행
+                for task_pos, (func, args, placement) in enumerate(tasks):
+                    if placement != 'inline': continue
+                    try:
+                        outcomes[task_pos] = func(*args)
+                    except Exception as e:
+                        failures[task_pos] = e
+                for task_pos, future in tqdm(futures.items(), desc="병렬 검증 결과 수집", unit="룰",
+                                             disable=disable_outer_tqdm or not futures):
+                    try:
+                        outcomes[task_pos] = future.result()
+                    except Exception as e:
+                        failures[task_pos] = e
+        finally:
+            self._concurrent_rule_execution = False
+            if process_pool is not None: process_pool.shutdown()
+        # 순차 실행(validate)과 같이 규칙 실행 예외는 호출자에게 전달 (규칙 설정 순서상 처음 실패한 규칙의 예외)
+        if failures: raise failures[min(failures)]
+
+        all_errors = ValidationResult()
         rule_execution_summary = []
-        df_name_for_summary = getattr(df, 'attrs', {}).get('name', '')
+        for outcome in outcomes:
+            self._apply_rule_outcome(all_errors, rule_execution_summary, outcome)
+        return all_errors, rule_execution_summary
+
+    @_validation_entry_point
+    def validate(self, df, disable_outer_tqdm=False, disable_inner_tqdm=True, as_result=False):
+        """df를 검증해 (오류 목록, rule_execution_summary)를 반환합니다 (as_result=True이면 오류 목록을 ValidationResult로)."""
+        if (self.rule_workers or 1) > 1 or self.process_workers:
+            all_errors, rule_execution_summary = self._validate_parallel(df, disable_outer_tqdm, disable_inner_tqdm)
+            return (all_errors if as_result else all_errors.to_list()), rule_execution_summary
+
+        all_errors = ValidationResult()
+        rule_execution_summary = []
+        filter_cache = FilterMaskCache(df)  # 같은 current_data_filter를 쓰는 규칙들이 필터 결과를 공유
 
         column_rules = self.rules_config.get('columns', {})
         for col_name, rules in tqdm(column_rules.items(), desc="컬럼별 검증 진행", unit="컬럼",
                                     disable=disable_outer_tqdm or not column_rules):
 
             if col_name not in df.columns:
-                for rule_idx, rule_def in enumerate(rules):
-                    rule_type_def = rule_def.get('type', 'N/A')
-                    rule_name_def = rule_def.get('name', f'{col_name}_{rule_type_def}_{rule_idx}')
-                    severity = rule_def.get('severity', 'minor').lower()
-                    all_errors.append(
-                        {'column': col_name, 'rule_name': rule_name_def, 'rule_type': rule_type_def,
-                         'error_type': 'COLUMN_NOT_FOUND',
-                         'message': f"컬럼 '{col_name}' 없음", 'severity': severity})
-                    rule_execution_summary.append(
-                        {'rule_name': rule_name_def, 'rule_type': rule_type_def, 'target_column': col_name,
-                         'target_table': df_name_for_summary,
-                         'current_data_filter_applied': rule_def.get('params', {}).get('current_data_filter', ''),
-                         'items_checked': 0, 'items_passed': 0, 'items_failed': 1, 'status': 'Error (Config)',
-                         'rule_severity': severity}
-                    )
+                for outcome in self._missing_column_outcomes(df, col_name, rules):
+                    self._apply_rule_outcome(all_errors, rule_execution_summary, outcome)
                 continue
 
             for rule_idx, rule in enumerate(rules):
-                severity = rule.get('severity', 'minor').lower()
-                rule_type, params = rule['type'], rule.get('params', {}).copy()
-                params['rule_name'] = rule.get('name', f'{col_name}_{rule_type}_{rule_idx}')
-                current_filter_applied_str = params.get('current_data_filter', '')
-                df_for_this_rule = df
-                if current_filter_applied_str:
-                    try:
-                        df_for_this_rule = df.query(current_filter_applied_str)
-                        if df_for_this_rule.empty and not df.empty:
-                            print(f"경고: 규칙 '{params['rule_name']}' 필터 적용 결과 데이터 없음.")
-                    except Exception as e:
-                        all_errors.append(
-                            {'column': col_name, 'rule_type': rule_type, 'rule_name': params['rule_name'],
-                             'error_type': 'CONFIG_ERROR',
-                             'message': f"필터 실행 오류: {e}", 'severity': severity}
-                        )
-                        rule_execution_summary.append(
-                            {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': col_name,
-                             'target_table': df_name_for_summary,
-                             'current_data_filter_applied': current_filter_applied_str, 'items_checked': 0,
-                             'items_passed': 0, 'items_failed': 1, 'status': 'Error (Filter)',
-                             'rule_severity': severity}
-                        )
-                        continue
-                items_checked = 0
-                series_for_check = df_for_this_rule.get(col_name)
-                status_for_summary = 'Passed'
-                if series_for_check is None and rule_type not in self.table_level_rule_types:
-                    all_errors.append({'column': col_name, 'rule_name': params['rule_name'], 'rule_type': rule_type,
-                                       'error_type': 'COLUMN_NOT_FOUND_AFTER_FILTER',
-                                       'message': f"필터 후 컬럼 '{col_name}' 없음", 'severity': severity})
-                    status_for_summary = 'Error (Config)'
-                elif series_for_check is not None:
-                    if rule_type == 'not_null':
-                        items_checked = len(series_for_check)
-                    elif rule_type in ['regex_pattern', 'allowed_values']:
-                        items_checked = len(series_for_check.dropna())
-                    elif rule_type == 'numeric_range':
-                        items_checked = len(series_for_check)
-                    elif rule_type == 'numeric_volatility':
-                        items_checked = len(pd.to_numeric(series_for_check, errors='coerce').dropna())
-                    elif rule_type == 'distribution_change':
-                        items_checked = 1
-                current_rule_errors = []
-                if rule_type in self.validation_functions and rule_type not in self.table_level_rule_types:
-                    if series_for_check is not None:
-                        func_args = [series_for_check, col_name, params];
-                        func_kwargs = {'disable_tqdm': disable_inner_tqdm} if rule_type in ['not_null', 'regex_pattern',
-                                                                                            'allowed_values',
-                                                                                            'numeric_range'] else {}
-                        if rule_type == 'numeric_volatility':
-                            func_kwargs.update({'q_processor': self.q_processor, 'full_current_df': df_for_this_rule})
-                        elif rule_type == 'distribution_change':
-                            func_kwargs['q_processor'] = self.q_processor
-                        current_rule_errors = self.validation_functions[rule_type](*func_args, **func_kwargs)
-                elif rule_type not in self.table_level_rule_types:
-                    all_errors.append({'column': col_name, 'rule_type': rule_type, 'rule_name': params['rule_name'],
-                                       'error_type': 'UNKNOWN_RULE_TYPE',
-                                       'message': f"알 수 없는 컬럼 규칙: {rule_type}", 'severity': severity});
-                    status_for_summary = 'Error (Unknown Rule)'
-                items_failed = (1 if current_rule_errors else 0) if rule_type == 'distribution_change' else (
-                    len(current_rule_errors) if current_rule_errors is not None else 1)
-                if current_rule_errors is None: current_rule_errors = [
-                    {'column': col_name, 'rule_name': params['rule_name'], 'rule_type': rule_type,
-                     'error_type': 'INTERNAL_ERROR',
-                     'message': f"검증 함수 {rule_type}가 None 반환"}]; status_for_summary = 'Error (Internal)'
-                items_passed = items_checked - items_failed if items_checked >= items_failed else 0
-                if status_for_summary == 'Passed' and items_failed > 0: status_for_summary = 'Failed'
-                if items_checked == 0 and status_for_summary == 'Passed': status_for_summary = 'Skipped (Filter Empty)' if current_filter_applied_str and df_for_this_rule.empty and not df.empty else (
-                    'Skipped (No Data in Series)' if series_for_check is not None and series_for_check.empty else status_for_summary)
-                rule_execution_summary.append(
-                    {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': col_name,
-                     'target_table': df_name_for_summary, 'current_data_filter_applied': current_filter_applied_str,
-                     'items_checked': items_checked, 'items_passed': items_passed, 'items_failed': items_failed,
-                     'status': status_for_summary, 'rule_severity': severity})
-                if current_rule_errors:
-                    for err in current_rule_errors:
-                        err.update({'rule_type': rule_type, 'rule_name': params['rule_name'], 'column': col_name,
-                                    'severity': severity})
-                        if current_filter_applied_str: err['current_data_filter_applied'] = current_filter_applied_str
-                        if 'row_index' in err and err[
-                            'row_index'] in df_for_this_rule.index and 'error_row_data' not in err:
-                            try:
-                                err['error_row_data'] = df_for_this_rule.loc[err['row_index']].to_dict()
-                            except KeyError:
-                                print(f"경고: 오류 행 데이터 조회 실패 (필터: {current_filter_applied_str}, 인덱스: {err['row_index']})")
-                    all_errors.extend(current_rule_errors)
+                self._apply_rule_outcome(all_errors, rule_execution_summary,
+                                         self._execute_column_rule(df, col_name, rule_idx, rule, disable_inner_tqdm,
+                                                                   filter_cache=filter_cache))
 
         table_rules = self.rules_config.get('table_level_rules', [])
+        local_history_df = self._local_history_frame(df)
+        planned_historical_aggregates = self._plan_historical_queries(df, filter_cache, local_history_df)
         for rule_idx, rule in tqdm(enumerate(table_rules), desc="테이블 레벨 검증 진행", unit="룰",
                                    disable=disable_outer_tqdm or not table_rules):
-            rule_type, params = rule['type'], rule.get('params', {}).copy()
-            params['rule_name'] = rule.get('name', f'table_{rule_type}_{rule_idx}')
-            severity = rule.get('severity', 'minor').lower()
-
-            current_filter_applied_table_str = params.get('current_data_filter', '')
-            df_for_this_rule_table = df
-            status_for_summary_table = 'Passed'
-            target_table_for_this_rule = params.get('table_name_in_db', df_name_for_summary)
-            if current_filter_applied_table_str and rule_type not in ['schema_change_check']:
-                try:
-                    df_for_this_rule_table = df.query(current_filter_applied_table_str)
-                    if df_for_this_rule_table.empty and not df.empty:
-                        print(f"경고: 규칙 '{params['rule_name']}' 필터 적용 결과 데이터 없음.")
-                except Exception as e:
-                    all_errors.append(
-                        {'rule_type': rule_type, 'rule_name': params['rule_name'], 'error_type': 'CONFIG_ERROR',
-                         'message': f"필터 실행 오류: {e}", 'severity': severity})
-                    rule_execution_summary.append(
-                        {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': None,
-                         'target_table': target_table_for_this_rule,
-                         'current_data_filter_applied': current_filter_applied_table_str, 'items_checked': 0,
-                         'items_passed': 0, 'items_failed': 1, 'status': 'Error (Filter)', 'rule_severity': severity}
-                    )
+            self._apply_rule_outcome(all_errors, rule_execution_summary,
+                                     self._execute_table_rule(df, rule_idx, rule, planned_historical_aggregates,
+                                                              disable_inner_tqdm, filter_cache=filter_cache,
+                                                              local_history_df=local_history_df))
+        return (all_errors if as_result else all_errors.to_list()), rule_execution_summary
+
+    @_validation_entry_point
+    def validate_chunks(self, chunks, disable_outer_tqdm=False, disable_inner_tqdm=True, as_result=False,
+                        on_chunk_errors=None, dataset_name=None):
+        """DataFrame 청크 iterable(또는 iterator를 돌려주는 함수)을 검증해 validate()와 같은 결과를 반환합니다 (청크 간 행 인덱스 중복 불가)."""
+        reiterable_chunks = callable(chunks) or isinstance(chunks, (list, tuple))
+
+        def iterate_chunks():
+            return iter(chunks() if callable(chunks) else chunks)
+
+        column_rules = self.rules_config.get('columns', {})
+        tasks = []  # validate()와 같은 결과 반영 순서 (컬럼 규칙 → 테이블 규칙)
+        for col_name, rules in column_rules.items():
+            for rule_idx, rule in enumerate(rules):
+                tasks.append({'kind': 'column', 'col_name': col_name, 'rule_idx': rule_idx, 'rule': rule,
+                              'final': rule.get('type') in self.chunk_final_rule_types})
+        for rule_idx, rule in enumerate(self.rules_config.get('table_level_rules', [])):
+            tasks.append({'kind': 'table', 'col_name': None, 'rule_idx': rule_idx, 'rule': rule,
+                          'final': rule.get('type') in self.chunk_final_rule_types or rule.get(
+                              'type') not in self.validation_functions})
+        for task in tasks:
+            rule_type, params = task['rule'].get('type'), task['rule'].get('params', {})
+            task.update({'errors': [], 'statuses': [], 'items_checked': 0, 'summary': None, 'frozen': False,
+                         'non_row_error_keys': set(), 'accumulate_seconds': 0.0, 'rows_scanned': 0,
+                         'filter': '' if rule_type == 'schema_change_check' else params.get('current_data_filter', ''),
+                         'snapshot_remaining': self._row_snapshot_options(params)['snapshot_max_rows']})
+            if rule_type == 'duplicate_rows': task['tracker'] = _DuplicateRowTracker(not reiterable_chunks)
+            if rule_type == 'column_equality': task['mismatch_samples_remaining'] = params.get('max_mismatch_samples')
+            if rule_type == 'distribution_change': task['accumulator'] = _FrequencyAccumulator()
+            if rule_type in self.historical_planner_rule_types:
+                task.update({'partials': {}, 'unsupported': False, 'latest_date': None})
+
+        # 마지막 단계 규칙에 넘길 필터별 대표 행 (비어 있는지 여부, consecutive_trend_check의 그룹 수/최신 날짜 보존용)
+        representative_rows = {expr: {'head': None, 'groups': {}, 'latest': {}}
+                               for expr in {''} | {task['filter'] for task in tasks if task['final']}}
+        empty_frame, chunk_count, total_rows = None, 0, 0
+        original_q_processor = self.q_processor
+        if self.q_processor is not None: self.q_processor = _RunQueryMemo(self.q_processor)
+        try:
+            for chunk_no, chunk in enumerate(tqdm(iterate_chunks(), desc="청크별 검증 진행", unit="청크",
+                                                  disable=disable_outer_tqdm)):
+                chunk_count += 1
+                total_rows += len(chunk)
+                if dataset_name is None: dataset_name = getattr(chunk, 'attrs', {}).get('name', '')
+                if dataset_name and chunk.attrs.get('name') != dataset_name:
+                    chunk = chunk.copy(deep=False)  # 호출자의 청크 attrs는 바꾸지 않음
+                    chunk.attrs['name'] = dataset_name
+                if empty_frame is None: empty_frame = chunk.iloc[:0]
+                filter_cache = FilterMaskCache(chunk)
+                chunk_errors = []
+                for task in tasks:
+                    if task['frozen']: continue
+                    if task['final']:
+                        accumulate_start = time.perf_counter()
+                        self._accumulate_chunk(task, chunk, filter_cache)
+                        task['accumulate_seconds'] += time.perf_counter() - accumulate_start
+                        try:
+                            task['rows_scanned'] += filter_cache.count(task['filter']) if task['filter'] else len(chunk)
+                        except Exception:
+                            pass  # 필터 오류는 마지막 단계 규칙 실행 시 보고
+                    else:
+                        if task.get('tracker') is not None: task['tracker'].chunk_no = chunk_no
+                        chunk_errors.extend(self._run_chunk_rule(task, chunk, filter_cache, disable_inner_tqdm))
+                for expr, state in representative_rows.items():
+                    if not isinstance(state, Exception):
+                        representative_rows[expr] = self._update_representative_rows(expr, state, chunk,
+                                                                                     filter_cache, tasks)
+                if on_chunk_errors is not None and chunk_errors: on_chunk_errors(chunk_no, chunk_errors)
+            if chunk_count == 0:
+                print("정보: 검증할 청크가 없습니다. 빈 데이터로 검증합니다.")
+                self.q_processor = original_q_processor
+                return self.validate(pd.DataFrame(), disable_outer_tqdm, disable_inner_tqdm, as_result)
+
+            stub_frames = {}
+            for expr, state in representative_rows.items():
+                if isinstance(state, Exception):
+                    stub_frames[expr] = state
                     continue
-            items_checked_table = 0
-            if rule_type == 'schema_change_check':
-                items_checked_table = 1
-            elif rule_type == 'consecutive_trend_check':
-                gb_cols = params.get('group_by_columns')
-                items_checked_table = (
-                    df_for_this_rule_table.groupby(gb_cols, observed=True,
-                                                   dropna=False).ngroups if not df_for_this_rule_table.empty and gb_cols and all(
-                        col in df_for_this_rule_table.columns for col in gb_cols) else 0
-                ) if gb_cols else 1
-            elif rule_type == 'conditional_check':
-                if_condition = params.get('if_condition', '1==0')
-                try:
-                    items_checked_table = len(df_for_this_rule_table.query(if_condition))
-                except Exception:
-                    items_checked_table = 0
-            elif not df_for_this_rule_table.empty or rule_type in ['total_row_count_trend', 'aggregate_value_trend']:
-                items_checked_table = len(df_for_this_rule_table) if rule_type in ['column_equality',
-                                                                                   'duplicate_rows'] else (
-                    1 if rule_type in ['aggregate_value_trend', 'total_row_count_trend'] else 0)
-
-            current_rule_errors = []
-            if rule_type in self.validation_functions and rule_type in self.table_level_rule_types:
-                func_args_table = [df_for_this_rule_table, params] if rule_type not in ['schema_change_check'] else [
-                    None, params]
-                func_kwargs_table = {'q_processor': self.q_processor} if rule_type in ['aggregate_value_trend',
-                                                                                       'total_row_count_trend',
-                                                                                       'consecutive_trend_check',
-                                                                                       'schema_change_check'] else (
-                    {'disable_tqdm': disable_inner_tqdm} if rule_type in ['column_equality', 'duplicate_rows',
-                                                                          'conditional_check'] else {})
-
-                # df가 비어있어도 실행해야 하는 규칙들 예외 처리
-                if not (df_for_this_rule_table.empty and rule_type not in ['total_row_count_trend',
-                                                                           'aggregate_value_trend',
-                                                                           'consecutive_trend_check',
-                                                                           'schema_change_check']):
-                    current_rule_errors = self.validation_functions[rule_type](*func_args_table, **func_kwargs_table)
+                parts = ([state['head']] if state['head'] is not None else []) + list(state['groups'].values()) + [
+                    row for _, row in state['latest'].values()]
+                stub_frame = pd.concat(parts) if parts else empty_frame
+                stub_frames[expr] = stub_frame[~stub_frame.index.duplicated()]
+                stub_frames[expr].attrs['name'] = dataset_name or ''
+            stub_df, filter_stub = stub_frames[''], _ChunkFilterStub(stub_frames)
+            planned_historical_aggregates = self._plan_historical_queries(stub_df, filter_stub)
+            final_errors = []
+            for task in tasks:
+                if task.get('tracker') is not None and not task['frozen']:
+                    final_errors.extend(self._finalize_duplicate_task(
+                        task, iterate_chunks if reiterable_chunks else None))
+                if not task['final'] or task['frozen']: continue
+                rule = self._rule_with_chunk_state(task)
+                if task['kind'] == 'column' and task['col_name'] not in stub_df.columns:
+                    outcome = self._missing_column_outcomes(stub_df, task['col_name'],
+                                                            column_rules[task['col_name']])[task['rule_idx']]
+                elif task['kind'] == 'column':
+                    outcome = self._execute_column_rule(stub_df, task['col_name'], task['rule_idx'], rule,
+                                                        disable_inner_tqdm, filter_cache=filter_stub)
                 else:
-                    current_rule_errors = []
-
-            elif rule_type in self.table_level_rule_types:
-                all_errors.append(
-                    {'rule_type': rule_type, 'rule_name': params['rule_name'], 'error_type': 'UNKNOWN_RULE_TYPE',
-                     'message': f"알 수 없는 테이블 규칙: {rule_type}", 'severity': severity})
-                status_for_summary_table = 'Error (Unknown Rule)'
-
-            items_failed_table = len(current_rule_errors) if current_rule_errors is not None else 1
-            if current_rule_errors is None:
-                current_rule_errors = [
-                    {'rule_name': params['rule_name'], 'rule_type': rule_type, 'error_type': 'INTERNAL_ERROR',
-                     'message': f"검증 함수 {rule_type}가 None 반환"}]
-                status_for_summary_table = 'Error (Internal)'
-
-            items_passed_table = items_checked_table - items_failed_table if items_checked_table >= items_failed_table else 0
-            if status_for_summary_table == 'Passed' and items_failed_table > 0: status_for_summary_table = 'Failed'
-            if items_checked_table == 0 and status_for_summary_table == 'Passed': status_for_summary_table = 'Skipped (Filter Empty)' if current_filter_applied_table_str and df_for_this_rule_table.empty and not df.empty else (
-                'Skipped (No Data)' if df_for_this_rule_table.empty and not current_filter_applied_table_str else status_for_summary_table)
-
-            summary_item_details = {'rule_name': params['rule_name'], 'rule_type': rule_type, 'target_column': None,
-                                    'target_table': target_table_for_this_rule,
-                                    'current_data_filter_applied': current_filter_applied_table_str if rule_type != 'schema_change_check' else '',
-                                    'items_checked': items_checked_table, 'items_passed': items_passed_table,
-                                    'items_failed': items_failed_table, 'status': status_for_summary_table,
-                                    'rule_severity': severity}
-
-            if rule_type == 'schema_change_check' and 'table_name_in_db' in params:
-                summary_item_details['target_table'] = params['table_name_in_db']
-
-            rule_execution_summary.append(summary_item_details)
-            if current_rule_errors:
-                for err in current_rule_errors:
-                    err.update({'rule_type': rule_type, 'rule_name': params['rule_name'], 'severity': severity})
-                    if current_filter_applied_table_str and rule_type != 'schema_change_check':
-                        err['current_data_filter_applied'] = current_filter_applied_table_str
-                all_errors.extend(current_rule_errors)
-        return all_errors, rule_execution_summary
+                    outcome = self._execute_table_rule(stub_df, task['rule_idx'], rule,
+                                                       planned_historical_aggregates, disable_inner_tqdm,
+                                                       filter_cache=filter_stub)
+                task['errors'], task['summary'] = self._materialize_outcome(outcome)
+                if 'execution_seconds' in task['summary']:
+                    # 청크별 부분 집계 시간과 전체 청크 행 수를 반영 (schema_change_check는 validate()처럼 0)
+                    task['summary']['rows_scanned'] = 0
+                    _merge_rule_metrics(task['summary'], {
+                        'execution_seconds': task['accumulate_seconds'],
+                        'rows_scanned': task['rows_scanned'] if task['rule'].get('type') != 'schema_change_check' else 0})
+                task['frozen'] = True
+                final_errors.extend(task['errors'])
+            if on_chunk_errors is not None and final_errors: on_chunk_errors(None, final_errors)
+        finally:
+            self.q_processor = original_q_processor
+
+        all_errors = ValidationResult()
+        rule_execution_summary = []
+        for task in tasks:
+            if not task['frozen']: self._merge_chunk_summary(task)
+            for err in task['errors']: all_errors.append(err)
+            rule_execution_summary.append(task['summary'])
+        print(f"정보: 청크 단위 검증 완료 - 청크 {chunk_count}개, 총 {total_rows}행.")
+        return (all_errors if as_result else all_errors.to_list()), rule_execution_summary
+
+    def _materialize_outcome(self, outcome):
+        """규칙 실행 결과 1건을 (오류 dict 목록, 요약 dict)로 만듭니다 (error_row_data 생성 포함)."""
+        outcome_result, outcome_summary = ValidationResult(), []
+        self._apply_rule_outcome(outcome_result, outcome_summary, outcome)
+        return outcome_result.to_list(), outcome_summary[0]
+
+    def _run_chunk_rule(self, task, chunk, filter_cache, disable_inner_tqdm):
+        """행 단위 규칙을 청크 1개에 실행해 규칙별 누적 결과에 반영하고, 이번 청크에서 새로 나온 오류 목록을 반환합니다."""
+        rule = task['rule']
+        if task.get('tracker') is not None:
+            rule = {**rule, 'params': {**rule.get('params', {}), '_duplicate_row_tracker': task['tracker']}}
+        if rule.get('type') == 'column_equality' and task.get('mismatch_samples_remaining') is not None:
+            # 불일치 샘플 상한은 청크 전체 기준 (생략 안내는 마지막에 1건으로 합침)
+            rule = {**rule, 'params': {**rule.get('params', {}),
+                                       'max_mismatch_samples': task['mismatch_samples_remaining']}}
+        if task['kind'] == 'column' and task['col_name'] not in chunk.columns:
+            outcome = self._missing_column_outcomes(chunk, task['col_name'],
+                                                    self.rules_config['columns'][task['col_name']])[task['rule_idx']]
+        elif task['kind'] == 'column':
+            outcome = self._execute_column_rule(chunk, task['col_name'], task['rule_idx'], rule, disable_inner_tqdm,
+                                                filter_cache=filter_cache)
+        else:
+            outcome = self._execute_table_rule(chunk, task['rule_idx'], rule, {}, disable_inner_tqdm,
+                                               filter_cache=filter_cache)
+        if outcome['rule_errors'] is not None and task['snapshot_remaining'] is not None:
+            outcome['rule_errors'][2]['snapshot_max_rows'] = task['snapshot_remaining']  # 행 스냅샷 상한은 청크 전체 기준
+        chunk_errors, summary = self._materialize_outcome(outcome)
+        if summary['status'].startswith('Error'):
+            # 설정/필터 오류는 청크와 무관하므로 첫 결과만 남기고 이후 청크에서는 실행하지 않음
+            task.update({'errors': chunk_errors, 'summary': summary, 'frozen': True})
+            return chunk_errors
+        if task['snapshot_remaining'] is not None:
+            task['snapshot_remaining'] -= sum(1 for err in chunk_errors if 'error_row_data' in err)
+        new_errors = []
+        for err in chunk_errors:
+            if err.get('error_type') == 'COLUMN_MISMATCH_TRUNCATED':
+                truncated = task.setdefault('truncated_mismatch',
+                                            {**err, 'mismatch_count': 0, 'omitted_mismatch_count': 0})
+                truncated['omitted_mismatch_count'] += err['omitted_mismatch_count']
+                continue
+            if err.get('error_type') == 'COLUMN_MISMATCH' and task.get('mismatch_samples_remaining') is not None:
+                task['mismatch_samples_remaining'] -= 1
+            if 'row_index' not in err:
+                # 행과 무관한 오류(과거 프로파일 조회 실패 등)는 청크마다 반복되므로 한 번만 기록
+                error_key = (err.get('error_type'), err.get('message'))
+                if error_key in task['non_row_error_keys']: continue
+                task['non_row_error_keys'].add(error_key)
+            new_errors.append(err)
+        task['errors'].extend(new_errors)
+        task['items_checked'] += summary['items_checked']
+        task['statuses'].append(summary['status'])
+        if task['summary'] is None:
+            task['summary'] = summary
+        else:
+            _merge_rule_metrics(task['summary'], summary)
+        return new_errors
+
+    @staticmethod
+    def _merge_chunk_summary(task):
+        truncated = task.pop('truncated_mismatch', None)
+        if truncated is not None:
+            shown_count = sum(1 for err in task['errors'] if err.get('error_type') == 'COLUMN_MISMATCH')
+            truncated['mismatch_count'] = shown_count + truncated['omitted_mismatch_count']
+            columns = truncated['columns']
+            truncated['message'] = (f"컬럼 '{columns[0]}'과 '{columns[1]}' 불일치 총 {truncated['mismatch_count']}건 중 "
+                                    f"{shown_count}건만 기록했습니다 (max_mismatch_samples).")
+            task['errors'].append(truncated)
+        items_checked, items_failed = task['items_checked'], _failed_item_count(task['errors'])
+        status = 'Failed' if items_failed else next(
+            (s for s in ['Passed', 'Skipped (Filter Empty)', 'Skipped (No Data in Series)', 'Skipped (No Data)'] if
+             s in task['statuses']), task['statuses'][0])
+        task['summary'] = {**task['summary'], 'items_checked': items_checked, 'items_failed': items_failed,
+                           'items_passed': items_checked - items_failed if items_checked >= items_failed else 0,
+                           'status': status}
+
+    def _accumulate_chunk(self, task, chunk, filter_cache):
+        """마지막 단계 규칙의 현재 데이터 누적값(분포/집계/최신 기간 집계)을 청크 1개로 갱신합니다."""
+        rule_type, params = task['rule'].get('type'), task['rule'].get('params', {})
+        if rule_type not in ['distribution_change'] + self.historical_planner_rule_types: return
+        try:
+            filtered = filter_cache.frame(task['filter']) if task['filter'] else chunk
+        except Exception:
+            return  # 필터 오류는 마지막 단계 실행에서 Error (Filter)로 보고
+        if rule_type == 'distribution_change':
+            task['accumulator'].update(filtered.get(task['col_name']))
+            return
+        if task['unsupported']: return
+        group_by_columns = params.get('group_by_columns')
+        if group_by_columns and not isinstance(group_by_columns, list):
+            task['unsupported'] = True  # 병합하지 않고 검증 함수가 설정 오류를 보고하도록 둠
+            return
+        if rule_type in ['aggregate_value_trend', 'total_row_count_trend']:
+            if rule_type == 'total_row_count_trend':
+                agg_col, agg_func = params.get('count_aggregate_column', '1'), 'COUNT'
+            else:
+                agg_col, agg_func = params.get('column_to_aggregate'), params.get('aggregate_function', 'SUM').upper()
+            partials = _current_aggregate_partials(filtered, agg_col, agg_func, group_by_columns) if agg_func in [
+                'SUM', 'AVG', 'COUNT'] else None
+        else:
+            date_col = params.get('date_column_for_trend')
+            if date_col not in filtered.columns:
+                task['unsupported'] = True
+                return
+            dates = _parse_trend_dates(filtered[date_col], params.get('date_column_format', 'YYYYMMDD').upper())
+            chunk_latest = dates.max()
+            if pd.isna(chunk_latest): return
+            if task['latest_date'] is not None and chunk_latest < task['latest_date']: return
+            if task['latest_date'] is None or chunk_latest > task['latest_date']:
+                task['latest_date'], task['partials'] = chunk_latest, {}
+            partials = _current_aggregate_partials(filtered[(dates == chunk_latest).to_numpy()],
+                                                   params.get('column_to_aggregate'),
+                                                   params.get('aggregate_function', 'SUM').upper(), group_by_columns,
+                                                   grouped_count_non_null=True)
+        if partials is None:
+            task['unsupported'] = True
+        else:
+            _merge_aggregate_partials(task['partials'], partials)
+
+    def _update_representative_rows(self, expr, state, chunk, filter_cache, tasks):
+        try:
+            filtered = filter_cache.frame(expr) if expr else chunk
+        except Exception as e:
+            return e
+        if filtered.empty: return state
+        if state['head'] is None: state['head'] = filtered.head(1)
+        for task in tasks:
+            if task['filter'] != expr or task['rule'].get('type') != 'consecutive_trend_check': continue
+            params = task['rule'].get('params', {})
+            group_by_columns = params.get('group_by_columns')
+            if isinstance(group_by_columns, list) and group_by_columns and all(
+                    col in filtered.columns for col in group_by_columns):
+                # 규칙 요약의 items_checked(그룹 수)용: 그룹별 첫 행
+                group_key = tuple(group_by_columns)
+                group_rows = filtered.drop_duplicates(subset=group_by_columns)
+                if group_key in state['groups']:
+                    group_rows = pd.concat([state['groups'][group_key], group_rows]).drop_duplicates(
+                        subset=group_by_columns)
+                state['groups'][group_key] = group_rows
+            date_col = params.get('date_column_for_trend')
+            if date_col in filtered.columns:
+                # 과거 조회 플래너가 최신 날짜를 정할 수 있도록 최신 날짜 행 1개
+                date_key = (date_col, params.get('date_column_format', 'YYYYMMDD').upper())
+                dates = _parse_trend_dates(filtered[date_col], date_key[1])
+                chunk_latest = dates.max()
+                if pd.notna(chunk_latest) and (date_key not in state['latest'] or chunk_latest > state['latest'][
+                    date_key][0]):
+                    state['latest'][date_key] = (chunk_latest, filtered.iloc[[int(np.argmax(dates.to_numpy() == chunk_latest))]])
+        return state
+
+    def _rule_with_chunk_state(self, task):
+        rule_type, params = task['rule'].get('type'), dict(task['rule'].get('params', {}))
+        if rule_type == 'distribution_change':
+            params['_current_profile'] = task['accumulator'].profile()
+        elif rule_type in ['aggregate_value_trend', 'total_row_count_trend'] and not task['unsupported']:
+            agg_func = 'COUNT' if rule_type == 'total_row_count_trend' else params.get('aggregate_function',
+                                                                                       'SUM').upper()
+            params['_current_aggregates'] = _finalize_aggregate_partials(task['partials'], agg_func)
+        elif rule_type == 'consecutive_trend_check' and not task['unsupported']:
+            params['_current_trend_state'] = (task['latest_date'], _finalize_aggregate_partials(
+                task['partials'], params.get('aggregate_function', 'SUM').upper()))
+        return {**task['rule'], 'params': params}
+
+    def _finalize_duplicate_task(self, task, iterate_chunks=None):
+        """duplicate_rows 규칙의 청크 간 중복을 판정해 규칙 누적 결과에 반영하고 오류 목록을 반환합니다."""
+        candidates = task['tracker'].candidates()
+        if not candidates: return []
+        candidate_rows = None
+        if iterate_chunks is not None:
+            # 해시 후보 행이 있는 청크만 다시 읽어 키 값 확인과 error_row_data용 행을 모음
+            candidate_rows = []
+            for chunk_no, chunk in enumerate(iterate_chunks()):
+                if chunk_no not in candidates: continue
+                frame = FilterMaskCache(chunk).frame(task['filter']) if task['filter'] else chunk
+                candidate_rows.append(frame.iloc[candidates[chunk_no]])
+        dup_errors, error_rows = task['tracker'].finalize(candidate_rows)
+        if not dup_errors: return []
+        params = task['rule'].get('params', {})
+        snapshot_options = self._row_snapshot_options(params)
+        dup_rows_df = pd.concat(candidate_rows).iloc[error_rows] if candidate_rows is not None else None
+        if candidate_rows is None:
+            print(f"정보: 규칙 '{task['summary']['rule_name']}' - 청크를 다시 읽을 수 없어 중복 행의 error_row_data를 생략합니다.")
+        if dup_rows_df is not None and not snapshot_options['batch_snapshots']:
+            for row_pos, err in enumerate(dup_errors): err['error_row_data'] = dup_rows_df.iloc[row_pos].to_dict()
+        outcome = {'errors': [], 'summary': task['summary'], 'rule_errors': (
+            dup_errors, {'rule_type': 'duplicate_rows', 'rule_name': task['summary']['rule_name'],
+                         'severity': task['summary']['rule_severity']},
+            dict(filter_str=task['filter'], row_source_df=dup_rows_df, **snapshot_options))}
+        errors, _ = self._materialize_outcome(outcome)
+        task['errors'].extend(errors)
+        return errors
+
+    @_validation_entry_point
+    def validate_pushdown(self, table_name, partition_filter=None, engine='hive', sample_rows_per_rule=100,
+                          row_id_columns=None, disable_outer_tqdm=False, as_result=False):
+        """검증 대상 파티션을 내려받지 않고 DB 집계/샘플 쿼리로 검증합니다 (distribution_change/numeric_volatility/consecutive_trend_check 제외)."""
+        if not self.q_processor:
+            print("오류: push-down 검증에는 QueryProcessor가 필요합니다.")
+            return [{"error_type": "CONFIG_ERROR", "message": "push-down 검증용 QueryProcessor 누락"}], []
+        partition_sql = partition_filter or '1=1'
+        probe_df = self.q_processor.fetch_to_pandas(query=f"SELECT * FROM {table_name} WHERE 1=0", engine=engine,
+                                                    limit=None)
+        table_columns = [str(c).split('.')[-1] for c in probe_df.columns]
+        stub_df = pd.DataFrame(columns=table_columns)  # 컬럼 존재 확인/설정 오류 보고용 빈 DataFrame
+        stub_df.attrs['name'] = table_name
+        pushdown_rule_types = ['not_null', 'regex_pattern', 'allowed_values', 'numeric_range', 'column_equality',
+                               'duplicate_rows', 'conditional_check']
+        unsupported_rule_types = ['distribution_change', 'numeric_volatility', 'consecutive_trend_check']
+
+        tasks = []  # validate()와 같은 결과 반영 순서 (컬럼 규칙 → 테이블 규칙)
+        for col_name, rules in self.rules_config.get('columns', {}).items():
+            for rule_idx, rule in enumerate(rules):
+                tasks.append({'kind': 'column', 'col_name': col_name, 'rule_idx': rule_idx, 'rule': rule,
+                              'outcome': self._missing_column_outcomes(stub_df, col_name, rules)[
+                                  rule_idx] if col_name not in table_columns else None})
+        for rule_idx, rule in enumerate(self.rules_config.get('table_level_rules', [])):
+            tasks.append({'kind': 'table', 'col_name': None, 'rule_idx': rule_idx, 'rule': rule, 'outcome': None})
+
+        # 1) 행 단위 규칙을 하나의 집계 쿼리로 변환
+        filter_aliases, window_columns, count_columns = {}, [], []
+        for task in tasks:
+            rule_type, params = task['rule'].get('type'), task['rule'].get('params', {})
+            if task['outcome'] is not None or rule_type not in pushdown_rule_types: continue
+            try:
+                filter_sql = _rule_condition_sql(params, 'current_data_filter', table_columns)
+            except ValueError as e:
+                task['outcome'] = self._pushdown_config_outcome(task, table_name, f"필터 실행 오류: {e}",
+                                                                status='Error (Filter)')
+                continue
+            try:
+                compiled = _compile_pushdown_rule(rule_type, task['col_name'], params, table_columns)
+            except ValueError as e:
+                task['outcome'] = self._pushdown_config_outcome(task, table_name, f"push-down SQL 변환 불가: {e}")
+                continue
+            checked_sql, violations, window_partition = compiled
+            rule_no = len(count_columns)
+            if window_partition is not None:
+                # 중복 판정: 필터를 통과한 행만 세는 윈도 집계 (pandas의 필터 후 duplicated(keep=False)와 동일)
+                window_alias = f"dqm_dup_cnt_{rule_no}"
+                window_columns.append(f"SUM(CASE WHEN {filter_sql or '1=1'} THEN 1 ELSE 0 END) OVER "
+                                      f"(PARTITION BY {', '.join(window_partition)}) AS {window_alias}")
+                violations = [(error_type, cond.format(window_alias=window_alias)) for error_type, cond in violations]
+            filter_alias = filter_aliases.setdefault(filter_sql, f"dqm_f{len(filter_aliases)}")
+            task['pushdown'] = {'filter_sql': filter_sql or '1=1', 'filter_alias': filter_alias,
+                                'checked_alias': f"dqm_r{rule_no}_checked",
+                                'violation_aliases': [f"dqm_r{rule_no}_v{k}" for k in range(len(violations))],
+                                'violation_sql': ' OR '.join(f"({cond})" for _, cond in violations)}
+            count_columns.append(f"SUM(CASE WHEN ({filter_sql or '1=1'}) AND ({checked_sql}) THEN 1 ELSE 0 END) AS "
+                                 f"{task['pushdown']['checked_alias']}")
+            count_columns.extend(f"SUM(CASE WHEN ({filter_sql or '1=1'}) AND ({cond}) THEN 1 ELSE 0 END) AS {alias}"
+                                 for alias, (_, cond) in zip(task['pushdown']['violation_aliases'], violations))
+        if window_columns:
+            source_sql = (f"(SELECT dqm_t.*, {', '.join(window_columns)} FROM {table_name} dqm_t "
+                          f"WHERE {partition_sql}) dqm_src")
+            source_where = []
+        else:
+            source_sql, source_where = table_name, [partition_sql]
+
+        pushdown_tasks = [task for task in tasks if 'pushdown' in task]
+        counts = None
+        if pushdown_tasks:
+            filter_columns = [f"SUM(CASE WHEN {filter_sql or '1=1'} THEN 1 ELSE 0 END) AS {alias}" for filter_sql, alias in
+                              filter_aliases.items()]
+            count_query = (f"SELECT COUNT(1) AS dqm_total_rows, {', '.join(filter_columns + count_columns)} "
+                           f"FROM {source_sql}" + (f" WHERE {' AND '.join(source_where)}" if source_where else ''))
+            try:
+                count_df = self.q_processor.fetch_to_pandas(query=count_query, engine=engine, limit=None)
+                count_df.columns = [str(c).split('.')[-1].lower() for c in count_df.columns]
+                counts = {k: int(v) if pd.notna(v) else 0 for k, v in count_df.iloc[0].items()}
+            except Exception as e:
+                print(f"경고: push-down 집계 쿼리 실행 실패: {e}")
+                for task in pushdown_tasks:
+                    task['outcome'] = self._pushdown_config_outcome(task, table_name, f"push-down 집계 쿼리 실행 실패: {e}",
+                                                                    error_type='QUERY_EXECUTION_ERROR',
+                                                                    status='Error (Query)')
+
+        # 2) 규칙별 결과 생성 (위반 행 샘플은 validate와 같은 검증 함수로 오류 dict 생성)
+        planned_historical_aggregates = self._plan_historical_queries(stub_df)
+        for task in tqdm(tasks, desc="push-down 검증 진행", unit="룰", disable=disable_outer_tqdm):
+            if task['outcome'] is not None: continue
+            rule_type, params = task['rule'].get('type'), task['rule'].get('params', {})
+            if 'pushdown' in task:
+                task['outcome'] = self._pushdown_rule_outcome(task, counts, table_name, source_sql, source_where,
+                                                              engine, sample_rows_per_rule, row_id_columns)
+            elif rule_type in unsupported_rule_types:
+                print(f"정보: 규칙 '{task['rule'].get('name', rule_type)}' - push-down 검증 미지원 유형({rule_type}), 건너뜀.")
+                task['outcome'] = self._pushdown_config_outcome(task, table_name, None, status='Skipped (Push-down)')
+            elif rule_type in ['aggregate_value_trend', 'total_row_count_trend']:
+                task['outcome'] = self._pushdown_trend_outcome(task, table_name, partition_sql, engine,
+                                                               planned_historical_aggregates, stub_df)
+            elif task['kind'] == 'column':
+                task['outcome'] = self._execute_column_rule(stub_df, task['col_name'], task['rule_idx'], task['rule'])
+            else:
+                task['outcome'] = self._execute_table_rule(stub_df, task['rule_idx'], task['rule'],
+                                                           planned_historical_aggregates)
+
+        all_errors = ValidationResult()
+        rule_execution_summary = []
+        for task in tasks:
+            self._apply_rule_outcome(all_errors, rule_execution_summary, task['outcome'])
+        return (all_errors if as_result else all_errors.to_list()), rule_execution_summary
+
+    def _pushdown_config_outcome(self, task, table_name, message, error_type='CONFIG_ERROR', status='Error (Config)'):
+        rule_type = task['rule'].get('type')
+        default_name = f"{task['col_name']}_{rule_type}_{task['rule_idx']}" if task['kind'] == 'column' else \
+            f"table_{rule_type}_{task['rule_idx']}"
+        rule_name, severity = task['rule'].get('name', default_name), task['rule'].get('severity', 'minor').lower()
+        errors = []
+        if message:
+            errors.append({'rule_type': rule_type, 'rule_name': rule_name, 'error_type': error_type, 'message': message,
+                           'severity': severity})
+            if task['col_name']: errors[-1] = {'column': task['col_name'], **errors[-1]}
+        return {'errors': errors,
+                'summary': {'rule_name': rule_name, 'rule_type': rule_type, 'target_column': task['col_name'],
+                            'target_table': table_name,
+                            'current_data_filter_applied': task['rule'].get('params', {}).get('current_data_filter', ''),
+                            'items_checked': 0, 'items_passed': 0, 'items_failed': 1 if message else 0,
+                            'status': status, 'rule_severity': severity},
+                'rule_errors': None}
+
+    def _pushdown_rule_outcome(self, task, counts, table_name, source_sql, source_where, engine, sample_rows_per_rule,
+                               row_id_columns):
+        """집계 쿼리 결과(전체 건수)와 위반 행 샘플로 규칙 1개의 결과를 만듭니다."""
+        pushdown, rule = task['pushdown'], task['rule']
+        rule_type, params = rule['type'], dict(rule.get('params', {}))
+        filter_str = params.pop('current_data_filter', '')
+        items_checked = counts[pushdown['checked_alias']]
+        items_failed = sum(counts[alias] for alias in pushdown['violation_aliases'])
+        sample_df = pd.DataFrame()
+        if items_failed and sample_rows_per_rule:
+            sample_query = (f"SELECT * FROM {source_sql} WHERE " + ' AND '.join(
+                source_where + [f"({pushdown['filter_sql']})", f"({pushdown['violation_sql']})"]) +
+                            f" LIMIT {int(sample_rows_per_rule)}")
+            sample_df = self.q_processor.fetch_to_pandas(query=sample_query, engine=engine, limit=None)
+            sample_df.columns = [str(c).split('.')[-1] for c in sample_df.columns]
+            sample_df = sample_df.drop(columns=[c for c in sample_df.columns if c.startswith('dqm_dup_cnt_')])
+            if row_id_columns and all(c in sample_df.columns for c in row_id_columns):
+                sample_df = sample_df.set_index(row_id_columns, drop=False)
+            sample_df.attrs['name'] = table_name
+        sample_rule = {**rule, 'params': params}
+        if sample_df.empty:
+            outcome = {'errors': [], 'rule_errors': None}
+        elif rule_type == 'duplicate_rows':
+            # 샘플은 모두 중복 행이므로 그대로 오류로 기록 (LIMIT으로 같은 그룹의 다른 행이 빠질 수 있음)
+            subset = params.get('subset_columns')
+            if subset and not all(col in sample_df.columns for col in subset): subset = None
+            msg_template = params.get('message', "중복 행 발견 (행 인덱스: {row_index}). 검사 대상: {checked_columns}")
+            sample_errors = [{'columns': subset or 'all', 'row_index': idx, 'error_type': 'DUPLICATE_ROW',
+                              'message': msg_template.format(row_index=idx, checked_columns=subset or '모든 컬럼')}
+                             for idx in sample_df.index]
+            outcome = {'errors': [], 'rule_errors': (sample_errors, {'rule_type': rule_type, 'rule_name': rule.get(
+                'name', f'table_{rule_type}_{task["rule_idx"]}'), 'severity': rule.get('severity', 'minor').lower()},
+                dict(filter_str='', row_source_df=sample_df, **self._row_snapshot_options(params))) if sample_errors else None}
+        elif task['kind'] == 'column':
+            outcome = self._execute_column_rule(sample_df, task['col_name'], task['rule_idx'], sample_rule)
+        else:
+            outcome = self._execute_table_rule(sample_df, task['rule_idx'], sample_rule, {})
+        if outcome['rule_errors'] is not None: outcome['rule_errors'][2]['filter_str'] = filter_str
+        status = 'Failed' if items_failed else 'Passed'
+        filtered_rows, total_rows = counts[pushdown['filter_alias']], counts['dqm_total_rows']
+        if items_checked == 0 and status == 'Passed':
+            if filter_str and filtered_rows == 0 and total_rows > 0:
+                status = 'Skipped (Filter Empty)'
+            elif filtered_rows == 0:
+                status = 'Skipped (No Data in Series)' if task['kind'] == 'column' else 'Skipped (No Data)'
+        outcome['summary'] = {'rule_name': rule.get('name', f"{task['col_name']}_{rule_type}_{task['rule_idx']}" if task[
+            'kind'] == 'column' else f"table_{rule_type}_{task['rule_idx']}"), 'rule_type': rule_type,
+                              'target_column': task['col_name'], 'target_table': table_name,
+                              'current_data_filter_applied': filter_str, 'items_checked': items_checked,
+                              'items_passed': items_checked - items_failed if items_checked >= items_failed else 0,
+                              'items_failed': items_failed, 'status': status,
+                              'rule_severity': rule.get('severity', 'minor').lower()}
+        return outcome
+
+    def _pushdown_trend_outcome(self, task, table_name, partition_sql, engine, planned_historical_aggregates, stub_df):
+        rule_type, params = task['rule']['type'], dict(task['rule'].get('params', {}))
+        filter_str = params.pop('current_data_filter', '')
+        if rule_type == 'total_row_count_trend':
+            agg_col, agg_func = params.get('count_aggregate_column', '1'), 'COUNT'
+        else:
+            agg_col, agg_func = params.get('column_to_aggregate'), params.get('aggregate_function', 'SUM').upper()
+        group_by_columns = params.get('group_by_columns')
+        if agg_func in ['SUM', 'AVG', 'COUNT'] and agg_col and (not group_by_columns or isinstance(group_by_columns, list)):
+            try:
+                filter_sql = _rule_condition_sql({**params, 'current_data_filter': filter_str}, 'current_data_filter',
+                                                 list(stub_df.columns))
+                params['_current_aggregates'] = _current_aggregates_from_sql(
+                    self.q_processor, table_name, ' AND '.join([partition_sql] + ([f"({filter_sql})"] if filter_sql else [])),
+                    agg_col, agg_func, group_by_columns, engine)
+            except ValueError as e:
+                return self._pushdown_config_outcome(task, table_name, f"push-down SQL 변환 불가: {e}")
+            except Exception as e:
+                return self._pushdown_config_outcome(task, table_name, f"push-down 현재 집계 조회 실패: {e}",
+                                                     error_type='QUERY_EXECUTION_ERROR', status='Error (Query)')
+        outcome = self._execute_table_rule(stub_df, task['rule_idx'], {**task['rule'], 'params': params},
+                                           planned_historical_aggregates)
+        outcome['summary']['current_data_filter_applied'] = filter_str
+        if outcome['rule_errors'] is not None: outcome['rule_errors'][2]['filter_str'] = filter_str
+        return outcome
+
+
+def _rule_expression_columns(rules_config):
+    """규칙 설정의 필터/조건 식(current_data_filter, if_condition, then_condition)에 나오는 이름 목록."""
+    names = set()
+    rules = [rule for col_rules in rules_config.get('columns', {}).values() for rule in col_rules] + list(
+        rules_config.get('table_level_rules', []))
+    for rule in rules:
+        for key in ['current_data_filter', 'if_condition', 'then_condition']:
+            expr = rule.get('params', {}).get(key)
+            if not expr: continue
+            names.update(re.findall(r'`([^`]+)`', expr))
+            try:
+                names.update(tok.string for tok in tokenize.generate_tokens(io.StringIO(expr.strip()).readline)
+                             if tok.type == tokenize.NAME)
+            except (tokenize.TokenError, SyntaxError):
+                pass
+    return names
+
+
+def optimize_validation_dtypes(df, rules_config=None, category_max_unique_ratio=0.5, category_max_unique=100_000,
+                               arrow_strings=True, downcast_floats=False, verbose=True):
+    """검증 결과가 바뀌지 않는 범위에서 컬럼 타입을 줄인 새 DataFrame을 반환합니다 (문자열은 category/Arrow, 정수는 작은 타입).
+    rules_config의 필터/조건 식에 나오는 컬럼은 eval/query 결과가 바뀌지 않도록 category 변환과 숫자 downcast를 하지 않습니다."""
+    if not isinstance(df, pd.DataFrame) or df.empty: return df
+    expression_columns = _rule_expression_columns(rules_config or {})
+    arrow_string_dtype = None
+    if arrow_strings and pyarrow is not None:
+        try:
+            arrow_string_dtype = pd.StringDtype('pyarrow', na_value=np.nan)
+        except TypeError:
+            arrow_string_dtype = None  # pandas 2.1 미만: NA 의미가 다른 string[pyarrow]는 사용하지 않음
+    memory_before = df.memory_usage(deep=True).sum()
+    converted, conversions = {}, {}
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if pd.api.types.is_integer_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+            # 식에 쓰인 정수 컬럼은 작은 타입 연산(n * m 등)이 넘칠 수 있어 그대로 둠
+            if isinstance(dtype, np.dtype) and col not in expression_columns:
+                downcast = pd.to_numeric(series, downcast='integer')
+                if downcast.dtype != dtype: converted[col] = downcast
+        elif pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            if downcast_floats and dtype != np.float32 and col not in expression_columns:
+                as_float32 = series.astype(np.float32)
+                if ((as_float32.astype(dtype) == series) | series.isna()).all(): converted[col] = as_float32
+        elif dtype == object or isinstance(dtype, pd.StringDtype):
+            non_null = series.dropna()
+            if non_null.empty: continue
+            if dtype == object and pd.api.types.infer_dtype(non_null, skipna=True) != 'string': continue
+            unique_count = non_null.nunique()
+            if (col not in expression_columns and unique_count <= category_max_unique
+                    and unique_count <= max(1, len(series) * category_max_unique_ratio)):
+                converted[col] = series.astype('category')
+            elif arrow_string_dtype is not None and dtype != arrow_string_dtype:
+                converted[col] = series.astype(arrow_string_dtype)
+        if col in converted: conversions[col] = f"{dtype} -> {converted[col].dtype}"
+    if not converted: return df
+    optimized = df.copy(deep=False)
+    for col, values in converted.items(): optimized[col] = values
+    optimized.attrs = dict(df.attrs)
+    if verbose:
+        memory_after = optimized.memory_usage(deep=True).sum()
+        print(f"정보: 검증 데이터 타입 최적화 - 컬럼 {len(conversions)}개 변환, 메모리 {memory_before / 1024 / 1024:,.1f}MB -> "
+              f"{memory_after / 1024 / 1024:,.1f}MB ({', '.join(f'{c}: {t}' for c, t in conversions.items())})")
+    return optimized
+
 
 def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                             log_to_console=True,
@@ -1568,28 +5163,95 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                             validation_run_info_extra=None,
                             output_report_path_if_db_fail=None,
                             frst_rgr_id='data_validator_script',
-                            last_updtr_id='data_validator_script'
+                            last_updtr_id='data_validator_script',
+                            return_validation_result=False,
+                            lazy_row_snapshots=False,
+                            row_snapshot_columns=None,
+                            row_snapshot_max_rows_per_rule=None,
+                            plan_historical_queries=True,
+                            use_grouping_sets=True,
+                            profile_store=None,
+                            rule_workers=1,
+                            process_workers=0,
+                            max_concurrent_queries=1,
+                            engine_query_limits=None,
+                            dataset_name=None,
+                            pushdown_table=None,
+                            pushdown_partition_filter=None,
+                            pushdown_sample_rows=100,
+                            track_rule_memory=False,
+                            slow_rules_top_n=10,
+                            hooks=None,
+                            optimize_dtypes=False,
+                            local_history_aggregation=False,
+                            local_history_periods=None
                             ):
-        if dataframe is None:
+        # return_validation_result=True이면 ValidationResult 반환 (로그/저장은 상위 max_errors_to_log건만 dict로 생성)
+        # lazy_row_snapshots의 지연 생성은 return_validation_result=True일 때만 유지 (기본 dict 리스트 반환은 모든 오류를 생성)
+        # plan_historical_queries=True이면 추이 규칙들의 과거 집계 조회를 병합해 실행합니다 (DataValidator 참고).
+        # rule_workers/process_workers로 규칙 병렬 실행을 켤 수 있습니다 (결과 순서는 순차 실행과 동일).
+        # dataframe에 청크 iterable(또는 iterator를 돌려주는 함수)을 주면 validate_chunks로 검증 (대상 테이블명은 dataset_name 또는 첫 청크 attrs['name'])
+        # dataframe=None, pushdown_table='db.table'이면 데이터를 내려받지 않고 validate_pushdown으로 DB에서 검증합니다.
+        # (pushdown_partition_filter: 검증 대상 파티션 SQL 조건, pushdown_sample_rows: 규칙당 위반 행 샘플 수)
+        # 규칙별 실행 지표는 요약에 함께 저장하고 실행 시간 상위 slow_rules_top_n개 규칙을 출력 (track_rule_memory: tracemalloc 측정)
+        # hooks: 규칙/조회 실행 전후 훅 (CProfileRuleHook, TracemallocRuleHook, ChromeTraceHook 또는 ValidationHooks 구현)
+        # optimize_dtypes=True(또는 optimize_validation_dtypes 인자 dict)이면 검증 전에 컬럼 타입을 줄임
+        # local_history_aggregation=True이면 dataframe에 전체 적재된 과거 기간(local_history_periods)은 DB 대신 pandas로 집계
+        if dataframe is None and not pushdown_table:
             print("오류: 검증할 DataFrame이 제공되지 않았습니다.")
             return [{"error_type": "CONFIG_ERROR", "message": "검증 대상 DataFrame이 누락되었습니다."}], []
 
+        if optimize_dtypes and isinstance(dataframe, pd.DataFrame):
+            dtype_options = optimize_dtypes if isinstance(optimize_dtypes, dict) else {}
+            dataframe = optimize_validation_dtypes(dataframe, rules_config, verbose=log_to_console, **dtype_options)
+
         start_time_total_run = time.time()
 
         if query_processor_instance is None:
             query_processor_instance = DatalabQueryProcessor()
 
-        validator = DataValidator(rules_config, query_processor_instance)
+        validator = DataValidator(rules_config, query_processor_instance, lazy_row_snapshots=lazy_row_snapshots,
+                                  row_snapshot_columns=row_snapshot_columns,
+                                  row_snapshot_max_rows_per_rule=row_snapshot_max_rows_per_rule,
+                                  plan_historical_queries=plan_historical_queries,
+                                  use_grouping_sets=use_grouping_sets, profile_store=profile_store,
+                                  rule_workers=rule_workers, process_workers=process_workers,
+                                  max_concurrent_queries=max_concurrent_queries,
+                                  engine_query_limits=engine_query_limits,
+                                  track_rule_memory=track_rule_memory, hooks=hooks,
+                                  local_history_aggregation=local_history_aggregation,
+                                  local_history_periods=local_history_periods)
 
-        print(f"\n--- 데이터 검증 실행 (DataFrame 크기: {dataframe.shape}) ---")
-        all_errors, rule_execution_summary = validator.validate(dataframe, disable_outer_tqdm=disable_outer_tqdm,
-                                                                disable_inner_tqdm=disable_inner_tqdm)
+        if dataframe is None:
+            dataset_name = dataset_name or pushdown_table
+            print(f"\n--- 데이터 검증 실행 (push-down: {pushdown_table}, 조건: {pushdown_partition_filter or '전체'}) ---")
+            all_errors, rule_execution_summary = validator.validate_pushdown(
+                pushdown_table, pushdown_partition_filter, engine='hive', sample_rows_per_rule=pushdown_sample_rows,
+                disable_outer_tqdm=disable_outer_tqdm, as_result=True)
+        elif isinstance(dataframe, pd.DataFrame):
+            dataset_name = dataset_name or getattr(dataframe, 'attrs', {}).get('name', '')
+            print(f"\n--- 데이터 검증 실행 (DataFrame 크기: {dataframe.shape}) ---")
+            all_errors, rule_execution_summary = validator.validate(dataframe, disable_outer_tqdm=disable_outer_tqdm,
+                                                                    disable_inner_tqdm=disable_inner_tqdm,
+                                                                    as_result=True)
+        else:
+            print(f"\n--- 데이터 검증 실행 (청크 단위 입력) ---")
+            all_errors, rule_execution_summary = validator.validate_chunks(
+                dataframe, disable_outer_tqdm=disable_outer_tqdm, disable_inner_tqdm=disable_inner_tqdm,
+                as_result=True, dataset_name=dataset_name)
+            # 컬럼 규칙 요약의 target_table은 첫 청크의 attrs['name']
+            dataset_name = dataset_name or next((item['target_table'] for item in rule_execution_summary if
+                                                 item.get('target_column') is not None), '')
         actual_execution_time_seconds = time.time() - start_time_total_run
 
-        all_errors = all_errors if all_errors is not None else []
+        all_errors = all_errors if all_errors is not None else ValidationResult()
         rule_execution_summary = rule_execution_summary if rule_execution_summary is not None else []
 
         print(f"--- 데이터 검증 실행 완료 (오류 수: {len(all_errors)}) ---")
+        if hasattr(query_processor_instance, 'cache_stats'):
+            cache_stats = query_processor_instance.cache_stats()
+            print(f"정보: 쿼리 캐시 - 적중 {cache_stats['hits']}건 / 미적중 {cache_stats['misses']}건 "
+                  f"(적중률 {cache_stats['hit_ratio']:.1%}, 항목 {cache_stats['entries']}개, {cache_stats['size_bytes'] / 1024 / 1024:.1f}MB)")
 
         severity_counts = {'critical': {'failed_rules': 0, 'errors': 0},
                            'major': {'failed_rules': 0, 'errors': 0},
@@ -1601,10 +5263,9 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                 if severity in severity_counts:
                     severity_counts[severity]['failed_rules'] += 1
 
-        for error_item in all_errors:
-            severity = error_item.get('severity', 'minor')
+        for severity, error_count in all_errors.count_by_severity().items():
             if severity in severity_counts:
-                severity_counts[severity]['errors'] += 1
+                severity_counts[severity]['errors'] += error_count
         # ★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★
 
         if log_to_console and rule_execution_summary:
@@ -1626,16 +5287,17 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                 print(f"요약 보고서 콘솔 출력 중 오류 발생: {e_summary_log}")
 
         total_errors_found = len(all_errors)
-        errors_to_process = all_errors
+        errors_to_process = []
         log_summary_message_detailed = f"\n🚨 총 {total_errors_found}개의 상세 검증 오류 발견"
 
         if total_errors_found == 0 and log_to_console:
             print("\n✅ 모든 검증 규칙을 통과했습니다!")
         elif total_errors_found > 0:
             if max_errors_to_log is not None and 0 <= max_errors_to_log < total_errors_found:
-                errors_to_process = all_errors[:max_errors_to_log]
+                errors_to_process = all_errors.head(max_errors_to_log)
                 log_summary_message_detailed += f" (상위 {max_errors_to_log}개만 표시 및 저장 대상):"
             else:
+                errors_to_process = all_errors.to_list()
                 log_summary_message_detailed += ":"
             if log_to_console:
                 print(log_summary_message_detailed)
@@ -1655,7 +5317,7 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
             else:
                 try:
                     current_run_id = f"run_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-                    df_name_attr = getattr(dataframe, 'attrs', {}).get('name', '')
+                    df_name_attr = dataset_name
                     table_name_from_rules = next((r.get('params', {}).get('table_name_in_db', '') for r in
                                                   rules_config.get('table_level_rules', []) if
                                                   r.get('params', {}).get('table_name_in_db')), '')
@@ -1716,7 +5378,10 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                             'target_column': ('string', ''), 'target_table': ('string', ''),
                             'current_data_filter_applied': ('string', ''), 'status': ('string', ''),
                             'items_checked': ('int64', 0), 'items_passed': ('int64', 0),
-                            'items_failed': ('int64', 0), hive_partition_column_name: ('string', '')
+                            'items_failed': ('int64', 0),
+                            **{metric_col: ('int64' if isinstance(default, int) else 'float64', default)
+                               for metric_col, default in RULE_METRIC_DEFAULTS.items()},
+                            hive_partition_column_name: ('string', '')
                         }
 
                         for col, (dtype, default) in summary_cols_map.items():
@@ -1727,6 +5392,9 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                             elif dtype == 'int64':
                                 summary_df_to_save[col] = pd.to_numeric(current_col_s, errors='coerce').fillna(
                                     default).astype(np.int64)
+                            elif dtype == 'float64':
+                                summary_df_to_save[col] = pd.to_numeric(current_col_s, errors='coerce').fillna(
+                                    default).astype(float)
                         summary_df_to_save = summary_df_to_save[list(summary_cols_map.keys())]
                         query_processor_instance.save_pandas_to_datalake(summary_df_to_save, db_name=hive_db_name,
                                                                          table_name=hive_summary_table_name,
@@ -1744,7 +5412,7 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                                 'rule_type': str(err_obj.get('rule_type', '')),
                                 'error_type': str(err_obj.get('error_type', '')),
                                 'target_table': str(
-                                    err_obj.get('table_name', getattr(dataframe, 'attrs', {}).get('name', ''))),
+                                    err_obj.get('table_name', dataset_name)),
                                 # 명세서에 ERR_TBL_NM
                                 'target_column': str(err_obj.get('column', '')),  # 명세서에 ERR_CLMN_NM
                                 'row_identifier': str(err_obj.get('row_index', '')) if pd.notna(
@@ -1758,7 +5426,8 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
                                                 'historical_count', 'change_ratio', 'current_value',
                                                 'historical_value', 'historical_period_label', 'change_type',
                                                 'function', 'consecutive_periods_detected', 'trend_values',
-                                                'trend_dates',
+                                                'trend_dates', 'duplicate_count', 'duplicate_row_indices',
+                                                'mismatch_count', 'omitted_mismatch_count',
                                                 'columns', 'engine_name']  # engine_name도 여기에 포함 가능
 
                             for k_detail in keys_for_details:
@@ -1874,4 +5543,14 @@ def run_data_validation(dataframe, rules_config, query_processor_instance=None,
             except Exception as e_file_save:
                 print(f"\n⚠️ DB 저장 실패 후 파일 저장 중에도 오류 발생: {e_file_save}")
 
-        return all_errors, rule_execution_summary
\ No newline at end of file
+        if log_to_console and slow_rules_top_n:
+            try:
+                print_slow_rules_report(rule_execution_summary, top_n=slow_rules_top_n,
+                                        planner_query_metrics=validator.last_planner_query_metrics)
+            except Exception as e_slow_rules_log:
+                print(f"규칙별 실행 시간 보고서 출력 중 오류 발생: {e_slow_rules_log}")
+
+        if return_validation_result:
+            return all_errors, rule_execution_summary
+        return (errors_to_process if len(errors_to_process) == total_errors_found else all_errors.to_list()), \
+            rule_execution_summary
\ No newline at end of file
@@ -0,0 +1,861 @@
+"""dqmlib 최적화 경로와 기존(단일 DataFrame/순차/DB 조회) 경로의 결과 동등성 테스트."""
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dqmlib  # noqa: E402
+
+CUR = '20250120'
+HIST_DATES = [(datetime(2025, 1, 20) - timedelta(days=i)).strftime('%Y%m%d') for i in range(1, 25)]
+
+
+def make_frame(n, dates, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'bgda_plf_pti_id': rng.choice(dates, n),
+        'wid_cty_cd': rng.choice(np.array(['11', '21', '31', None], dtype=object), n),
+        'code': rng.choice(np.array(['A1', 'B2', 'C3', 'X', None], dtype=object), n, p=[.3, .3, .25, .05, .1]),
+        'aso_saa': rng.normal(1000, 300, n).round(0),
+        'aso_sls_ct': rng.integers(0, 50, n).astype(float),
+    })
+    df['code2'] = df['code'].where(rng.random(n) >= 0.05, 'ZZ')
+    df.loc[rng.random(n) < 0.01, 'aso_saa'] = -5
+    df.loc[rng.random(n) < 0.01, 'aso_saa'] = np.nan
+    return df
+
+
+def row_rules():
+    return {
+        'columns': {
+            'code': [{'name': 'code_nn', 'type': 'not_null', 'severity': 'critical'},
+                     {'name': 'code_allowed', 'type': 'allowed_values', 'params': {'values': ['A1', 'B2', 'C3']}},
+                     {'name': 'code_re', 'type': 'regex_pattern', 'params': {'pattern': r'[A-Z]\d'}}],
+            'aso_saa': [{'name': 'saa_range', 'type': 'numeric_range', 'params': {'min': 0, 'max': 1800}}],
+        },
+        'table_level_rules': [
+            {'name': 'eq', 'type': 'column_equality', 'params': {'column1': 'code', 'column2': 'code2'}},
+            {'name': 'dup', 'type': 'duplicate_rows',
+             'params': {'subset_columns': ['bgda_plf_pti_id', 'wid_cty_cd', 'code', 'aso_sls_ct']}},
+            {'name': 'cond', 'type': 'conditional_check',
+             'params': {'if_condition': "code == 'A1'", 'then_condition': 'aso_sls_ct > 10'}},
+        ]
+    }
+
+
+def history_rules():
+    dfilter = f"bgda_plf_pti_id == '{CUR}'"
+    rules_config = row_rules()
+    rules_config['columns']['code'].append(
+        {'name': 'code_dist', 'type': 'distribution_change',
+         'params': {'current_data_filter': dfilter, 'historical_data_table': 'mdb.hist', 'historical_data_column': 'code',
+                    'historical_data_filter': "bgda_plf_pti_id >= '20250101' AND bgda_plf_pti_id <= '20250115'",
+                    'thresholds': {'new_code_max_ratio': 0.01, 'freq_change_tolerance_abs': 0.02}}})
+    rules_config['columns']['aso_saa'].append(
+        {'name': 'saa_vol', 'type': 'numeric_volatility',
+         'params': {'method': 'z_score', 'current_data_filter': dfilter, 'historical_data_table': 'mdb.hist',
+                    'historical_data_column': 'aso_saa', 'thresholds': {'z_score_threshold': 2.0}}})
+    rules_config['table_level_rules'] += [
+        {'name': 'sum_avg_grp', 'type': 'aggregate_value_trend',
+         'params': {'column_to_aggregate': 'aso_saa', 'aggregate_function': 'SUM', 'group_by_columns': ['wid_cty_cd'],
+                    'current_period_value': CUR, 'historical_data_table': 'mdb.hist',
+                    'date_column_for_period': 'bgda_plf_pti_id', 'date_column_format': 'YYYYMMDD',
+                    'comparison_periods': {'type': 'average_of_previous_n_days', 'n': 7},
+                    'threshold_ratio_decrease': 0.05, 'threshold_ratio_increase': 0.05,
+                    'current_data_filter': dfilter}},
+        {'name': 'cnt_prev', 'type': 'total_row_count_trend',
+         'params': {'current_period_value': CUR, 'historical_data_table': 'mdb.hist',
+                    'date_column_for_period': 'bgda_plf_pti_id', 'date_column_format': 'YYYYMMDD',
+                    'comparison_periods': {'type': 'previous_n_days', 'n': 3},
+                    'threshold_ratio_decrease': 0.05, 'threshold_ratio_increase': 0.05,
+                    'current_data_filter': dfilter}},
+        {'name': 'consec', 'type': 'consecutive_trend_check',
+         'params': {'column_to_aggregate': 'aso_saa', 'aggregate_function': 'SUM', 'group_by_columns': ['wid_cty_cd'],
+                    'date_column_for_trend': 'bgda_plf_pti_id', 'trend_type': 'down', 'consecutive_periods': 2,
+                    'historical_data_table': 'mdb.hist', 'historical_lookback_periods': 6}},
+    ]
+    return rules_config
+
+
+def norm(x):
+    return json.loads(json.dumps(x, default=str, ensure_ascii=False))
+
+
+def summary_counts(summary):
+    return [{k: s.get(k) for k in ('rule_name', 'items_checked', 'items_failed', 'status')} for s in summary]
+
+
+@pytest.fixture(scope='module')
+def current_df():
+    df = make_frame(1500, [CUR, '20250119', '20250118'], seed=1)
+    df.attrs['name'] = 'mdb.cur'
+    return df
+
+
+@pytest.fixture(scope='module')
+def hist_df():
+    return make_frame(6000, HIST_DATES, seed=8)
+
+
+@pytest.fixture
+def local_qp(hist_df, current_df):
+    qp = dqmlib.LocalQueryProcessor({'mdb.hist': hist_df, 'mdb.cur': current_df}, slow_query_seconds=None)
+    yield qp
+    qp.close()
+
+
+# ----- ValidationResult -----
+def test_validation_result_matches_list_output(current_df):
+    errors, _ = dqmlib.DataValidator(row_rules()).validate(current_df, disable_outer_tqdm=True)
+    result, _ = dqmlib.DataValidator(row_rules()).validate(current_df, disable_outer_tqdm=True, as_result=True)
+    assert isinstance(result, dqmlib.ValidationResult)
+    assert len(result) == len(errors)
+    assert norm(result.to_list()) == norm(errors)
+    assert norm(result.head(5)) == norm(errors[:5])
+    assert result.count_by_severity() == pd.Series([e.get('severity', 'minor') for e in errors]).value_counts().to_dict()
+    assert len(result.to_frame()) == len(errors)
+
+
+def test_validation_result_iteration_does_not_mutate_stored_errors(current_df):
+    result, _ = dqmlib.DataValidator(row_rules()).validate(current_df, disable_outer_tqdm=True, as_result=True)
+    first = result.to_list()
+    for err in first:
+        err['message'] = 'changed'
+        err.pop('error_row_data', None)
+    assert norm(result.to_list()) != norm(first)
+    assert norm(result.to_list()) == norm(dqmlib.DataValidator(row_rules()).validate(
+        current_df, disable_outer_tqdm=True)[0])
+
+
+def test_validation_result_releases_source_frames(current_df):
+    result, _ = dqmlib.DataValidator(row_rules()).validate(current_df, disable_outer_tqdm=True, as_result=True)
+    first = norm(result.to_list())
+    sources = [rule['row_source_df'] for rule in result._rules if rule['row_source_df'] is not None]
+    assert sources and all(len(src) < len(current_df) for src in sources)
+    assert norm(result.to_list()) == first
+
+
+# ----- 지연 error_row_data 스냅샷 -----
+def test_lazy_row_snapshots_match_eager_snapshots(current_df):
+    errors, _ = dqmlib.DataValidator(row_rules()).validate(current_df, disable_outer_tqdm=True)
+    lazy_errors, _ = dqmlib.DataValidator(row_rules(), lazy_row_snapshots=True).validate(
+        current_df, disable_outer_tqdm=True)
+    assert norm(lazy_errors) == norm(errors)
+    limited, _ = dqmlib.DataValidator(row_rules(), lazy_row_snapshots=True, row_snapshot_columns=['code'],
+                                      row_snapshot_max_rows_per_rule=3).validate(current_df, disable_outer_tqdm=True)
+    assert [e.get('row_index') for e in limited] == [e.get('row_index') for e in errors]
+    assert all(set(e['error_row_data']) == {'code'} for e in limited if 'error_row_data' in e)
+
+
+# ----- 과거 조회 플래너 -----
+@pytest.mark.parametrize('use_grouping_sets', [True, False])
+def test_planned_history_queries_match_per_rule_queries(local_qp, current_df, use_grouping_sets):
+    errors, summary = dqmlib.DataValidator(history_rules(), local_qp, plan_historical_queries=False).validate(
+        current_df, disable_outer_tqdm=True)
+    unplanned_queries = local_qp.stats['queries']
+    planned_errors, planned_summary = dqmlib.DataValidator(
+        history_rules(), local_qp, use_grouping_sets=use_grouping_sets).validate(current_df, disable_outer_tqdm=True)
+    assert norm(planned_errors) == norm(errors)
+    assert summary_counts(planned_summary) == summary_counts(summary)
+    assert local_qp.stats['queries'] - unplanned_queries < unplanned_queries
+
+
+# ----- 쿼리 캐시 -----
+def test_frame_payload_round_trip():
+    df = pd.DataFrame({'i': np.arange(4, dtype='int64'), 'f': [1.5, np.nan, -2.0, 0.0],
+                       'b': [True, False, True, True], 's': ['a', None, '한글', "x'y"],
+                       'o': pd.Series(['1', 2, 3.5, None], dtype=object),
+                       't': pd.to_datetime(['2025-01-01', None, '2025-01-03', '2025-01-04'])})
+    pd.testing.assert_frame_equal(dqmlib._frame_from_payload(dqmlib._frame_to_payload(df)), df)
+    assert dqmlib._frame_to_payload(df.iloc[::-1]) is None
+    assert dqmlib._frame_from_payload(b'not a payload') is None
+
+
+def test_immutable_query_detection(tmp_path):
+    cached = dqmlib.CachedQueryProcessor(None, cache_dir=str(tmp_path), immutable_partition_before=CUR,
+                                         partition_column='bgda_plf_pti_id')
+    assert cached.is_immutable_query("SELECT COUNT(*) FROM t WHERE bgda_plf_pti_id = '20250119'")
+    assert cached.is_immutable_query("SELECT * FROM t WHERE bgda_plf_pti_id IN ('20250101', '20250102') "
+                                     "AND code IS NOT NULL")
+    assert cached.is_immutable_query("SELECT * FROM t WHERE bgda_plf_pti_id BETWEEN '20250101' AND '20250110'")
+    assert not cached.is_immutable_query(f"SELECT * FROM t WHERE bgda_plf_pti_id = '{CUR}'")
+    assert not cached.is_immutable_query("SELECT * FROM t WHERE bgda_plf_pti_id >= '20250101'")
+    assert not cached.is_immutable_query("SELECT * FROM t WHERE bgda_plf_pti_id = '20250101' OR x = 1")
+
+
+def test_cached_fetch_matches_direct_fetch(tmp_path, local_qp):
+    query = ("SELECT bgda_plf_pti_id, code, COUNT(*) AS cnt, SUM(aso_saa) AS total FROM mdb.hist "
+             "WHERE bgda_plf_pti_id <= '20250110' GROUP BY bgda_plf_pti_id, code ORDER BY bgda_plf_pti_id, code")
+    direct_df = local_qp.fetch_to_pandas(query)
+    cached = dqmlib.CachedQueryProcessor(local_qp, cache_dir=str(tmp_path), immutable_partition_before=CUR,
+                                         partition_column='bgda_plf_pti_id')
+    miss_df = cached.fetch_to_pandas(query)
+    query_count = local_qp.stats['queries']
+    hit_df = cached.fetch_to_pandas(query)
+    assert local_qp.stats['queries'] == query_count
+    assert cached.cache_stats()['hits'] == 1
+    pd.testing.assert_frame_equal(miss_df, direct_df)
+    pd.testing.assert_frame_equal(hit_df, direct_df)
+
+
+def test_cached_validation_matches_uncached(tmp_path, local_qp, current_df):
+    errors, summary = dqmlib.DataValidator(history_rules(), local_qp).validate(current_df, disable_outer_tqdm=True)
+    cached = dqmlib.CachedQueryProcessor(local_qp, cache_dir=str(tmp_path), immutable_partition_before=CUR,
+                                         partition_column='bgda_plf_pti_id')
+    run_query_counts = []
+    for _ in range(2):
+        query_count = local_qp.stats['queries']
+        cached_errors, cached_summary = dqmlib.DataValidator(history_rules(), cached).validate(
+            current_df, disable_outer_tqdm=True)
+        run_query_counts.append(local_qp.stats['queries'] - query_count)
+        assert norm(cached_errors) == norm(errors)
+        assert summary_counts(cached_summary) == summary_counts(summary)
+    # 두 번째 실행은 과거(불변) 파티션 조회를 캐시에서 읽고 현재 파티션이 걸린 조회만 DB로 보냄
+    assert run_query_counts[1] < run_query_counts[0]
+
+
+# ----- 프로파일 저장소 -----
+def store_params(store, **extra):
+    return dict({'_profile_store': store, 'historical_data_table': 'mdb.hist', 'historical_data_column': 'aso_saa',
+                 'historical_partition_column': 'bgda_plf_pti_id', 'historical_partition_start': '20241225',
+                 'historical_partition_end': '20250119'}, **extra)
+
+
+def test_profile_store_matches_direct_profile(tmp_path, local_qp, hist_df):
+    store = dqmlib.ProfileStore(str(tmp_path), immutable_partition_before=CUR)
+    partials = dqmlib._get_store_window_partition_profiles(store_params(store), 'numeric', local_qp)
+    merged = dqmlib._merge_numeric_profiles([stats for p in partials for _, stats in p])
+    values = hist_df['aso_saa'].dropna().to_numpy()
+    assert merged['count'] == values.size
+    assert merged['mean'] == pytest.approx(values.mean())
+    assert merged['std'] == pytest.approx(values.std(ddof=1))
+    assert (merged['min'], merged['max']) == (values.min(), values.max())
+    iqr = np.subtract(*np.percentile(values, [75, 25]))
+    for key, q in (('q1', 25), ('median', 50), ('q3', 75)):
+        assert abs(merged[key] - np.percentile(values, q)) < 0.1 * iqr
+
+    # 저장된 파티션은 다시 조회하지 않고 같은 프로파일을 만듦
+    query_count = local_qp.stats['queries']
+    reloaded = dqmlib._get_store_window_partition_profiles(store_params(store), 'numeric', local_qp)
+    assert local_qp.stats['queries'] == query_count
+    assert dqmlib._merge_numeric_profiles([stats for p in reloaded for _, stats in p]) == merged
+
+
+def test_profile_store_persists_empty_and_respects_cutoff(tmp_path, local_qp):
+    store = dqmlib.ProfileStore(str(tmp_path), immutable_partition_before='20250115')
+    params = store_params(store, historical_partition_start='20241220')  # 20241220~24는 데이터 없음
+    dqmlib._get_store_window_partition_profiles(params, 'numeric', local_qp)
+    profile_key = {'kind': 'numeric', 'table': 'mdb.hist', 'column': 'aso_saa',
+                   'partition_column': 'bgda_plf_pti_id', 'group_by_columns': [], 'base_filter': '1=1',
+                   'engine': 'hive', 'knot_count': dqmlib.PROFILE_KNOT_COUNT}
+    stored = store.load_partitions(profile_key)
+    assert stored['20241220'] == []
+    assert '20250114' in stored and '20250115' not in stored and '20250119' not in stored
+
+
+def test_frequency_store_matches_direct_frequencies(tmp_path, local_qp, hist_df):
+    store = dqmlib.ProfileStore(str(tmp_path), immutable_partition_before=CUR)
+    partials = dqmlib._get_store_window_partition_profiles(
+        store_params(store, historical_data_column='code'), 'frequency', local_qp)
+    merged = dqmlib._merge_frequency_profiles(partials)
+    expected = hist_df['code'].value_counts(normalize=True, dropna=False)
+    assert merged['count'] == len(hist_df)
+    for code, ratio in expected.items():
+        assert merged['frequencies'][str(np.nan) if pd.isna(code) else code] == pytest.approx(ratio)
+
+
+def test_merge_numeric_profiles_with_tied_knots():
+    partials = [{'count': 10, 'sum': 10.0, 'm2': 0.0, 'min': 1.0, 'max': 1.0, 'knots': [1.0] * 5},
+                {'count': 10, 'sum': 30.0, 'm2': 0.0, 'min': 3.0, 'max': 3.0, 'knots': [3.0] * 5}]
+    merged = dqmlib._merge_numeric_profiles(partials)
+    assert merged['mean'] == 2.0
+    assert merged['q1'] <= merged['median'] <= merged['q3']
+    assert all(np.isfinite([merged['q1'], merged['median'], merged['q3']]))
+
+
+# ----- 분위수 스케치 -----
+def test_quantile_sketch_matches_numpy_quantiles():
+    values = np.random.default_rng(3).lognormal(3, 1, 50_000)
+    sketch = dqmlib.QuantileSketch(k=200).update(values)
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+    ranks = np.searchsorted(np.sort(values), sketch.quantiles(qs)) / values.size
+    assert np.max(np.abs(ranks - qs)) < 0.02
+    assert sketch.quantiles([0, 1]) == [values.min(), values.max()]
+    restored = dqmlib.QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.quantiles(qs) == sketch.quantiles(qs)
+
+
+def test_quantile_sketch_merge_matches_single_pass():
+    values = np.random.default_rng(4).normal(0, 1, 40_000)
+    merged = dqmlib.QuantileSketch().update(values[:15_000]).merge(dqmlib.QuantileSketch().update(values[15_000:]))
+    assert merged.count == values.size
+    qs = [0.1, 0.5, 0.9]
+    ranks = np.searchsorted(np.sort(values), merged.quantiles(qs)) / values.size
+    assert np.max(np.abs(ranks - qs)) < 0.02
+
+
+def test_sketch_profile_merge_matches_frame_statistics(hist_df):
+    partition_profiles = [dqmlib.profile_numeric_series(part['aso_saa'])
+                          for _, part in hist_df.groupby('bgda_plf_pti_id')]
+    merged = dqmlib._merge_numeric_profiles(partition_profiles)
+    values = hist_df['aso_saa'].dropna()
+    assert merged['count'] == values.size
+    assert merged['mean'] == pytest.approx(values.mean())
+    assert merged['std'] == pytest.approx(values.std())
+    assert abs(merged['median'] - values.median()) < 0.05 * values.std()
+
+
+# ----- 그룹별 numeric_volatility -----
+@pytest.mark.parametrize('method, thresholds', [('z_score', {'z_score_threshold': 1.5}), ('iqr', {'iqr_multiplier': 0.5})])
+def test_grouped_volatility_matches_per_group_checks(local_qp, current_df, method, thresholds):
+    params = {'method': method, 'thresholds': thresholds, 'historical_data_table': 'mdb.hist',
+              'historical_data_column': 'aso_saa', 'group_by_columns': ['wid_cty_cd']}
+    grouped = dqmlib.check_numeric_volatility(current_df['aso_saa'], 'aso_saa', params, local_qp,
+                                              full_current_df=current_df)
+    expected = []
+    for group_value in ['11', '21', '31', None]:
+        group_filter = "wid_cty_cd IS NULL" if group_value is None else f"wid_cty_cd = '{group_value}'"
+        group_mask = current_df['wid_cty_cd'].isna() if group_value is None else current_df['wid_cty_cd'] == group_value
+        expected += dqmlib.check_numeric_volatility(
+            current_df.loc[group_mask, 'aso_saa'], 'aso_saa',
+            {**params, 'group_by_columns': None, 'historical_data_filter': group_filter}, local_qp)
+    detail = lambda e: e['message'][e['message'].rindex(' ('):]
+    assert grouped and all(e['error_type'] == 'GROUP_NUMERIC_VOLATILITY_DETECTED' for e in grouped)
+    assert sorted((e['row_index'], detail(e)) for e in grouped) == sorted((e['row_index'], detail(e)) for e in expected)
+
+
+# ----- 규칙 병렬 실행 -----
+@pytest.mark.parametrize('workers', [{'rule_workers': 4}, {'rule_workers': 2, 'process_workers': 2}])
+def test_parallel_validation_matches_serial(local_qp, current_df, workers):
+    errors, summary = dqmlib.DataValidator(history_rules(), local_qp).validate(current_df, disable_outer_tqdm=True)
+    parallel_errors, parallel_summary = dqmlib.DataValidator(history_rules(), local_qp, **workers).validate(
+        current_df, disable_outer_tqdm=True)
+    assert norm(parallel_errors) == norm(errors)
+    assert summary_counts(parallel_summary) == summary_counts(summary)
+
+
+@pytest.mark.parametrize('rule_workers', [1, 4])
+def test_rule_exception_propagates_in_serial_and_parallel(local_qp, current_df, monkeypatch, rule_workers):
+    def failing_check(*args, **kwargs):
+        raise RuntimeError('check failed')
+
+    monkeypatch.setattr(dqmlib, 'check_conditional', failing_check)
+    with pytest.raises(RuntimeError, match='check failed'):
+        dqmlib.DataValidator(history_rules(), local_qp, rule_workers=rule_workers).validate(
+            current_df, disable_outer_tqdm=True)
+
+
+# ----- 비동기 과거 조회 -----
+def test_async_fetch_many_matches_sync_fetch(local_qp):
+    queries = [f"SELECT code, COUNT(*) AS cnt FROM mdb.hist WHERE bgda_plf_pti_id = '{d}' GROUP BY code ORDER BY code"
+               for d in HIST_DATES[:6]]
+    async_qp = dqmlib.AsyncQueryProcessor(local_qp, max_concurrency=3, engine_limits={'hive': 2})
+    try:
+        results = dqmlib.run_async_lookups(async_qp.fetch_many([(q, 'hive') for q in queries]))
+    finally:
+        async_qp.close()
+    assert async_qp.stats['queries'] == len(queries) and async_qp.stats['max_in_flight'] <= 2
+    for query, result_df in zip(queries, results):
+        pd.testing.assert_frame_equal(result_df, local_qp.fetch_to_pandas(query))
+
+
+def test_concurrent_planner_matches_serial_planner(local_qp, current_df):
+    errors, summary = dqmlib.DataValidator(history_rules(), local_qp).validate(current_df, disable_outer_tqdm=True)
+    async_errors, async_summary = dqmlib.DataValidator(
+        history_rules(), local_qp, use_grouping_sets=False, max_concurrent_queries=3,
+        engine_query_limits={'hive': 2}).validate(current_df, disable_outer_tqdm=True)
+    assert norm(async_errors) == norm(errors)
+    assert summary_counts(async_summary) == summary_counts(summary)
+
+
+# ----- 필터 평가 캐시 -----
+FILTER_EXPRS = ["code == 'A1'", "aso_saa > 1000 and wid_cty_cd == '11'", "code in ['A1', 'B2'] | aso_sls_ct < 3",
+                "index % 7 == 0", "1 == 1", "aso_sls_ct", "missing_col > 0"]
+
+
+@pytest.mark.parametrize('expr', FILTER_EXPRS)
+def test_filter_cache_matches_query_with_single_eval(current_df, monkeypatch, expr):
+    try:
+        expected, expected_exc = current_df.query(expr), None
+    except Exception as e:
+        expected, expected_exc = None, e
+    eval_calls = []
+    original_eval = pd.DataFrame.eval
+    monkeypatch.setattr(pd.DataFrame, 'eval', lambda self, *a, **kw: eval_calls.append(1) or original_eval(self, *a, **kw))
+    cache = dqmlib.FilterMaskCache(current_df)
+    for _ in range(2):
+        if expected_exc is not None:
+            with pytest.raises(type(expected_exc)):
+                cache.frame(expr)
+        else:
+            pd.testing.assert_frame_equal(cache.frame(expr), expected)
+            assert cache.count(expr) == len(expected)
+    assert len(eval_calls) == 1 and cache.stats['evaluations'] == 1
+
+
+def test_filter_cache_concurrent_lookups_evaluate_once(current_df):
+    import concurrent.futures
+    cache = dqmlib.FilterMaskCache(current_df)
+    exprs = ["code == 'A1'", "aso_saa > 1000", "wid_cty_cd == '21'"] * 8
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(cache.frame, exprs))
+    assert cache.stats['evaluations'] == 3
+    for expr, result_df in zip(exprs, frames):
+        assert result_df is cache.frame(expr)
+        pd.testing.assert_frame_equal(result_df, current_df.query(expr))
+    factorized = cache.factorized('code', "aso_saa > 1000")
+    codes, uniques = pd.factorize(current_df.query("aso_saa > 1000")['code'])
+    np.testing.assert_array_equal(np.asarray(factorized.uniques, dtype=object)[factorized.codes[factorized.codes >= 0]],
+                                  np.asarray(uniques, dtype=object)[codes[codes >= 0]])
+
+
+# ----- 청크 누적 검증 -----
+@pytest.mark.parametrize('as_generator', [False, True])
+def test_validate_chunks_matches_validate(local_qp, current_df, as_generator):
+    errors, summary = dqmlib.DataValidator(history_rules(), local_qp).validate(current_df, disable_outer_tqdm=True)
+    chunks = [current_df.iloc[i:i + 400] for i in range(0, len(current_df), 400)]
+    chunk_errors, chunk_summary = dqmlib.DataValidator(history_rules(), local_qp).validate_chunks(
+        (c for c in chunks) if as_generator else chunks, disable_outer_tqdm=True)
+    errors, chunk_errors = norm(errors), norm(chunk_errors)
+    if as_generator:  # 재순회할 수 없는 청크에서는 중복 행 스냅샷을 만들지 않음
+        for e in errors + chunk_errors:
+            if e.get('rule_name') == 'dup': e.pop('error_row_data', None)
+    assert chunk_errors == errors
+    assert summary_counts(chunk_summary) == summary_counts(summary)
+
+
+def test_validate_chunks_duplicates_across_int_and_float_chunks():
+    rules_config = {'table_level_rules': [{'name': 'dup', 'type': 'duplicate_rows', 'params': {'subset_columns': ['k']}}]}
+    chunks = [pd.DataFrame({'k': [5, 6]}, index=[0, 1]), pd.DataFrame({'k': [5.0, np.nan]}, index=[2, 3])]
+    whole_df = pd.concat(chunks)
+    whole_df.attrs['name'] = 'mdb.k'
+    errors, summary = dqmlib.DataValidator(rules_config, None).validate(whole_df, disable_outer_tqdm=True)
+    chunk_errors, chunk_summary = dqmlib.DataValidator(rules_config, None).validate_chunks(
+        chunks, disable_outer_tqdm=True, dataset_name='mdb.k')
+    assert summary_counts(chunk_summary) == summary_counts(summary) and summary[0]['items_failed'] > 0
+    assert norm(chunk_errors) == norm(errors)
+    assert all('name' not in c.attrs for c in chunks)  # 호출자 청크는 바꾸지 않음
+
+
+# ----- push-down 컴파일러 -----
+def test_pandas_expr_to_sql():
+    assert dqmlib._pandas_expr_to_sql("code == 'A1' and aso_sls_ct > 10") == "code = 'A1' AND aso_sls_ct > 10"
+    assert dqmlib._pandas_expr_to_sql("code in ['A1', 'B2']") == "code IN ( 'A1' , 'B2' )"
+    with pytest.raises(ValueError):
+        dqmlib._pandas_expr_to_sql("missing_col == 1", columns=['code'])
+
+
+def test_pushdown_matches_in_memory_validation(current_df):
+    df = current_df.assign(row_id=np.arange(len(current_df)))
+    qp = dqmlib.LocalQueryProcessor({'mdb.cur': df}, slow_query_seconds=None)
+    errors, summary = dqmlib.DataValidator(row_rules(), qp).validate(df, disable_outer_tqdm=True)
+    pushdown_errors, pushdown_summary = dqmlib.DataValidator(row_rules(), qp).validate_pushdown(
+        'mdb.cur', row_id_columns=['row_id'], disable_outer_tqdm=True)
+    qp.close()
+    assert summary_counts(pushdown_summary) == summary_counts(summary)
+    # 샘플 오류는 메모리 검증 오류의 부분 집합 (중복 그룹 오류는 그룹의 모든 행으로 펼쳐 비교)
+    expected = {(e['rule_name'], idx, e['error_type']) for e in errors
+                for idx in e.get('duplicate_row_indices', [e['row_index']])}
+    sampled = [(e['rule_name'], e['row_index'], e['error_type']) for e in pushdown_errors]
+    assert sampled and set(sampled) <= expected
+
+
+# ----- 로컬 SQL 변환 -----
+def test_local_translation_matches_pandas(local_qp, hist_df):
+    result_df = local_qp.fetch_to_pandas(
+        "SELECT CAST(wid_cty_cd AS STRING) AS grp, COUNT(aso_saa) AS cnt, SUM(aso_saa) AS total, "
+        "STDDEV_SAMP(aso_saa) AS std_val, PERCENTILE_APPROX(aso_saa, 0.5) AS median_val "
+        "FROM mdb.hist WHERE wid_cty_cd IS NOT NULL AND code RLIKE '^[AB]' GROUP BY CAST(wid_cty_cd AS STRING) "
+        "ORDER BY grp")
+    subset = hist_df[hist_df['wid_cty_cd'].notna() & hist_df['code'].fillna('').str.match('^[AB]')]
+    expected = subset.groupby('wid_cty_cd')['aso_saa'].agg(['count', 'sum', 'std', 'median'])
+    assert result_df['grp'].tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(result_df['cnt'], expected['count'])
+    np.testing.assert_allclose(result_df['total'], expected['sum'])
+    np.testing.assert_allclose(result_df['std_val'], expected['std'])
+    np.testing.assert_allclose(result_df['median_val'], expected['median'])
+
+
+def test_local_grouping_sets_match_separate_queries(local_qp):
+    grouped_df = local_qp.fetch_to_pandas(
+        "SELECT wid_cty_cd, code, SUM(aso_sls_ct) AS total, GROUPING(code) AS g FROM mdb.hist "
+        "GROUP BY wid_cty_cd, code GROUPING SETS ((wid_cty_cd), (wid_cty_cd, code))")
+    by_cty = local_qp.fetch_to_pandas("SELECT wid_cty_cd, SUM(aso_sls_ct) AS total FROM mdb.hist GROUP BY wid_cty_cd")
+    by_code = local_qp.fetch_to_pandas(
+        "SELECT wid_cty_cd, code, SUM(aso_sls_ct) AS total FROM mdb.hist GROUP BY wid_cty_cd, code")
+    sort_cols = ['wid_cty_cd', 'code']
+    got_cty = grouped_df[grouped_df['g'] == 1][['wid_cty_cd', 'total']].sort_values('wid_cty_cd', na_position='first')
+    got_code = grouped_df[grouped_df['g'] == 0][sort_cols + ['total']].sort_values(sort_cols, na_position='first')
+    pd.testing.assert_frame_equal(got_cty.reset_index(drop=True),
+                                  by_cty.sort_values('wid_cty_cd', na_position='first').reset_index(drop=True),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(got_code.reset_index(drop=True),
+                                  by_code.sort_values(sort_cols, na_position='first').reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_duckdb_backend_matches_sqlite(hist_df):
+    pytest.importorskip('duckdb')
+    query = ("SELECT bgda_plf_pti_id, COUNT(1) AS cnt, SUM(CAST(aso_saa AS DOUBLE)) AS total FROM mdb.hist "
+             "WHERE code RLIKE '[0-9]' AND CAST(aso_sls_ct AS STRING) <> '0' GROUP BY bgda_plf_pti_id "
+             "ORDER BY bgda_plf_pti_id")
+    results = []
+    for backend in ('sqlite', 'duckdb'):
+        qp = dqmlib.LocalQueryProcessor({'mdb.hist': hist_df}, backend=backend, slow_query_seconds=None)
+        results.append(qp.fetch_to_pandas(query))
+        qp.close()
+    pd.testing.assert_frame_equal(results[0], results[1], check_dtype=False)
+
+
+# ----- 규칙 실행 지표 -----
+def test_rule_metrics_match_rows_and_queries(local_qp, current_df):
+    validator = dqmlib.DataValidator(history_rules(), local_qp, track_rule_memory=True)
+    _, summary = validator.validate(current_df, disable_outer_tqdm=True)
+    by_name = {s['rule_name']: s for s in summary}
+    assert all(set(dqmlib.RULE_METRIC_DEFAULTS) <= set(s) and s['peak_memory_delta_mb'] is not None for s in summary)
+    assert by_name['code_nn']['rows_scanned'] == len(current_df) and by_name['code_nn']['db_query_count'] == 0
+    assert by_name['saa_vol']['rows_scanned'] == (current_df['bgda_plf_pti_id'] == CUR).sum()
+    assert by_name['saa_vol']['db_query_count'] == 1
+    # 규칙별 조회 수 + 플래너의 병합 조회 수 = 전체 조회 수
+    assert (sum(s['db_query_count'] for s in summary) + validator.last_planner_query_metrics['db_query_count'] ==
+            validator._query_meter.totals['db_query_count'])
+
+
+def test_rule_metrics_skip_memory_in_parallel_and_report_slow_rules(local_qp, current_df, capsys):
+    _, summary = dqmlib.DataValidator(history_rules(), local_qp, rule_workers=4).validate(
+        current_df, disable_outer_tqdm=True)
+    assert all(s['peak_memory_delta_mb'] is None and s['execution_seconds'] >= 0 for s in summary)
+    capsys.readouterr()
+    dqmlib.print_slow_rules_report(summary, top_n=3)
+    slowest = sorted(summary, key=lambda s: -s['execution_seconds'])[0]['rule_name']
+    assert slowest in capsys.readouterr().out
+
+
+# ----- 검증 훅 -----
+class RecordingHook(dqmlib.ValidationHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_validation_start(self, validator):
+        self.events.append(('validation_start', None))
+
+    def on_validation_end(self, validator):
+        self.events.append(('validation_end', None))
+
+    def on_rule_start(self, rule_info):
+        self.events.append(('rule_start', rule_info['rule_name']))
+
+    def on_rule_end(self, rule_info, summary, exc=None):
+        self.events.append(('rule_end', rule_info['rule_name'], summary['items_failed']))
+
+    def on_query_start(self, query_info):
+        self.events.append(('query_start', query_info['rule_name']))
+
+    def on_query_end(self, query_info, elapsed_seconds, exc=None):
+        self.events.append(('query_end', query_info['rule_name']))
+
+
+def test_hooks_call_order(local_qp, current_df):
+    hook = RecordingHook()
+    _, summary = dqmlib.DataValidator(history_rules(), local_qp, hooks=hook, plan_historical_queries=False).validate(
+        current_df, disable_outer_tqdm=True)
+    events = hook.events
+    assert events[0] == ('validation_start', None) and events[-1] == ('validation_end', None)
+    rule_events = [e for e in events if e[0].startswith('rule_')]
+    expected = [e for s in summary for e in (('rule_start', s['rule_name']),
+                                            ('rule_end', s['rule_name'], s['items_failed']))]
+    assert rule_events == expected
+    # 조회 이벤트는 해당 규칙의 시작/종료 사이에서 발생
+    current_rule = None
+    for event in events[1:-1]:
+        if event[0] == 'rule_start': current_rule = event[1]
+        elif event[0] == 'rule_end': current_rule = None
+        else: assert event[1] == current_rule is not None
+    assert any(e[0] == 'query_start' for e in events)
+
+
+def test_hooks_in_parallel_and_nested_validation(local_qp, current_df, tmp_path):
+    hook, trace_path = RecordingHook(), tmp_path / 'trace.json'
+    _, summary = dqmlib.DataValidator(history_rules(), local_qp, rule_workers=4,
+                                      hooks=[hook, dqmlib.ChromeTraceHook(str(trace_path))]).validate(
+        current_df, disable_outer_tqdm=True)
+    assert sorted(e for e in hook.events if e[0].startswith('rule_')) == sorted(
+        e for s in summary for e in (('rule_start', s['rule_name']), ('rule_end', s['rule_name'], s['items_failed'])))
+    assert all(s['peak_memory_delta_mb'] is None for s in summary)
+    spans = [e for e in json.loads(trace_path.read_text(encoding='utf-8'))['traceEvents'] if e.get('cat') == 'rule']
+    assert sorted(e['name'] for e in spans) == sorted(s['rule_name'] for s in summary)
+    hook = RecordingHook()
+    chunks = [current_df.iloc[i:i + 500] for i in range(0, len(current_df), 500)]
+    dqmlib.DataValidator(row_rules(), local_qp, hooks=hook).validate_chunks(chunks, disable_outer_tqdm=True)
+    assert [e for e in hook.events if e[0].startswith('validation')] == [('validation_start', None),
+                                                                        ('validation_end', None)]
+
+
+def test_failing_hook_does_not_stop_validation(local_qp, current_df, capsys):
+    class FailingHook(dqmlib.ValidationHooks):
+        def on_rule_start(self, rule_info):
+            raise RuntimeError('boom')
+
+    errors, summary = dqmlib.DataValidator(row_rules(), local_qp).validate(current_df, disable_outer_tqdm=True)
+    hooked_errors, hooked_summary = dqmlib.DataValidator(row_rules(), local_qp, hooks=FailingHook()).validate(
+        current_df, disable_outer_tqdm=True)
+    assert norm(hooked_errors) == norm(errors) and summary_counts(hooked_summary) == summary_counts(summary)
+    assert '경고: 훅 FailingHook.on_rule_start' in capsys.readouterr().out
+
+
+# ----- 청크 간 중복 행 확인 -----
+def dup_chunks(n=300, size=70, seed=3):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'a': rng.integers(0, 40, n), 'b': rng.choice(np.array(['x', 'y', None], dtype=object), n),
+                       'c': rng.choice([1.0, 2.5, np.nan], n)})
+    return df, [df.iloc[i:i + size] for i in range(0, n, size)]
+
+
+def dup_rules(report_each_row):
+    return {'table_level_rules': [{'name': 'dup', 'type': 'duplicate_rows',
+                                   'params': {'subset_columns': ['a', 'b', 'c'], 'report_each_row': report_each_row,
+                                              'max_group_row_indices': 5}}]}
+
+
+def validate_both(rules_config, df, chunks, as_generator):
+    errors, summary = dqmlib.DataValidator(rules_config, None).validate(df, disable_outer_tqdm=True)
+    chunk_errors, chunk_summary = dqmlib.DataValidator(rules_config, None).validate_chunks(
+        (c for c in chunks) if as_generator else chunks, disable_outer_tqdm=True)
+    assert summary_counts(chunk_summary) == summary_counts(summary) and summary[0]['items_failed'] > 0
+    return norm(errors), norm(chunk_errors)
+
+
+@pytest.mark.parametrize('report_each_row', [False, True])
+@pytest.mark.parametrize('as_generator', [False, True])
+def test_chunk_duplicates_match_validate(report_each_row, as_generator):
+    df, chunks = dup_chunks()
+    errors, chunk_errors = validate_both(dup_rules(report_each_row), df, chunks, as_generator)
+    if as_generator:  # 재순회할 수 없는 청크에서는 중복 행 스냅샷을 만들지 않음
+        for e in errors: e.pop('error_row_data', None)
+    assert chunk_errors == errors
+
+
+@pytest.mark.parametrize('report_each_row', [False, True])
+@pytest.mark.parametrize('as_generator', [False, True])
+def test_chunk_duplicates_confirm_hash_collisions(monkeypatch, report_each_row, as_generator):
+    df, chunks = dup_chunks()
+    chunks[1] = chunks[1].astype({'a': float})  # 청크마다 dtype이 달라도 같은 값은 같은 키
+    df = pd.concat(chunks)
+    # 모든 행의 해시가 같아도 키 값 확인으로 실제 중복만 남음
+    monkeypatch.setattr(dqmlib, '_chunk_duplicate_row_hashes', lambda d: np.zeros(len(d), dtype=np.uint64))
+    errors, chunk_errors = validate_both(dup_rules(report_each_row), df, chunks, as_generator)
+    for e in errors + chunk_errors: e.pop('error_row_data', None)
+    assert chunk_errors == errors
+
+
+# ----- 컬럼 동등성 검사 -----
+def equality_frame():
+    return pd.DataFrame({
+        'i1': [1, 2, 2 ** 60, 4, 5, 6], 'i2': [1, 3, 2 ** 60 + 1, 4, 5, 7],
+        'n1': pd.array([1, None, 3, None, 5, 6], dtype='Int64'), 'n2': pd.array([1, None, 4, 4, None, 6], dtype='Int64'),
+        'f1': [1.0, 0.0, np.nan, 2.5, np.nan, 3.0], 'f2': [1.0, -0.0, np.nan, 2.5000001, 1.0, 3.0],
+        's1': ['a', ' B', None, 'x', 'y', '1'], 's2': ['a', 'b', None, 'x', None, '1.0'],
+        'o1': pd.Series([1, 'a', None, 2.0, np.nan, 'z'], dtype=object),
+        'o2': pd.Series([1.0, 'a', np.nan, 2, None, 'Z'], dtype=object),
+    })
+
+
+@pytest.mark.parametrize('pair', [('i1', 'i2'), ('n1', 'n2'), ('f1', 'f2'), ('s1', 's2'), ('o1', 'o2'), ('i1', 'f1'),
+                                  ('f2', 's2'), ('n1', 'i1')])
+def test_column_equality_matches_string_comparison(pair):
+    df = equality_frame()
+    col1, col2 = pair
+    compare_df = df[[col1, col2]].astype(str).fillna('__NONE_PLACEHOLDER__')
+    expected = [idx for idx in df.index if compare_df.loc[idx, col1] != compare_df.loc[idx, col2]]
+    errors = dqmlib.check_column_equality(df, {'column1': col1, 'column2': col2})
+    assert [e['row_index'] for e in errors] == expected
+    assert norm([e['error_row_data'] for e in errors]) == norm([df.loc[idx].to_dict() for idx in expected])
+
+
+def test_column_equality_options():
+    df = equality_frame()
+    mismatch = lambda params: dqmlib._column_equality_mismatch_mask(df[params.pop('c1')], df[params.pop('c2')],
+                                                                    params).tolist()
+    assert mismatch({'c1': 's1', 'c2': 's2', 'trim_strings': True, 'case_insensitive': True}) == [
+        False, False, False, False, True, True]
+    assert mismatch({'c1': 'f1', 'c2': 'f2', 'numeric_tolerance': 1e-3}) == [False] * 4 + [True, False]
+    assert mismatch({'c1': 's1', 'c2': 's2', 'numeric_tolerance': 0}) == [False, True, False, False, True, False]
+    assert mismatch({'c1': 'n1', 'c2': 'n2', 'null_equals_null': False}) == [False, True, True, True, True, False]
+
+
+def test_column_equality_truncation_matches_in_chunks():
+    df = make_frame(600, [CUR], seed=4)
+    rules_config = {'table_level_rules': [{'name': 'eq', 'type': 'column_equality',
+                                           'params': {'column1': 'code', 'column2': 'code2',
+                                                      'max_mismatch_samples': 5}}]}
+    errors, summary = dqmlib.DataValidator(rules_config, None).validate(df, disable_outer_tqdm=True)
+    mismatch_count = int((df['code'].astype(str).fillna('-') != df['code2'].astype(str).fillna('-')).sum())
+    assert [e['error_type'] for e in errors] == ['COLUMN_MISMATCH'] * 5 + ['COLUMN_MISMATCH_TRUNCATED']
+    assert errors[-1]['mismatch_count'] == summary[0]['items_failed'] == mismatch_count > 5
+    chunk_errors, chunk_summary = dqmlib.DataValidator(rules_config, None).validate_chunks(
+        [df.iloc[i:i + 100] for i in range(0, len(df), 100)], disable_outer_tqdm=True)
+    assert norm(chunk_errors) == norm(errors) and summary_counts(chunk_summary) == summary_counts(summary)
+
+
+# ----- 정규식 검사 -----
+@pytest.mark.parametrize('full_match', [False, True])
+def test_regex_pattern_matches_per_value_re(full_match):
+    series = pd.Series(['A1', 'A12', 'b2', None, 'A1', 12, np.nan, 'Z9x', 'A1', ''], dtype=object, index=range(10, 20))
+    matcher = re.fullmatch if full_match else re.match
+    expected = [idx for idx, v in series.dropna().items() if not isinstance(v, str) or not matcher(r'[A-Z]\d', v)]
+    errors = dqmlib.check_regex_pattern(series, 'c', {'pattern': r'[A-Z]\d', 'full_match': full_match})
+    assert [(e['row_index'], e['value']) for e in errors] == [(idx, series[idx]) for idx in expected]
+
+
+def test_regex_pattern_compiled_once_per_validator(current_df, monkeypatch):
+    pattern = r'[A-C]\d$'
+    rules_config = {'columns': {'code': [{'name': 're1', 'type': 'regex_pattern', 'params': {'pattern': pattern}}],
+                                'code2': [{'name': 're2', 'type': 'regex_pattern', 'params': {'pattern': pattern}}],
+                                'wid_cty_cd': [{'name': 'bad', 'type': 'regex_pattern', 'params': {'pattern': '[1-'}}]}}
+    compiled = []
+    original_compile = re.compile
+    monkeypatch.setattr(re, 'compile', lambda p, *a: (compiled.append(p) if p == pattern else None) or
+                        original_compile(p, *a))
+    validator = dqmlib.DataValidator(rules_config, None)
+    for _ in range(2):
+        errors, summary = validator.validate(current_df, disable_outer_tqdm=True)
+    assert compiled == [pattern]
+    expected = [idx for idx, v in current_df['code'].dropna().items() if not re.match(pattern, v)]
+    assert [e['row_index'] for e in errors if e['rule_name'] == 're1'] == expected
+    assert [e['error_type'] for e in errors if e['rule_name'] == 'bad'] == ['CONFIG_ERROR']
+
+
+# ----- 컬럼 factorize 공유 -----
+def test_shared_factorization_matches_per_call_checks(local_qp, current_df):
+    rules_config = history_rules()
+    rules_config['columns']['code'].append({'name': 'code_allowed_f', 'type': 'allowed_values',
+                                            'params': {'values': ['A1', 'X'], 'current_data_filter': "aso_saa > 900"}})
+    errors, summary = dqmlib.DataValidator(rules_config, local_qp).validate(current_df, disable_outer_tqdm=True)
+    validator = dqmlib.DataValidator(rules_config, local_qp)
+    validator.factorized_rule_types = []  # 규칙마다 직접 판정
+    expected_errors, expected_summary = validator.validate(current_df, disable_outer_tqdm=True)
+    assert norm(errors) == norm(expected_errors) and summary_counts(summary) == summary_counts(expected_summary)
+
+
+def test_filtered_factorization_reuses_full_codes(current_df, monkeypatch):
+    factorize_calls = []
+    original_factorize = pd.factorize
+    monkeypatch.setattr(pd, 'factorize', lambda values, *a, **kw: factorize_calls.append(1) or
+                        original_factorize(values, *a, **kw))
+    cache = dqmlib.FilterMaskCache(current_df)
+    for expr in ['', "aso_saa > 1000", "wid_cty_cd == '21'"]:
+        factorized = cache.factorized('code', expr)
+        assert factorized is cache.factorized('code', expr)
+        series = current_df.query(expr)['code'] if expr else current_df['code']
+        values = np.asarray(factorized.uniques, dtype=object)[factorized.codes[factorized.codes >= 0]]
+        assert values.tolist() == series.dropna().tolist()
+        assert factorized.null_count == series.isna().sum()
+        assert dict(zip(factorized.uniques, factorized.counts.tolist())) == {
+            k: v for k, v in series.value_counts().items() if v}
+    assert len(factorize_calls) == 1
+
+
+# ----- 검증용 dtype 최적화 -----
+def test_optimized_dtypes_keep_validation_results():
+    rng = np.random.default_rng(5)
+    n = 400
+    df = pd.DataFrame({'n': rng.integers(0, 100, n), 'm': rng.integers(0, 100, n), 'k': rng.integers(0, 100, n),
+                       'x': rng.integers(0, 100, n) / 4,
+                       'code': rng.choice(np.array(['A1', 'B2', 'C3', None], dtype=object), n),
+                       'grade': rng.choice(np.array(['G1', 'G2', 'G9', None], dtype=object), n)})
+    rules_config = {
+        'columns': {'grade': [{'name': 'allowed', 'type': 'allowed_values', 'params': {'values': ['G1', 'G2']}}],
+                    'k': [{'name': 'k_range', 'type': 'numeric_range',
+                           'params': {'min': 0, 'max': 90, 'current_data_filter': 'n + m > 150'}}]},
+        'table_level_rules': [{'name': 'cond', 'type': 'conditional_check',
+                               'params': {'if_condition': "code == 'A1' and x * 100 > 200",
+                                          'then_condition': 'n * m < 5000'}}]}
+    optimized = dqmlib.optimize_validation_dtypes(df, rules_config, downcast_floats=True, verbose=False)
+    assert optimized['k'].dtype == np.int8 and optimized['grade'].dtype == 'category'
+    assert all(optimized[c].dtype == df[c].dtype for c in ['n', 'm', 'x', 'code'])  # 식에 쓰인 컬럼은 그대로
+    errors, summary = dqmlib.DataValidator(rules_config, None).validate(df, disable_outer_tqdm=True)
+    optimized_errors, optimized_summary = dqmlib.DataValidator(rules_config, None).validate(
+        optimized, disable_outer_tqdm=True)
+    assert all(s['items_checked'] > 0 for s in summary) and summary[-1]['items_failed'] > 0
+    assert norm(optimized_errors) == norm(errors) and summary_counts(optimized_summary) == summary_counts(summary)
+
+
+# ----- 연속 추세 판정 -----
+def reference_trends(hist, latest_map, latest_date, trend_type, consecutive_periods):
+    """그룹마다 시계열을 만들어 뒤에서부터 훑는 기존 방식의 판정 결과 {그룹 키: (값 목록, 날짜 목록)}."""
+    results = {}
+    for key in set(latest_map) | set(hist[['g']].itertuples(index=False, name=None)):
+        series = pd.concat([hist[hist['g'] == key[0]], pd.DataFrame(
+            [{'g': key[0], 'd': latest_date, 'agg_value': latest_map.get(key, 0.0)}])]).sort_values('d', kind='mergesort')
+        values, dates = series['agg_value'].tolist(), series['d'].dt.strftime('%Y%m%d').tolist()
+        count = end = 0
+        for k in range(len(values) - 1, 0, -1):
+            if (values[k] < values[k - 1]) if trend_type == 'down' else (values[k] > values[k - 1]):
+                if count == 0: end = k
+                count += 1
+                if count >= consecutive_periods - 1:
+                    window = slice(end - consecutive_periods + 1, end + 1)
+                    results[key] = (values[window], dates[window])
+                    break
+            else:
+                count = 0
+    return results
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('trend_type', ['up', 'down'])
+@pytest.mark.parametrize('consecutive_periods', [2, 3, 4])
+def test_consecutive_trends_match_per_group_scan(seed, trend_type, consecutive_periods):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=12, freq='D')
+    hist = pd.DataFrame([(g, d, float(rng.integers(0, 4))) for g in ['a', 'b', 'c', 'd', 'e', '__NONE_GROUP_KEY__']
+                         for d in dates if rng.random() > 0.25], columns=['g', 'd', 'agg_value'])
+    hist = hist.sample(frac=1, random_state=seed)  # 정렬되지 않고 연속되지 않은 인덱스
+    latest_map = {(g,): float(rng.integers(0, 4)) for g in ['a', 'c', 'e', 'f']}
+    latest_date = pd.Timestamp('2025-01-13')
+    trends = dqmlib._detect_consecutive_trends(hist, latest_map, latest_date, 'd', ['g'], trend_type,
+                                               consecutive_periods, '%Y%m%d')
+    assert [key for key, _, _ in trends] == sorted(key for key, _, _ in trends)
+    assert {key: (values, labels) for key, values, labels in trends} == reference_trends(
+        hist, latest_map, latest_date, trend_type, consecutive_periods)
+
+
+# ----- 과거 기간 로컬 집계 -----
+@pytest.mark.parametrize('plan_historical_queries', [True, False])
+def test_local_history_aggregation_matches_db_with_partial_period(hist_df, current_df, capsys,
+                                                                   plan_historical_queries):
+    partial = '20250116'  # 절반만 적재한 기간 (선언하지 않으면 DB에서 조회해야 함)
+    full_periods = [d for d in HIST_DATES[:7] if d != partial]
+    frame = pd.concat([current_df[current_df['bgda_plf_pti_id'] == CUR],
+                       hist_df[hist_df['bgda_plf_pti_id'].isin(full_periods)],
+                       hist_df[hist_df['bgda_plf_pti_id'] == partial].iloc[::2]], ignore_index=True)
+    frame.attrs['name'] = 'mdb.hist'
+    rules_config = {'table_level_rules': history_rules()['table_level_rules'][-3:]}
+    results = []
+    for options in [{}, {'local_history_aggregation': True},
+                    {'local_history_aggregation': True, 'local_history_periods': full_periods}]:
+        qp = dqmlib.LocalQueryProcessor({'mdb.hist': hist_df}, slow_query_seconds=None)
+        queries = []
+        original_fetch = qp.fetch_to_pandas
+        qp.fetch_to_pandas = lambda query, *a, **kw: queries.append(query) or original_fetch(query, *a, **kw)
+        capsys.readouterr()
+        errors, summary = dqmlib.DataValidator(rules_config, qp, plan_historical_queries=plan_historical_queries,
+                                               **options).validate(frame, disable_outer_tqdm=True)
+        qp.close()
+        results.append((norm(errors), summary_counts(summary), queries, capsys.readouterr().out))
+    (db_errors, db_summary, db_queries, _), (_, _, undeclared_queries, undeclared_out) = results[:2]
+    local_errors, local_summary, local_queries, local_out = results[2]
+    assert any(s['status'] == 'Failed' for s in db_summary)
+    assert local_errors == db_errors and local_summary == db_summary
+    assert undeclared_queries == db_queries and '경고: local_history_aggregation=True' in undeclared_out
+    # 전체 적재를 선언한 기간은 DB에서 조회하지 않고, 일부만 있는 기간은 DB에서 조회
+    assert any(f"'{p}'" in q for q in db_queries for p in full_periods)
+    assert not any(f"'{p}'" in q for q in local_queries for p in full_periods)
+    assert any(f"'{partial}'" in q for q in local_queries)
+    assert local_out.count('검증 DataFrame에서 집계합니다') == (1 if plan_historical_queries else 0)